@@ -0,0 +1,7 @@
+"""
+Benchmarks de DataManager y de la carga de las ventanas (python -m benchmarks).
+
+    generador.py   datos escolares sinteticos deterministas a cualquier escala
+    ejecutar.py    mide cada metodo publico y cada consulta de ventana/reporte
+    comparar.py    compara los resultados (JSON) contra una linea base
+"""
@@ -0,0 +1,150 @@
+"""
+Se ejecuta desde la raiz del proyecto:
+
+    python -m benchmarks generar datos/ --tamano mediano
+    python -m benchmarks ejecutar --tamano pequeno -o resultados.json --base base.json
+    python -m benchmarks comparar base.json resultados.json
+    python -m benchmarks presupuestos --tamano pequeno
+    python -m benchmarks archivado --tamano mediano --periodo 2025-1
+"""
+import sys
+
+import click
+
+from .comparar import cargar, comparar, guardar, tabla
+from .generador import TAMANOS, generar, parametros
+
+
+def opciones_datos(funcion):
+    """Tamano predefinido y los parametros del generador que se pueden cambiar."""
+    for opcion in reversed([
+        click.option("--tamano", type=click.Choice(list(TAMANOS)), default="pequeno", show_default=True),
+        click.option("--estudiantes", type=int),
+        click.option("--cursos", type=int),
+        click.option("--matriculas-por-estudiante", type=int),
+        click.option("--asistencias", type=int, help="Registros de asistencia."),
+        click.option("--semilla", type=int),
+    ]):
+        funcion = opcion(funcion)
+    return funcion
+
+
+def _reportar_comparacion(base, actual, tolerancia, minimo_ms):
+    filas, regresiones, avisos = comparar(base, actual, tolerancia, minimo_ms)
+    for aviso in avisos:
+        click.echo(f"Aviso: {aviso}", err=True)
+    for linea in tabla(filas, regresiones):
+        click.echo(linea)
+    click.echo(f"{len(regresiones)} regresiones (tolerancia {tolerancia:.0%}, minimo {minimo_ms} ms)")
+    return regresiones
+
+
+opcion_tolerancia = click.option("--tolerancia", type=float, default=0.25, show_default=True,
+                                 help="Aumento relativo de la mediana que se considera regresion.")
+opcion_minimo = click.option("--minimo-ms", type=float, default=1.0, show_default=True,
+                             help="Aumento absoluto minimo para marcar una regresion.")
+
+
+@click.group()
+def cli():
+    """Benchmarks de DataManager y de la carga de las ventanas con datos sinteticos."""
+
+
+@cli.command("generar")
+@click.argument("carpeta", type=click.Path(file_okay=False))
+@opciones_datos
+def generar_datos(carpeta, tamano, **cambios):
+    """Genera los archivos de datos en CARPETA."""
+    manifiesto = generar(carpeta, **parametros(tamano, **cambios))
+    for tabla_datos, cantidad in manifiesto["conteos"].items():
+        click.echo(f"{tabla_datos:12} {cantidad:>12,}")
+
+
+@cli.command("ejecutar")
+@opciones_datos
+@click.option("--repeticiones", type=int, default=5, show_default=True)
+@click.option("--sin-ventanas", is_flag=True, help="Solo DataManager (no importa PyQt).")
+@click.option("--datos", type=click.Path(file_okay=False),
+              help="Carpeta de datos generados (por defecto benchmarks/datos/<parametros>).")
+@click.option("-o", "--salida", type=click.Path(dir_okay=False), help="JSON con los resultados.")
+@click.option("--base", type=click.Path(exists=True, dir_okay=False),
+              help="Resultados de referencia; termina con codigo 1 si hay regresiones.")
+@opcion_tolerancia
+@opcion_minimo
+def ejecutar_benchmarks(tamano, repeticiones, sin_ventanas, datos, salida, base, tolerancia, minimo_ms, **cambios):
+    """Mide todos los casos y guarda los resultados."""
+    from .ejecutar import ejecutar, resumen_texto
+
+    resultados = ejecutar(parametros(tamano, **cambios), repeticiones, ventanas=not sin_ventanas,
+                          carpeta_datos=datos, progreso=lambda nombre: click.echo(f"  {nombre}", err=True))
+    resumen_texto(resultados)
+    if salida:
+        guardar(salida, resultados)
+        click.echo(f"Resultados en {salida}", err=True)
+    if base and _reportar_comparacion(cargar(base), resultados, tolerancia, minimo_ms):
+        sys.exit(1)
+
+
+@cli.command("comparar")
+@click.argument("base", type=click.Path(exists=True, dir_okay=False))
+@click.argument("actual", type=click.Path(exists=True, dir_okay=False))
+@opcion_tolerancia
+@opcion_minimo
+def comparar_resultados(base, actual, tolerancia, minimo_ms):
+    """Compara dos archivos de resultados; codigo 1 si hay regresiones."""
+    if _reportar_comparacion(cargar(base), cargar(actual), tolerancia, minimo_ms):
+        sys.exit(1)
+
+
+@cli.command("presupuestos")
+@opciones_datos
+@click.option("--sin-ventanas", is_flag=True, help="Solo DataManager (no importa PyQt).")
+@click.option("--datos", type=click.Path(file_okay=False),
+              help="Carpeta de datos generados (por defecto benchmarks/datos/<parametros>).")
+@click.option("-v", "--detalle", is_flag=True, help="Muestra tambien los casos que cumplen.")
+@click.option("-o", "--salida", type=click.Path(dir_okay=False), help="JSON con la E/S de cada caso.")
+def verificar_presupuestos(tamano, sin_ventanas, datos, detalle, salida, **cambios):
+    """Verifica los presupuestos de E/S de cada accion; codigo 1 si alguno se excede."""
+    from .presupuestos import verificar_presupuestos as verificar
+
+    resultados = verificar(parametros(tamano, **cambios), ventanas=not sin_ventanas, carpeta_datos=datos)
+    fallidos = 0
+    for caso, accion, excesos in resultados:
+        fallidos += bool(excesos)
+        if excesos or detalle:
+            t = accion.como_dict()["totales"]
+            click.echo(f"  {caso:58} {t['lecturas']:>3} lect {t['bytes_leidos']:>12,} B "
+                       f"{t['escrituras']:>3} escr {t['bytes_escritos']:>12,} B {t['reescrituras']:>2} reescr"
+                       f"{'  EXCEDIDO' if excesos else ''}")
+        for exceso in excesos:
+            click.echo(f"      {exceso}")
+    if salida:
+        guardar(salida, {caso: accion.como_dict() for caso, accion, _ in resultados})
+        click.echo(f"E/S por caso en {salida}", err=True)
+    click.echo(f"{len(resultados) - fallidos}/{len(resultados)} casos dentro del presupuesto")
+    if fallidos:
+        sys.exit(1)
+
+
+@cli.command("archivado")
+@opciones_datos
+@click.option("--periodo", default="2025-1", show_default=True, help="Periodo a cerrar (si hace falta) y archivar.")
+@click.option("--repeticiones", type=int, default=5, show_default=True)
+@click.option("--datos", type=click.Path(file_okay=False),
+              help="Carpeta de datos generados (por defecto benchmarks/datos/<parametros>).")
+@click.option("-o", "--salida", type=click.Path(dir_okay=False), help="JSON con los resultados.")
+def medir_archivado(tamano, periodo, repeticiones, datos, salida, **cambios):
+    """Tamaño en disco y lecturas en frio antes y despues de archivar un periodo."""
+    from .archivado import medir_archivado as medir, resumen_texto
+
+    resultados = medir(parametros(tamano, **cambios), periodo, repeticiones, carpeta_datos=datos,
+                       progreso=lambda nombre: click.echo(f"  {nombre}", err=True))
+    for linea in resumen_texto(resultados):
+        click.echo(linea)
+    if salida:
+        guardar(salida, resultados)
+        click.echo(f"Resultados en {salida}", err=True)
+
+
+if __name__ == "__main__":
+    cli(prog_name="python -m benchmarks")
@@ -0,0 +1,109 @@
+"""
+Costo y ahorro de archivar un periodo (data/archivado.py) sobre una copia
+de los datos generados: tamaño en disco de cada tabla y tiempo de las
+lecturas en frio antes y despues de comprimir el periodo.
+
+Las lecturas se miden con la cache descartada, como en una auditoria (lo
+archivado no se guarda en la cache). Las que no tocan el periodo ("[otro]")
+no deberian cambiar.
+"""
+import os
+import time
+
+from data.data_manager import DataManager
+from .ejecutar import _muestra, copia_de_trabajo, medir, preparar_datos
+
+TABLAS = {"matriculas": ("matriculas",), "asistencias": ("asistencias",),
+          "notas": ("notas_db.txt", "notas_archivadas")}
+
+
+def _bytes(ruta):
+    if os.path.isfile(ruta):
+        return os.path.getsize(ruta)
+    return sum(os.path.getsize(os.path.join(carpeta, archivo))
+               for carpeta, _, archivos in os.walk(ruta) for archivo in archivos)
+
+
+def tamanos():
+    """{tabla: bytes en disco} de las tablas que se archivan (en el directorio actual)."""
+    return {tabla: sum(_bytes(r) for r in rutas if os.path.exists(r)) for tabla, rutas in TABLAS.items()}
+
+
+def casos_lectura(db, m, periodo, otro):
+    """(nombre, funcion) de las lecturas que abren el periodo archivado y de las que no ("[otro]")."""
+    return [
+        ("obtener_matriculas[periodo]", lambda: db.obtener_matriculas(periodo)),
+        ("obtener_asistencias_raw", db.obtener_asistencias_raw),
+        ("obtener_asistencias_raw[mes]", lambda: db.obtener_asistencias_raw(desde=m.desde, hasta=m.hasta)),
+        ("obtener_historial_asistencia", lambda: db.obtener_historial_asistencia(m.cod_curso)),
+        ("obtener_notas_diccionario", lambda: db.obtener_notas_diccionario(m.cod_curso)),
+        ("iterar_todas_las_notas", lambda: list(db.iterar_todas_las_notas())),
+        ("obtener_matriculas[otro]", lambda: db.obtener_matriculas(otro)),
+        ("iterar_todas_las_notas[otro]", lambda: list(db.iterar_todas_las_notas(archivadas=False))),
+    ]
+
+
+def medir_archivado(params, periodo="2025-1", repeticiones=5, carpeta_datos=None, progreso=None):
+    """
+    Cierra (si hace falta) y archiva `periodo` en una copia de los datos de
+    `params`, midiendo las lecturas antes y despues. Retorna
+    {"tamanos": {tabla: (antes, despues)}, "lecturas": {caso: (antes, despues)},
+    "archivar_ms", "archivados": {tabla: registros}}; los tiempos son los de medir().
+    """
+    carpeta, _ = preparar_datos(params, carpeta_datos)
+    with copia_de_trabajo(carpeta):
+        db = DataManager("notas_db.txt")
+        m = _muestra(db)
+        otro = next((p for p, _ in db.periodos_matriculas() if p != periodo), periodo)
+        if not db.periodo_cerrado(periodo):
+            exito, mensaje, _ = db.cerrar_periodo(periodo)
+            if not exito:
+                raise RuntimeError(mensaje)
+
+        casos = casos_lectura(db, m, periodo, otro)
+        antes = {}
+        for nombre, funcion in casos:
+            if progreso:
+                progreso(nombre)
+            antes[nombre] = medir(funcion, repeticiones, antes=db.invalidar_cache)
+        tamanos_antes = tamanos()
+
+        if progreso:
+            progreso("archivar_periodo")
+        inicio = time.perf_counter()
+        exito, mensaje, archivados = db.archivar_periodo(periodo)
+        archivar_ms = round((time.perf_counter() - inicio) * 1000, 3)
+        if not exito:
+            raise RuntimeError(mensaje)
+
+        despues = {}
+        for nombre, funcion in casos:
+            if progreso:
+                progreso(f"{nombre} (archivado)")
+            despues[nombre] = medir(funcion, repeticiones, antes=db.invalidar_cache)
+        tamanos_despues = tamanos()
+
+    return {
+        "periodo": periodo,
+        "tamanos": {t: (tamanos_antes[t], tamanos_despues[t]) for t in TABLAS},
+        "lecturas": {n: (antes[n], despues[n]) for n, _ in casos},
+        "archivar_ms": archivar_ms,
+        "archivados": archivados,
+    }
+
+
+def resumen_texto(datos):
+    """Lineas de la tabla de tamaños y tiempos."""
+    lineas = [f"Periodo {datos['periodo']}: archivado en {datos['archivar_ms']:.1f} ms "
+              f"({', '.join(f'{c} {t}' for t, c in datos['archivados'].items())})", ""]
+    lineas.append(f"{'tabla':40} {'antes':>14} {'despues':>14} {'relacion':>9}")
+    for tabla, (antes, despues) in datos["tamanos"].items():
+        relacion = f"{despues / antes:.2f}x" if antes else "-"
+        lineas.append(f"{tabla:40} {antes:>12,} B {despues:>12,} B {relacion:>9}")
+    lineas.append("")
+    lineas.append(f"{'lectura en frio':40} {'antes':>14} {'despues':>14} {'relacion':>9}")
+    for nombre, (antes, despues) in datos["lecturas"].items():
+        a, d = antes["mediana_ms"], despues["mediana_ms"]
+        relacion = f"{d / a:.2f}x" if a else "-"
+        lineas.append(f"{nombre:40} {a:>11.3f} ms {d:>11.3f} ms {relacion:>9}")
+    return lineas
@@ -0,0 +1,58 @@
+"""
+Comparacion de resultados de benchmarks contra una linea base.
+
+Un caso es una regresion si su mediana crece mas que `tolerancia`
+(fraccion) y ademas en mas de `minimo_ms`: asi las operaciones de
+microsegundos no se marcan por ruido.
+"""
+import json
+
+
+def cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar(ruta, datos):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def comparar(base, actual, tolerancia=0.25, minimo_ms=1.0):
+    """
+    Retorna (filas, regresiones, avisos). Cada fila es
+    (caso, mediana_base, mediana_actual, cambio) con cambio = actual/base - 1
+    (None si el caso falta en alguno de los dos).
+    """
+    avisos = []
+    if base["datos"]["parametros"] != actual["datos"]["parametros"]:
+        avisos.append("Los datos generados no son los mismos: los tiempos no son comparables")
+    if base["entorno"].get("plataforma") != actual["entorno"].get("plataforma"):
+        avisos.append("La linea base se midio en otra plataforma")
+
+    filas, regresiones = [], []
+    casos = list(base["resultados"]) + [c for c in actual["resultados"] if c not in base["resultados"]]
+    for caso in casos:
+        antes = base["resultados"].get(caso, {}).get("mediana_ms")
+        ahora = actual["resultados"].get(caso, {}).get("mediana_ms")
+        if antes is None or ahora is None:
+            filas.append((caso, antes, ahora, None))
+            continue
+        cambio = ahora / antes - 1 if antes > 0 else 0.0
+        filas.append((caso, antes, ahora, cambio))
+        if cambio > tolerancia and ahora - antes > minimo_ms:
+            regresiones.append(caso)
+    return filas, regresiones, avisos
+
+
+def tabla(filas, regresiones):
+    """Lineas de texto con la comparacion, marcando las regresiones."""
+    marcadas = set(regresiones)
+    for caso, antes, ahora, cambio in filas:
+        if cambio is None:
+            estado = "solo en la base" if ahora is None else "nuevo"
+            yield f"  {caso:58} {estado}"
+            continue
+        marca = "REGRESION" if caso in marcadas else ""
+        yield f"  {caso:58} {antes:>10.3f} -> {ahora:>10.3f} ms {cambio:>+8.1%} {marca}"
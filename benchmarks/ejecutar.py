@@ -0,0 +1,330 @@
+"""
+Mide los metodos publicos de DataManager y las consultas con las que se
+cargan las ventanas, sobre una copia de los datos generados.
+
+Cada consulta se mide en frio (cache descartada: incluye parsear los
+archivos, como al abrir la aplicacion o tras un cambio externo) y en
+caliente (cache vigente). Las escrituras se miden con la cache caliente y
+cada repeticion escribe datos nuevos. Los resultados son un diccionario
+serializable a JSON (ver comparar.py).
+"""
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import count
+from types import SimpleNamespace
+
+from controllers.reporte_controller import ReporteController
+from data.data_manager import DataManager
+from .generador import FORMATO, INICIO_CLASES, generar, leer_manifiesto
+
+VERSION_RESULTADOS = 1
+CARPETA_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")
+ARCHIVOS_DATOS = ("estudiantes.txt", "cursos.txt", "matriculas", "notas_db.txt", "asistencias", "carreras.txt")
+TAMANO_LOTE = 100  # Filas de cada escritura por lote
+
+
+def preparar_datos(params, carpeta=None):
+    """
+    Carpeta con los datos de `params` (ver generador.parametros). Si ya fue
+    generada con los mismos parametros se reutiliza. Retorna (carpeta, manifiesto).
+    """
+    if carpeta is None:
+        nombre = "e{estudiantes}-c{cursos}-m{matriculas_por_estudiante}-a{asistencias}-s{semilla}".format(**params)
+        carpeta = os.path.join(CARPETA_DATOS, nombre)
+    manifiesto = leer_manifiesto(carpeta)
+    if manifiesto is None or manifiesto.get("formato") != FORMATO or manifiesto["parametros"] != params:
+        manifiesto = generar(carpeta, **params)
+    return carpeta, manifiesto
+
+
+@contextmanager
+def copia_de_trabajo(carpeta):
+    """
+    Copia los archivos de datos de `carpeta` a una carpeta temporal y trabaja
+    en ella (DataManager usa rutas relativas al directorio actual).
+    """
+    trabajo = tempfile.mkdtemp(prefix="registro-bench-")
+    anterior = os.getcwd()
+    try:
+        for archivo in ARCHIVOS_DATOS:
+            origen = os.path.join(carpeta, archivo)
+            if os.path.isdir(origen):
+                shutil.copytree(origen, os.path.join(trabajo, archivo))
+            else:
+                shutil.copy(origen, trabajo)
+        os.chdir(trabajo)
+        yield trabajo
+    finally:
+        os.chdir(anterior)
+        shutil.rmtree(trabajo, ignore_errors=True)
+
+
+def medir(funcion, repeticiones, antes=None, escritura=False):
+    """
+    Ejecuta `funcion` `repeticiones` veces (`antes` corre fuera del tiempo medido).
+    Si es una `escritura` que falla se lanza RuntimeError: el caso no seria valido.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        if antes is not None:
+            antes()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    # Las escrituras retornan False o (False, mensaje, ...) si fallan
+    if escritura and (resultado is False or (isinstance(resultado, tuple) and resultado and resultado[0] is False)):
+        raise RuntimeError(f"La operacion fallo: {resultado}")
+    return {
+        "repeticiones": repeticiones,
+        "min_ms": round(min(tiempos), 3),
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "media_ms": round(statistics.fmean(tiempos), 3),
+        "max_ms": round(max(tiempos), 3),
+        "filas": len(resultado) if isinstance(resultado, (list, dict)) else None,
+    }
+
+
+def _muestra(db):
+    """Estudiante, curso y fecha con datos, elegidos siempre igual para los mismos datos."""
+    matriculas = db.obtener_matriculas()
+    if not matriculas:
+        raise ValueError("Los datos no tienen matriculas")
+    m = matriculas[len(matriculas) // 2]
+    estudiante = next(e for e in db.obtener_estudiantes() if e['id'] == m['id_est'])
+    mes_siguiente = (INICIO_CLASES.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return SimpleNamespace(
+        id_est=m['id_est'], cod_curso=m['cod_curso'], periodo=m['periodo'], estudiante=estudiante,
+        fecha=INICIO_CLASES.isoformat(),
+        # El mes de `fecha`, para las consultas acotadas por fechas
+        desde=INICIO_CLASES.replace(day=1).isoformat(),
+        hasta=(mes_siguiente - timedelta(days=1)).isoformat(),
+        termino_estudiante=estudiante['apellido'][:4], termino_curso="Mate",
+        roster=[e['id'] for e in db.obtener_matriculados(m['cod_curso'])],
+    )
+
+
+# --- CASOS ---
+def casos_consulta(db, m):
+    """(nombre, funcion) de cada consulta de DataManager."""
+    return [
+        ("obtener_cursos", db.obtener_cursos),
+        ("nombres_cursos", db.nombres_cursos),
+        ("buscar_cursos", lambda: db.buscar_cursos(m.termino_curso)),
+        ("obtener_asistencias_raw", db.obtener_asistencias_raw),
+        ("obtener_asistencias_raw[mes]", lambda: db.obtener_asistencias_raw(desde=m.desde, hasta=m.hasta)),
+        ("obtener_asistencia_estudiante", lambda: db.obtener_asistencia_estudiante(m.id_est, m.cod_curso, m.fecha)),
+        ("obtener_asistencias_curso_fecha", lambda: db.obtener_asistencias_curso_fecha(m.cod_curso, m.fecha)),
+        ("existe_matricula", lambda: db.existe_matricula(m.id_est, m.cod_curso)),
+        ("obtener_matriculados", lambda: db.obtener_matriculados(m.cod_curso)),
+        ("obtener_matriculas", db.obtener_matriculas),
+        ("obtener_matriculas[periodo]", lambda: db.obtener_matriculas(m.periodo)),
+        ("existe_matricula[periodo]", lambda: db.existe_matricula(m.id_est, m.cod_curso, m.periodo)),
+        ("obtener_matriculados[periodo]", lambda: db.obtener_matriculados(m.cod_curso, m.periodo)),
+        ("periodos_matriculas", db.periodos_matriculas),
+        ("periodo_cerrado", lambda: db.periodo_cerrado(m.periodo)),
+        ("periodo_archivado", lambda: db.periodo_archivado(m.periodo)),
+        ("alcance_archivado", lambda: db.alcance_archivado(m.periodo)),
+        ("obtener_estudiantes_por_curso", lambda: db.obtener_estudiantes_por_curso(m.cod_curso)),
+        ("obtener_estudiantes", db.obtener_estudiantes),
+        ("obtener_estudiantes[activos]", lambda: db.obtener_estudiantes(activos=True)),
+        ("nombres_estudiantes", db.nombres_estudiantes),
+        ("buscar_estudiantes", lambda: db.buscar_estudiantes(m.termino_estudiante)),
+        ("iterar_historial_asistencia", lambda: list(db.iterar_historial_asistencia(m.cod_curso))),
+        ("obtener_historial_asistencia", lambda: db.obtener_historial_asistencia(m.cod_curso)),
+        ("obtener_historial_asistencia[mes]", lambda: db.obtener_historial_asistencia(m.cod_curso, m.desde, m.hasta)),
+        ("obtener_notas_diccionario", lambda: db.obtener_notas_diccionario(m.cod_curso)),
+        ("iterar_todas_las_notas", lambda: list(db.iterar_todas_las_notas())),
+        ("obtener_todas_las_notas", db.obtener_todas_las_notas),
+        ("analitica_notas", db.analitica_notas),
+    ]
+
+
+def casos_ventanas(db, m):
+    """
+    (nombre, funcion) de lo que cada ventana consulta al cargarse: el codigo
+    de main.py que corre en el hilo de trabajo, sin construir los widgets.
+    """
+    import main  # PyQt solo se importa si se miden las ventanas
+    ventana = SimpleNamespace(db=db)
+    reportes = ReporteController(db)
+    casos = [
+        ("ventana:dashboard", lambda: main.MainApp._consultar_resumen(ventana)),
+        ("ventana:estudiantes", db.obtener_estudiantes),
+        ("ventana:cursos", db.obtener_cursos),
+        ("ventana:matricula", lambda: (main.VentanaMatricula._consultar_combos(ventana), db.periodos_matriculas(),
+                                       db.obtener_matriculas())),
+        ("ventana:notas", lambda: main.VentanaNotas._consultar_tabla(ventana, m.cod_curso)),
+        ("ventana:asistencia", lambda: main.VentanaAsistencia._consultar_tabla(ventana, m.cod_curso, m.fecha)),
+        ("ventana:reportes", lambda: main.VentanaReportes._consultar_filtros(ventana)),
+    ]
+    for tipo in ReporteController.TITULOS:
+        args = (tipo, m.id_est, m.cod_curso)
+        casos.append((f"reporte:{tipo}:vista_previa", lambda args=args: reportes.primera_pagina(*args)[1]))
+        casos.append((f"reporte:{tipo}:completo", lambda args=args: list(reportes.filas(*args))))
+    return casos
+
+
+def casos_escritura(db, m):
+    """
+    (nombre, funcion, antes) de cada escritura. `antes` prepara lo que la
+    escritura necesita (p. ej. el registro a eliminar) y no se mide.
+    """
+    secuencia = count()
+    preparado = []
+
+    def curso_nuevo():
+        return {"codigo": f"BEN-{next(secuencia):05d}", "nombre": "Curso De Prueba",
+                "profesor": "Profesor Prueba", "creditos": 3}
+
+    def estudiante_nuevo():
+        n = next(secuencia)
+        return {"nombre": "Prueba", "apellido": "Benchmark", "carrera": "Derecho",
+                "nacimiento": "2000-01-01", "correo": f"prueba.{n}@mail.com", "activo": True}
+
+    def matricula(id_est, cod_curso):
+        return {"id_est": id_est, "cod_curso": cod_curso, "fecha": m.fecha, "periodo": "2025-1",
+                "estado": "Matriculado"}
+
+    def preparar_curso():
+        curso = curso_nuevo()
+        db.registrar_cursos_lote([curso])
+        preparado.append(curso['codigo'])
+
+    def preparar_estudiante():
+        preparado.append(db.registrar_estudiantes_lote([estudiante_nuevo()])[2][0])
+
+    def preparar_matricula():
+        preparar_curso()
+        db.registrar_matricula(m.id_est, preparado[-1], m.fecha, "2025-1", "Matriculado")
+
+    anios = count(1900)
+
+    def preparar_periodo():
+        # Un periodo nuevo (anterior a los datos) con un lote de matriculas, para cerrarlo
+        preparar_curso()
+        periodo = f"{next(anios)}-1"
+        db.registrar_matriculas_lote([dict(matricula(i, preparado[-1]), periodo=periodo)
+                                      for i in m.roster[:TAMANO_LOTE]])
+        preparado.append(periodo)
+
+    def preparar_periodo_cerrado():
+        preparar_periodo()
+        db.cerrar_periodo(preparado[-1])
+
+    e = m.estudiante
+    alternar = count()
+
+    def asistencia_roster():
+        # Cada repeticion cambia el estado de todo el roster (las filas sin cambios no se escriben)
+        estado = ("Presente", "Ausente")[next(alternar) % 2]
+        return db.registrar_asistencias_lote(m.cod_curso, m.fecha, [(i, estado) for i in m.roster])
+    return [
+        ("registrar_curso", lambda: db.registrar_curso(**curso_nuevo()), None),
+        ("registrar_cursos_lote", lambda: db.registrar_cursos_lote([curso_nuevo() for _ in range(TAMANO_LOTE)]), None),
+        ("actualizar_curso", lambda: db.actualizar_curso(m.cod_curso, "Curso Actualizado", "Profesor Prueba", 4), None),
+        ("eliminar_curso", lambda: db.eliminar_curso(preparado.pop()), preparar_curso),
+        ("registrar_estudiante", lambda: db.registrar_estudiante(**estudiante_nuevo()), None),
+        ("registrar_estudiantes_lote",
+         lambda: db.registrar_estudiantes_lote([estudiante_nuevo() for _ in range(TAMANO_LOTE)]), None),
+        ("actualizar_estudiante", lambda: db.actualizar_estudiante(
+            e['id'], e['nombre'], e['apellido'], e['carrera'], e['nacimiento'], e['correo'], e['activo']), None),
+        ("eliminar_estudiante", lambda: db.eliminar_estudiante(preparado.pop()), preparar_estudiante),
+        ("reservar_ids_estudiantes", lambda: db.reservar_ids_estudiantes(TAMANO_LOTE), None),
+        ("registrar_matricula", lambda: db.registrar_matricula(m.id_est, preparado.pop(), m.fecha, "2025-1",
+                                                               "Matriculado"), preparar_curso),
+        ("registrar_matriculas_lote",
+         lambda: db.registrar_matriculas_lote([matricula(i, preparado[-1]) for i in m.roster[:TAMANO_LOTE]]),
+         preparar_curso),
+        ("eliminar_matricula", lambda: db.eliminar_matricula(m.id_est, preparado.pop()), preparar_matricula),
+        ("cerrar_periodo", lambda: db.cerrar_periodo(preparado.pop()), preparar_periodo),
+        ("archivar_periodo", lambda: db.archivar_periodo(preparado.pop()), preparar_periodo_cerrado),
+        ("registrar_asistencia", lambda: db.registrar_asistencia(
+            m.id_est, m.cod_curso, m.fecha, ("Presente", "Tardanza")[next(alternar) % 2]), None),
+        ("registrar_asistencias_lote", asistencia_roster, None),
+        ("compactar_asistencias", db.compactar_asistencias, None),
+        ("registrar_nota", lambda: db.registrar_nota(m.id_est, m.cod_curso, 15.0, 16.0, next(alternar) % 20), None),
+        ("registrar_notas_lote", lambda: db.registrar_notas_lote(
+            [(i, m.cod_curso, 14.0, 15.0, float(next(alternar) % 20)) for i in m.roster]), None),
+        ("convertir_notas_a_ancho_fijo", db.convertir_notas_a_ancho_fijo, None),
+        ("invalidar_cache", db.invalidar_cache, None),
+    ]
+
+
+def _calentar(db):
+    """Carga todas las tablas en la cache (cada caso en frio descarta la cache completa)."""
+    db.obtener_cursos()
+    db.obtener_estudiantes()
+    db.obtener_matriculas()
+    db.obtener_todas_las_notas()
+    db.obtener_asistencias_raw()
+
+
+def metodos_publicos(clase=DataManager):
+    return sorted(n for n in dir(clase) if not n.startswith("_") and callable(getattr(clase, n)))
+
+
+def _entorno():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(), "cpus": os.cpu_count(), "commit": commit}
+
+
+def ejecutar(params, repeticiones=5, ventanas=True, carpeta_datos=None, progreso=None):
+    """
+    Genera (o reutiliza) los datos de `params`, los copia a una carpeta
+    temporal y mide todos los casos. Retorna el diccionario de resultados.
+    `progreso(nombre)` se llama antes de cada caso.
+    """
+    carpeta, manifiesto = preparar_datos(params, carpeta_datos)
+    resultados = {}
+    with copia_de_trabajo(carpeta):
+        db = DataManager("notas_db.txt")
+        m = _muestra(db)
+
+        consultas = casos_consulta(db, m) + (casos_ventanas(db, m) if ventanas else [])
+        for nombre, funcion in consultas:
+            if progreso:
+                progreso(nombre)
+            resultados[f"{nombre}[frio]"] = medir(funcion, repeticiones, antes=db.invalidar_cache)
+            funcion()  # Deja la cache caliente
+            resultados[f"{nombre}[caliente]"] = medir(funcion, repeticiones)
+
+        # Las escrituras se miden con todas las tablas en cache, como en la aplicacion
+        _calentar(db)
+        for nombre, funcion, antes in casos_escritura(db, m):
+            if progreso:
+                progreso(nombre)
+            resultados[nombre] = medir(funcion, repeticiones, antes=antes, escritura=True)
+
+    medidos = {n.split("[")[0] for n in resultados}
+    return {
+        "version": VERSION_RESULTADOS,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "entorno": _entorno(),
+        "datos": manifiesto,
+        "repeticiones": repeticiones,
+        "sin_medir": [n for n in metodos_publicos() if n not in medidos],
+        "resultados": resultados,
+    }
+
+
+def resumen_texto(datos, salida=sys.stderr):
+    """Tabla legible de los resultados."""
+    for nombre, r in datos["resultados"].items():
+        filas = "" if r.get("filas") is None else f"  ({r['filas']} filas)"
+        print(f"{nombre:58} {r['mediana_ms']:>10.3f} ms{filas}", file=salida)
+    if datos["sin_medir"]:
+        print(f"Metodos publicos sin caso: {', '.join(datos['sin_medir'])}", file=salida)
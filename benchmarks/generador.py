@@ -0,0 +1,189 @@
+"""
+Generador determinista de datos escolares sinteticos.
+
+Escribe estudiantes.txt, cursos.txt, matriculas/ (un archivo por periodo),
+notas_db.txt (ancho fijo), asistencias/ (un segmento por curso y mes) y
+carreras.txt con el mismo formato que DataManager.
+Con la misma semilla y los mismos parametros el contenido es identico byte a
+byte, asi los tiempos de distintas ejecuciones son comparables.
+
+Las asistencias se reparten entre todas las matriculas: cada matricula
+recibe el mismo numero de clases (fechas distintas), sin claves repetidas.
+"""
+import json
+import os
+import random
+import shutil
+import unicodedata
+from datetime import date, timedelta
+
+from data.notas_fijas import CABECERA_BYTES, formatear_registro
+from data.particiones import particionar_matriculas
+from data.segmentos import segmentar_asistencias
+
+TAMANOS = {
+    "pequeno": {"estudiantes": 1_000, "cursos": 50, "matriculas_por_estudiante": 5, "asistencias": 100_000},
+    "mediano": {"estudiantes": 10_000, "cursos": 200, "matriculas_por_estudiante": 5, "asistencias": 1_000_000},
+    "grande": {"estudiantes": 100_000, "cursos": 1_000, "matriculas_por_estudiante": 5, "asistencias": 10_000_000},
+}
+SEMILLA = 2024
+ID_INICIAL = 2024001
+FRACCION_CON_NOTAS = 0.8   # Matriculas que ya tienen notas registradas
+MANIFIESTO = "generador.json"
+FORMATO = 3  # Cambia con la disposicion de los archivos: los datos generados antes se regeneran
+
+NOMBRES = ["Ana", "María", "Carlos", "Sofía", "Jorge", "Lucía", "Pedro", "Elena", "Miguel", "Valeria",
+           "José", "Camila", "Luis", "Daniela", "Diego", "Gabriela", "Andrés", "Paula", "Javier", "Rosa",
+           "Fernando", "Carmen", "Ricardo", "Isabel", "Raúl", "Patricia", "Alejandro", "Mónica", "Hugo", "Teresa"]
+APELLIDOS = ["García", "Rodríguez", "Sánchez", "López", "Fernández", "Martínez", "González", "Díaz", "Ruiz",
+             "Torres", "Flores", "Ramírez", "Navas", "Robles", "Castillo", "Vargas", "Mendoza", "Rojas",
+             "Quispe", "Huamán", "Chávez", "Morales", "Ortiz", "Silva", "Reyes", "Cruz", "Paredes", "Salazar"]
+CARRERAS = ["Ingeniería de Sistemas", "Derecho", "Arquitectura", "Medicina", "Diseño Gráfico",
+            "Ingeniería Civil", "Psicología", "Administración", "Contabilidad", "Marketing"]
+MATERIAS = ["Matemática", "Lenguaje", "Física", "Química", "Estadística", "Base de Datos", "Desarrollo Web",
+            "Programación", "Economía", "Contabilidad General", "Derecho Civil", "Anatomía", "Dibujo Técnico",
+            "Psicología General", "Marketing Digital", "Inglés", "Filosofía", "Historia", "Redes", "Ética"]
+PERIODOS = {"2024-1": date(2024, 3, 4), "2024-2": date(2024, 8, 19),
+            "2025-1": date(2025, 3, 3), "2025-2": date(2025, 8, 18)}
+ESTADOS_MATRICULA = (("Matriculado", 92), ("Retirado", 5), ("Suspendido", 3))
+ESTADOS_ASISTENCIA = (("Presente", 85), ("Tardanza", 8), ("Ausente", 7))
+INICIO_CLASES = date(2025, 3, 3)
+
+LINEAS_POR_ESCRITURA = 100_000
+
+
+def _sin_tildes(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _escribir(ruta, cabecera, lineas):
+    """Escribe `cabecera` y las lineas de un generador en bloques."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(cabecera)
+        bloque = []
+        for linea in lineas:
+            bloque.append(linea)
+            if len(bloque) >= LINEAS_POR_ESCRITURA:
+                f.writelines(bloque)
+                bloque.clear()
+        f.writelines(bloque)
+
+
+def parametros(tamano="pequeno", **cambios):
+    """Parametros del tamano predefinido con los `cambios` (los None se ignoran)."""
+    valores = dict(TAMANOS[tamano])
+    valores.update({k: v for k, v in cambios.items() if v is not None})
+    valores.setdefault("semilla", SEMILLA)
+    return valores
+
+
+def generar(carpeta, estudiantes, cursos, matriculas_por_estudiante, asistencias, semilla=SEMILLA):
+    """
+    Genera los archivos de datos en `carpeta` y un manifiesto (generador.json)
+    con los parametros y los conteos. Retorna el manifiesto.
+    """
+    if matriculas_por_estudiante > cursos:
+        raise ValueError("No puede haber mas matriculas por estudiante que cursos")
+    os.makedirs(carpeta, exist_ok=True)
+    rnd = random.Random(semilla)
+    ruta = lambda nombre: os.path.join(carpeta, nombre)
+
+    with open(ruta("carreras.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(c + "\n" for c in CARRERAS)
+
+    # --- Estudiantes ---
+    ids = [str(ID_INICIAL + i) for i in range(estudiantes)]
+
+    def lineas_estudiantes():
+        for id_est in ids:
+            nombre = rnd.choice(NOMBRES)
+            apellido = f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+            nacimiento = date(1995, 1, 1) + timedelta(days=rnd.randrange(12 * 365))
+            correo = f"{_sin_tildes(nombre).lower()}.{id_est}@mail.com"
+            activo = "1" if rnd.random() < 0.95 else "0"
+            yield f"{id_est}|{nombre}|{apellido}|{rnd.choice(CARRERAS)}|{nacimiento}|{correo}|{activo}\n"
+
+    _escribir(ruta("estudiantes.txt"), "ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n",
+              lineas_estudiantes())
+
+    # --- Cursos ---
+    codigos = [f"CUR-{i + 1:03d}" for i in range(cursos)]
+
+    def lineas_cursos():
+        for i, codigo in enumerate(codigos):
+            nombre = MATERIAS[i % len(MATERIAS)]
+            if i >= len(MATERIAS):
+                nombre = f"{nombre} {i // len(MATERIAS) + 1}"
+            profesor = f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+            yield f"{codigo}|{nombre}|{profesor}|{rnd.randint(2, 5)}\n"
+
+    _escribir(ruta("cursos.txt"), "CODIGO|NOMBRE|PROFESOR|CREDITOS\n", lineas_cursos())
+
+    # --- Matriculas ---
+    pares = []
+    periodos = list(PERIODOS)
+    estados, pesos = zip(*ESTADOS_MATRICULA)
+
+    def lineas_matriculas():
+        for id_est in ids:
+            for i in rnd.sample(range(cursos), matriculas_por_estudiante):
+                periodo = rnd.choice(periodos)
+                fecha = PERIODOS[periodo] - timedelta(days=rnd.randrange(1, 15))
+                pares.append((id_est, codigos[i]))
+                yield f"{id_est}|{codigos[i]}|{fecha}|{periodo}|{rnd.choices(estados, pesos)[0]}\n"
+
+    # Se escribe en el formato anterior y se particiona con la misma migracion que usa DataManager
+    _escribir(ruta("matriculas.txt"), "ID_ESTUDIANTE|CODIGO_CURSO|FECHA|PERIODO|ESTADO\n", lineas_matriculas())
+    shutil.rmtree(ruta("matriculas"), ignore_errors=True)
+    particionar_matriculas(ruta("matriculas.txt"), ruta("matriculas"))
+    os.remove(ruta("matriculas.txt"))
+
+    # --- Notas (ancho fijo) ---
+    def nota():
+        return min(max(round(rnd.gauss(13.5, 3.5) * 2) / 2, 0.0), 20.0)
+
+    con_notas = 0
+    with open(ruta("notas_db.txt"), 'wb') as f:
+        f.write(CABECERA_BYTES)
+        for id_est, codigo in pares:
+            if rnd.random() < FRACCION_CON_NOTAS:
+                n1, n2, n3 = nota(), nota(), nota()
+                f.write(formatear_registro(id_est, codigo, n1, n2, n3, round((n1 + n2 + n3) / 3, 2)))
+                con_notas += 1
+
+    # --- Asistencias: las clases de cada matricula, dia por medio desde INICIO_CLASES ---
+    por_matricula, sobrantes = divmod(asistencias, len(pares)) if pares else (0, 0)
+    fechas = [(INICIO_CLASES + timedelta(days=2 * j)).isoformat() for j in range(por_matricula + 1)]
+    estados_asistencia, pesos_asistencia = zip(*ESTADOS_ASISTENCIA)
+
+    def lineas_asistencias():
+        for i, (id_est, codigo) in enumerate(pares):
+            clases = por_matricula + (1 if i < sobrantes else 0)
+            for fecha, estado in zip(fechas, rnd.choices(estados_asistencia, pesos_asistencia, k=clases)):
+                yield f"{id_est}|{codigo}|{fecha}|{estado}\n"
+
+    _escribir(ruta("asistencias.txt"), "ID_ESTUDIANTE|CODIGO_CURSO|FECHA|ESTADO\n", lineas_asistencias())
+    shutil.rmtree(ruta("asistencias"), ignore_errors=True)
+    segmentar_asistencias(ruta("asistencias.txt"), ruta("asistencias"))
+    os.remove(ruta("asistencias.txt"))
+
+    manifiesto = {
+        "formato": FORMATO,
+        "parametros": {"estudiantes": estudiantes, "cursos": cursos,
+                       "matriculas_por_estudiante": matriculas_por_estudiante,
+                       "asistencias": asistencias, "semilla": semilla},
+        "conteos": {"estudiantes": estudiantes, "cursos": cursos, "matriculas": len(pares),
+                    "notas": con_notas, "asistencias": asistencias if pares else 0},
+    }
+    with open(ruta(MANIFIESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=2)
+    return manifiesto
+
+
+def leer_manifiesto(carpeta):
+    """Manifiesto de una carpeta generada, o None si no existe."""
+    try:
+        with open(os.path.join(carpeta, MANIFIESTO), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
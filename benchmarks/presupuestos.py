@@ -0,0 +1,137 @@
+"""
+Presupuestos de E/S por accion (ver data/contabilidad_io.py).
+
+Sobre los mismos casos que ejecutar.py:
+    - cada consulta de DataManager y la carga de cada ventana y reporte, en
+      frio, lee cada archivo a lo sumo una vez y no escribe nada; en caliente
+      no abre ningun archivo. Las consultas de un periodo ("[periodo]") no
+      abren las matriculas de otros periodos, y las de asistencia de un
+      curso o un mes ("[mes]") solo abren el manifiesto y sus segmentos
+    - cada escritura, con la cache caliente, abre solo sus archivos una vez,
+      sin releerlos, y reescribe el archivo completo solo si la operacion lo
+      exige (ESCRITURAS)
+
+Una escritura nueva sin entrada en ESCRITURAS tiene el presupuesto por defecto.
+"""
+import os
+
+from data.contabilidad_io import contabilizar, excesos
+from data.data_manager import DataManager
+from data.notas_fijas import ANCHO_REGISTRO
+from data.particiones import ruta_particion
+from data.segmentos import ARCHIVADOS, MANIFIESTO, archivo_segmento, leer_manifiesto, mes_de_fecha
+from .ejecutar import _calentar, _muestra, casos_consulta, casos_escritura, casos_ventanas, copia_de_trabajo, preparar_datos
+
+CONSULTA_FRIO = {"lecturas": 1, "escrituras": 0}
+CONSULTA_CALIENTE = {"aperturas": 0}
+ESCRITURA = {"aperturas": 1, "lecturas": 0, "reescrituras": 0}
+PARTICION = ruta_particion("matriculas", "2025-1")  # Periodo de las matriculas que escriben los casos
+CARPETA_ASISTENCIAS = "asistencias"
+
+_SECUENCIA = {"estudiantes.seq": 1, "*": 0}  # El archivo de la secuencia se lee y se reescribe entero (un numero)
+ESCRITURAS = {
+    "registrar_curso": {"solo_archivos": {"cursos.txt"}},
+    "registrar_cursos_lote": {"solo_archivos": {"cursos.txt"}},
+    "actualizar_curso": {"solo_archivos": {"cursos.txt"}, "reescrituras": 1},
+    "eliminar_curso": {"solo_archivos": {"cursos.txt"}, "reescrituras": 1},
+    "registrar_estudiante": {"solo_archivos": {"estudiantes.txt", "estudiantes.seq"},
+                             "lecturas": _SECUENCIA, "reescrituras": _SECUENCIA},
+    "registrar_estudiantes_lote": {"solo_archivos": {"estudiantes.txt", "estudiantes.seq"},
+                                   "lecturas": _SECUENCIA, "reescrituras": _SECUENCIA},
+    "actualizar_estudiante": {"solo_archivos": {"estudiantes.txt"}, "reescrituras": 1},
+    "eliminar_estudiante": {"solo_archivos": {"estudiantes.txt"}, "reescrituras": 1},
+    "reservar_ids_estudiantes": {"solo_archivos": {"estudiantes.seq"}, "lecturas": 1, "reescrituras": 1},
+    "registrar_matricula": {"solo_archivos": {PARTICION}},
+    "registrar_matriculas_lote": {"solo_archivos": {PARTICION}},
+    # Lee las lineas crudas para conservarlas tal cual
+    "eliminar_matricula": {"solo_archivos": {PARTICION}, "aperturas": 2, "lecturas": 1, "reescrituras": 1},
+    # Escribe el archivo cerrado (la particion abierta ya esta en cache) y elimina la abierta
+    "cerrar_periodo": {"reescrituras": 1},
+    # Lee el archivo cerrado (no queda en cache al cerrar) y escribe su .gz
+    "archivar_periodo": {"aperturas": 2, "lecturas": 1, "reescrituras": 1},
+    # Las de asistencias dependen del segmento de la muestra (ver _asistencias)
+    # Un registro existente se sobreescribe en el lugar
+    "registrar_nota": {"solo_archivos": {"notas_db.txt"}, "bytes_escritos": ANCHO_REGISTRO},
+    "registrar_notas_lote": {"solo_archivos": {"notas_db.txt"}},
+    # Lee el archivo y escribe el temporal que lo reemplaza
+    "convertir_notas_a_ancho_fijo": {"solo_archivos": {"notas_db.txt"}, "aperturas": 2, "lecturas": 1,
+                                     "reescrituras": 1},
+    "invalidar_cache": {"aperturas": 0},
+}
+
+
+def _segmentos(cod_curso=None, desde=None, hasta=None):
+    """Los manifiestos y los segmentos (y archivados) de asistencia que le corresponden a una consulta acotada."""
+    rutas = (leer_manifiesto(CARPETA_ASISTENCIAS).rutas(cod_curso, desde, hasta)
+             + leer_manifiesto(CARPETA_ASISTENCIAS, ARCHIVADOS).rutas(cod_curso, desde, hasta))
+    return {os.path.join(CARPETA_ASISTENCIAS, MANIFIESTO), os.path.join(CARPETA_ASISTENCIAS, ARCHIVADOS),
+            *map(os.path.normpath, rutas)}
+
+
+def _asistencias(m):
+    """
+    ({consulta: archivos permitidos}, {escritura: limites}) de asistencias:
+    las consultas leen solo los segmentos de su curso y sus meses y las
+    escrituras del dia de la muestra solo tocan el segmento de ese mes.
+    """
+    segmento = os.path.join(CARPETA_ASISTENCIAS, archivo_segmento(m.cod_curso, mes_de_fecha(m.fecha)))
+    consultas = {
+        "obtener_asistencia_estudiante": _segmentos(m.cod_curso, m.fecha, m.fecha),
+        "obtener_asistencias_curso_fecha": _segmentos(m.cod_curso, m.fecha, m.fecha),
+        "iterar_historial_asistencia": _segmentos(m.cod_curso),
+        "obtener_historial_asistencia": _segmentos(m.cod_curso),
+        "obtener_historial_asistencia[mes]": _segmentos(m.cod_curso, m.desde, m.hasta),
+        "obtener_asistencias_raw[mes]": _segmentos(None, m.desde, m.hasta),
+    }
+    escrituras = {
+        "registrar_asistencia": {"solo_archivos": {segmento}},
+        "registrar_asistencias_lote": {"solo_archivos": {segmento}},
+        # Solo el segmento con lineas superadas (el de las escrituras anteriores)
+        "compactar_asistencias": {"solo_archivos": {segmento}, "reescrituras": 1},
+    }
+    return consultas, escrituras
+
+
+def _consulta_frio(nombre, periodo, asistencias):
+    if nombre in asistencias:
+        return {**CONSULTA_FRIO, "solo_archivos": asistencias[nombre]}
+    if not nombre.endswith("[periodo]"):
+        return CONSULTA_FRIO
+    # De las matriculas, solo el archivo del periodo (mas los nombres de estudiantes y cursos)
+    return {**CONSULTA_FRIO, "solo_archivos": {ruta_particion("matriculas", periodo), "estudiantes.txt", "cursos.txt"}}
+
+
+def _verificar(nombre, funcion, limites):
+    with contabilizar(nombre) as accion:
+        funcion()
+    return nombre, accion, excesos(accion, **limites)
+
+
+def verificar_presupuestos(params, ventanas=True, carpeta_datos=None, progreso=None):
+    """
+    Ejecuta cada caso una vez sobre una copia de los datos de `params`.
+    Retorna [(caso, Accion, excesos)]; el caso cumple si `excesos` esta vacio.
+    """
+    carpeta, _ = preparar_datos(params, carpeta_datos)
+    resultados = []
+    with copia_de_trabajo(carpeta):
+        db = DataManager("notas_db.txt")
+        m = _muestra(db)
+        consultas_asistencia, escrituras_asistencia = _asistencias(m)
+
+        for nombre, funcion in casos_consulta(db, m) + (casos_ventanas(db, m) if ventanas else []):
+            if progreso:
+                progreso(nombre)
+            db.invalidar_cache()
+            resultados.append(_verificar(f"{nombre}[frio]", funcion, _consulta_frio(nombre, m.periodo, consultas_asistencia)))
+            resultados.append(_verificar(f"{nombre}[caliente]", funcion, CONSULTA_CALIENTE))
+
+        _calentar(db)
+        for nombre, funcion, antes in casos_escritura(db, m):
+            if progreso:
+                progreso(nombre)
+            if antes is not None:
+                antes()
+            limites = {**ESCRITURA, **ESCRITURAS.get(nombre, {}), **escrituras_asistencia.get(nombre, {})}
+            resultados.append(_verificar(nombre, funcion, limites))
+    return resultados
@@ -0,0 +1,244 @@
+"""
+Interfaz de linea de comandos para tareas por lotes (cron, servidores sin
+pantalla). No importa PyQt: usa DataManager y los controladores directamente.
+
+    python cli.py --help
+    python cli.py importar estudiantes alumnos.csv --errores errores.csv
+    python cli.py reporte riesgo -o riesgo.csv
+    python cli.py reporte asistencia -c CUR-001 --desde 2025-12-01 --hasta 2025-12-31
+    python cli.py verificar
+    python cli.py cerrar-periodo 2024-2
+    python cli.py archivar-periodo 2024-2 --simular
+
+El backend se elige igual que en main.py (REGISTRO_BACKEND=sqlite y
+REGISTRO_DB) o con --backend / --db.
+"""
+import os
+import sys
+from functools import partial
+
+import click
+
+from controllers.historial_controller import HistorialController
+from controllers.importacion_controller import ImportacionController
+from controllers.mantenimiento_controller import MantenimientoController
+from controllers.reporte_controller import ReporteController, escribir_csv, escribir_json
+from data import instrumentacion
+
+# Nombres cortos (sin tildes ni espacios) de los reportes de VentanaReportes
+REPORTES = {
+    "historial": "Historial Académico",
+    "asistencia": "Lista de Asistencia",
+    "padron": "Padrón de Matrícula",
+    "riesgo": "Rendimiento / Riesgo",
+    "estadisticas-curso": "Estadísticas por Curso",
+    "estadisticas-carrera": "Estadísticas por Carrera",
+    "distribucion": "Distribución de Promedios",
+}
+
+# Tablas exportables: (columnas, funcion que retorna las filas como dicts)
+TABLAS = {
+    "estudiantes": (["id", "nombre", "apellido", "carrera", "nacimiento", "correo", "activo"],
+                    lambda db: db.obtener_estudiantes()),
+    "cursos": (["codigo", "nombre", "profesor", "creditos"], lambda db: db.obtener_cursos()),
+    "matriculas": (["id_est", "cod_curso", "estudiante", "curso", "fecha", "periodo", "estado"],
+                   lambda db: db.obtener_matriculas()),
+    "notas": (["id", "nombre", "cod_curso", "curso", "n1", "n2", "n3", "promedio"],
+              lambda db: db.iterar_todas_las_notas()),
+    "asistencias": (["id", "curso", "fecha", "estado"], lambda db: db.obtener_asistencias_raw()),
+}
+
+
+def abrir_db(backend, archivo_db):
+    if backend == "sqlite":
+        from data.sqlite_manager import SQLiteDataManager
+        return SQLiteDataManager(archivo_db)
+    from data.data_manager import DataManager
+    return DataManager("notas_db.txt")
+
+
+def escribir(salida, formato, titulos, filas):
+    """Escribe en `salida` ("-" = salida estandar) segun el formato o la extension."""
+    if formato is None:
+        extension = os.path.splitext(salida)[1].lower()
+        formato = {".json": "json", ".jsonl": "jsonl"}.get(extension, "csv")
+    if salida == "-":
+        f, cerrar = sys.stdout, False
+    else:
+        f, cerrar = open(salida, 'w', newline='', encoding='utf-8'), True
+    try:
+        if formato == "csv":
+            return escribir_csv(f, titulos, filas)
+        return escribir_json(f, titulos, filas, lineas=(formato == "jsonl"))
+    finally:
+        if cerrar:
+            f.close()
+
+
+opcion_formato = click.option("--formato", type=click.Choice(["csv", "json", "jsonl"]),
+                              help="Por defecto segun la extension de la salida (csv si no tiene).")
+
+
+@click.group()
+@click.option("-C", "--directorio", type=click.Path(exists=True, file_okay=False),
+              help="Carpeta con los archivos de datos (por defecto la actual).")
+@click.option("--backend", type=click.Choice(["txt", "sqlite"]),
+              default=lambda: os.environ.get("REGISTRO_BACKEND", "txt"), show_default="REGISTRO_BACKEND o txt")
+@click.option("--db", "archivo_db", default=lambda: os.environ.get("REGISTRO_DB", "registro.db"),
+              show_default="REGISTRO_DB o registro.db", help="Base SQLite (solo con --backend sqlite).")
+@click.option("--metricas", type=click.Path(dir_okay=False),
+              help="Mide cada llamada a los datos y guarda las metricas en este JSON al terminar.")
+@click.pass_context
+def cli(ctx, directorio, backend, archivo_db, metricas):
+    """Registro de notas: importacion, exportacion, reportes y mantenimiento."""
+    if metricas:
+        instrumentacion.activar(volcar_en=os.path.abspath(metricas))  # Antes de cambiar de carpeta
+    if directorio:
+        os.chdir(directorio)
+    # La base se abre recien cuando un comando la necesita (--help no toca los datos)
+    ctx.obj = partial(abrir_db, backend, archivo_db)
+
+
+@cli.command()
+@click.argument("tipo", type=click.Choice(ImportacionController.TIPOS))
+@click.argument("archivo", type=click.Path(exists=True, dir_okay=False))
+@click.option("--errores", type=click.Path(dir_okay=False), help="CSV con las filas rechazadas.")
+@click.pass_obj
+def importar(abrir, tipo, archivo, errores):
+    """Importa un CSV de estudiantes, cursos, matriculas o notas."""
+    importador = ImportacionController(abrir())
+    try:
+        importadas, rechazadas = importador.importar(tipo, archivo)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{importadas} filas importadas, {len(rechazadas)} con errores")
+    if errores:
+        importador.escribir_reporte_errores(errores, rechazadas)
+    else:
+        for linea, mensaje in rechazadas:
+            click.echo(f"  línea {linea}: {mensaje}", err=True)
+    if rechazadas:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("tabla", type=click.Choice(list(TABLAS)))
+@click.argument("salida", default="-")
+@opcion_formato
+@click.pass_obj
+def exportar(abrir, tabla, salida, formato):
+    """Exporta una tabla completa a CSV / JSON / JSON Lines (por defecto a la salida estandar)."""
+    columnas, leer = TABLAS[tabla]
+    filas = ([fila.get(c, "") for c in columnas] for fila in leer(abrir()))
+    cantidad = escribir(salida, formato, columnas, filas)
+    click.echo(f"{cantidad} filas exportadas", err=True)
+
+
+@cli.command()
+@click.argument("tipo", type=click.Choice(list(REPORTES)))
+@click.option("-e", "--estudiante", help="ID del estudiante (historial).")
+@click.option("-c", "--curso", help="Codigo del curso (asistencia, padron).")
+@click.option("--desde", help="Primera fecha AAAA-MM-DD (asistencia).")
+@click.option("--hasta", help="Ultima fecha AAAA-MM-DD (asistencia).")
+@click.option("-o", "--salida", default="-", help="Archivo de salida (por defecto la salida estandar).")
+@opcion_formato
+@click.pass_obj
+def reporte(abrir, tipo, estudiante, curso, desde, hasta, salida, formato):
+    """Genera cualquiera de los reportes de la ventana de Reportes."""
+    if tipo == "historial" and not estudiante:
+        raise click.UsageError("El historial requiere --estudiante")
+    if tipo in ("asistencia", "padron") and not curso:
+        raise click.UsageError(f"El reporte {tipo} requiere --curso")
+    reportes = ReporteController(abrir())
+    nombre = REPORTES[tipo]
+    cantidad = escribir(salida, formato, reportes.titulos(nombre),
+                        reportes.filas(nombre, estudiante, curso, desde, hasta))
+    click.echo(f"{cantidad} filas", err=True)
+
+
+@cli.command()
+@click.argument("carpeta", type=click.Path(file_okay=False))
+@click.option("--procesos", type=int, help="Procesos en paralelo (por defecto, todos los nucleos).")
+@click.pass_obj
+def historiales(abrir, carpeta, procesos):
+    """Historial Academico (CSV) de todos los estudiantes activos; reanudable."""
+    escritos, total = HistorialController(abrir()).generar_todos(carpeta, "csv", procesos=procesos)
+    if total == 0:
+        click.echo("Todos los historiales ya estaban generados")
+    else:
+        click.echo(f"{escritos} de {total} historiales generados en {carpeta}")
+
+
+@cli.command("recalcular-promedios")
+@click.option("--simular", is_flag=True, help="Solo muestra los promedios incorrectos, sin corregirlos.")
+@click.pass_obj
+def recalcular_promedios(abrir, simular):
+    """Recalcula el promedio de cada nota a partir de N1, N2 y N3."""
+    diferencias = MantenimientoController(abrir()).recalcular_promedios(aplicar=not simular)
+    for id_est, cod_curso, guardado, correcto in diferencias:
+        click.echo(f"  {id_est}/{cod_curso}: {guardado} -> {correcto}")
+    accion = "incorrectos" if simular else "corregidos"
+    click.echo(f"{len(diferencias)} promedios {accion}")
+
+
+@cli.command()
+@click.pass_obj
+def periodos(abrir):
+    """Lista los periodos con matriculas y si estan cerrados o archivados."""
+    db = abrir()
+    for periodo, cerrado in db.periodos_matriculas():
+        estado = "archivado" if db.periodo_archivado(periodo) else "cerrado" if cerrado else "abierto"
+        click.echo(f"{periodo}\t{estado}")
+
+
+@cli.command("cerrar-periodo")
+@click.argument("periodo")
+@click.pass_obj
+def cerrar_periodo(abrir, periodo):
+    """Archiva las matriculas de PERIODO en solo lectura (no admite nuevas ni eliminaciones)."""
+    exito, mensaje, cantidad = abrir().cerrar_periodo(periodo)
+    if not exito:
+        raise click.ClickException(mensaje)
+    click.echo(f"{mensaje}: {cantidad} matrículas archivadas")
+
+
+@cli.command("archivar-periodo")
+@click.argument("periodo")
+@click.option("--simular", is_flag=True, help="Solo muestra los cursos y meses que quedarian en solo lectura.")
+@click.option("-s", "--si", is_flag=True, help="No pide confirmacion (tareas programadas).")
+@click.pass_obj
+def archivar_periodo(abrir, periodo, simular, si):
+    """
+    Comprime las matriculas de PERIODO (ya cerrado) y las asistencias y notas
+    de esas matriculas en archivos .gz de solo lectura.
+    """
+    db = abrir()
+    alcance = db.alcance_archivado(periodo)
+    if alcance:
+        click.echo(f"Quedan en solo lectura {len(alcance)} cursos:")
+        for cod_curso, meses in alcance.items():
+            click.echo(f"  {cod_curso}: {', '.join(meses) if meses else 'sin asistencias'}")
+    if simular:
+        return
+    if alcance and not si:
+        click.confirm(f"¿Archivar el periodo {periodo}?", abort=True)
+    exito, mensaje, cantidades = db.archivar_periodo(periodo)
+    if not exito:
+        raise click.ClickException(mensaje)
+    click.echo(f"{mensaje}: " + ", ".join(f"{cantidad} {tabla}" for tabla, cantidad in cantidades.items()))
+
+
+@cli.command()
+@click.pass_obj
+def verificar(abrir):
+    """Verifica la integridad de los datos; termina con codigo 1 si hay problemas."""
+    problemas = MantenimientoController(abrir()).verificar_integridad()
+    for tabla, clave, problema in problemas:
+        click.echo(f"{tabla}\t{clave}\t{problema}")
+    click.echo(f"{len(problemas)} problemas encontrados", err=True)
+    if problemas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
@@ -25,3 +25,31 @@ class AsistenciaController:
         except ValueError as e:
             print(f"Error de validación en controlador: {e}")
             return False
+
+    def registrar_asistencias_lote(self, cod_curso, fecha, estados):
+        """
+        Registra la asistencia de todo el roster de un curso para una fecha.
+        `estados` es una lista de (id_estudiante, estado). Cada fila se valida
+        con el modelo Asistencia y las validas se guardan en una sola escritura.
+        Retorna una lista de (id_estudiante, exito, mensaje) por fila.
+        """
+        resultados = []
+        validos = []
+        for id_estudiante, estado in estados:
+            try:
+                asistencia = Asistencia(id_estudiante, cod_curso, fecha, estado)
+                validos.append((asistencia.estudiante_id, asistencia.estado))
+                resultados.append([id_estudiante, True, ""])
+            except ValueError as e:
+                resultados.append([id_estudiante, False, str(e)])
+
+        if validos:
+            exito, mensaje, _ = self.db.registrar_asistencias_lote(cod_curso, fecha, validos)
+        else:
+            exito, mensaje = True, "Sin cambios"
+
+        for r in resultados:
+            if r[1]:
+                r[1] = exito
+                r[2] = mensaje
+        return [tuple(r) for r in resultados]
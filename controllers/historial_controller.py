@@ -0,0 +1,120 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from controllers.reporte_controller import ReporteController
+
+
+# Estudiantes que se envian juntos a cada proceso (menos viajes entre procesos)
+ESTUDIANTES_POR_TAREA = 25
+
+_app = None  # QGuiApplication de cada proceso del pool (solo para PDF)
+
+
+def _iniciar_proceso(formato):
+    # Cada proceso del pool dibuja sus PDF con su propia QGuiApplication, sin ventanas
+    global _app
+    if formato == "pdf":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtGui import QGuiApplication
+        _app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def _escribir_historiales(carpeta, formato, lote):
+    """
+    Escribe el historial de cada estudiante de `lote` [(id, nombre, filas)].
+    Cada archivo se escribe como .parcial y se renombra al terminar: si el
+    proceso se interrumpe no queda un historial a medias con el nombre final.
+    Retorna los ids escritos.
+    """
+    titulos = ReporteController.TITULOS["Historial Académico"]
+    escritos = []
+    for id_est, nombre, filas in lote:
+        ruta = ruta_historial(carpeta, id_est, formato)
+        parcial = ruta + ".parcial"
+        if formato == "pdf":
+            from views.pdf_reporte import dibujar_reporte_pdf
+            dibujar_reporte_pdf(parcial, "Historial Académico", f"{nombre} ({id_est})", titulos, filas)
+        else:
+            with open(parcial, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(titulos)
+                writer.writerows(filas)
+        os.replace(parcial, ruta)
+        escritos.append(id_est)
+    return escritos
+
+
+def ruta_historial(carpeta, id_est, formato):
+    return os.path.join(carpeta, f"historial_{id_est}.{formato}")
+
+
+class HistorialController:
+    """
+    Genera en lote el Historial Académico de todos los estudiantes activos.
+
+    Las notas se recorren una sola vez agrupandolas por estudiante y los
+    archivos (PDF o CSV, uno por estudiante) se escriben repartidos en un
+    pool de procesos. Es reanudable: los historiales que ya existen en la
+    carpeta se omiten, asi que si se interrumpe basta con volver a ejecutarlo.
+    """
+    FORMATOS = ("pdf", "csv")
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def agrupar_notas(self):
+        """Retorna {id_est: [filas del historial]} recorriendo las notas una sola vez."""
+        por_estudiante = {}
+        for n in self.db.iterar_todas_las_notas():
+            por_estudiante.setdefault(n['id'], []).append(ReporteController.fila_historial(n))
+        return por_estudiante
+
+    def pendientes(self, carpeta, formato):
+        """Lista [(id, nombre, filas)] de los estudiantes activos sin historial en `carpeta`."""
+        notas = self.agrupar_notas()
+        return [
+            (e['id'], f"{e['nombre']} {e['apellido']}", notas.get(e['id'], []))
+            for e in self.db.obtener_estudiantes(activos=True)
+            if not os.path.exists(ruta_historial(carpeta, e['id'], formato))
+        ]
+
+    def generar_todos(self, carpeta, formato="pdf", procesos=None, progreso=None):
+        """
+        Escribe los historiales pendientes en `carpeta` usando `procesos`
+        procesos (por defecto, todos los nucleos).
+
+        `progreso(hechos, total)` se llama cada vez que termina un grupo de
+        estudiantes; si retorna False se cancelan los grupos que aun no
+        empezaron (lo ya escrito se conserva para la proxima ejecucion).
+        Retorna (escritos, total_pendientes).
+        """
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato}")
+        os.makedirs(carpeta, exist_ok=True)
+
+        pendientes = self.pendientes(carpeta, formato)
+        if not pendientes:
+            return 0, 0
+
+        lotes = [pendientes[i:i + ESTUDIANTES_POR_TAREA]
+                 for i in range(0, len(pendientes), ESTUDIANTES_POR_TAREA)]
+        procesos = max(1, min(procesos or os.cpu_count() or 1, len(lotes)))
+
+        # "spawn" para no heredar el estado de Qt ni los hilos del proceso de la GUI
+        contexto = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(procesos, mp_context=contexto,
+                                   initializer=_iniciar_proceso, initargs=(formato,))
+        try:
+            futuros = [pool.submit(_escribir_historiales, carpeta, formato, lote) for lote in lotes]
+            hechos = 0
+            for futuro in as_completed(futuros):
+                hechos += len(futuro.result())
+                if progreso is not None and progreso(hechos, len(pendientes)) is False:
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        # Los grupos que ya estaban corriendo al cancelar tambien terminan
+        escritos = sum(len(f.result()) for f in futuros if not f.cancelled() and f.exception() is None)
+        return escritos, len(pendientes)
@@ -0,0 +1,201 @@
+import csv
+import sys
+from datetime import date
+
+from model.validaciones import (validar_curso, validar_estudiante, validar_matricula, validar_nacimiento,
+                                validar_notas)
+
+
+class ImportacionController:
+    """
+    Importacion masiva desde CSV (estudiantes, cursos, matriculas y notas).
+
+    El archivo se lee fila por fila y cada fila se valida con las mismas
+    reglas que los formularios (model/validaciones.py). Los duplicados se
+    detectan contra los indices en memoria de DataManager y contra las filas
+    anteriores del mismo archivo. Todas las filas validas se guardan con una
+    sola escritura por archivo de datos (metodos registrar_*_lote).
+
+    Cada importacion retorna (importadas, errores), donde errores es una
+    lista de (linea, mensaje) con la linea del CSV que se rechazo.
+    """
+    TIPOS = ("estudiantes", "cursos", "matriculas", "notas")
+    COLUMNAS = {
+        "estudiantes": ("nombre", "apellido", "carrera", "nacimiento", "correo"),  # Opcional: activo
+        "cursos": ("codigo", "nombre", "profesor", "creditos"),
+        "matriculas": ("id_estudiante", "codigo_curso", "periodo"),                # Opcionales: fecha, estado
+        "notas": ("id_estudiante", "codigo_curso", "n1", "n2", "n3"),
+    }
+    VALORES_INACTIVO = ("0", "no", "false", "inactivo")
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self._importadores = {
+            "estudiantes": self._importar_estudiantes,
+            "cursos": self._importar_cursos,
+            "matriculas": self._importar_matriculas,
+            "notas": self._importar_notas,
+        }
+
+    def importar(self, tipo, ruta):
+        """Importa el CSV `ruta` como `tipo`. Lanza ValueError si faltan columnas."""
+        if tipo not in self._importadores:
+            raise ValueError(f"Tipo de importación no soportado: {tipo}")
+        return self._importadores[tipo](self._leer_csv(ruta, tipo))
+
+    def _leer_csv(self, ruta, tipo):
+        """
+        Generador de (linea, fila) con las columnas en minusculas.
+        Acepta ',' o ';' como separador (Excel en español usa ';') y el BOM de Excel.
+        """
+        with open(ruta, 'r', newline='', encoding='utf-8-sig') as f:
+            muestra = f.read(4096)
+            f.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=",;")
+            except csv.Error:
+                dialecto = csv.excel
+            lector = csv.reader(f, dialecto)
+            cabecera = [c.strip().lower() for c in next(lector, [])]
+            faltantes = [c for c in self.COLUMNAS[tipo] if c not in cabecera]
+            if faltantes:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+            for valores in lector:
+                if not any(v.strip() for v in valores):
+                    continue  # Linea en blanco
+                yield lector.line_num, {c: v.strip() for c, v in zip(cabecera, valores)}
+
+    def _guardar(self, validas, lineas, errores, guardar):
+        """Escribe `validas` con `guardar`; si falla, todas pasan a la lista de errores."""
+        if not validas:
+            return 0
+        exito, mensaje, _ = guardar(validas)
+        if not exito:
+            errores.extend((linea, mensaje) for linea in lineas)
+            errores.sort()
+            return 0
+        return len(validas)
+
+    # --- POR TIPO ---
+    def _importar_estudiantes(self, filas):
+        correos = {e['correo'].lower() for e in self.db.obtener_estudiantes()}
+        validas, lineas, errores = [], [], []
+        for linea, fila in filas:
+            try:
+                nombre, apellido, correo = validar_estudiante(fila['nombre'], fila['apellido'], fila['correo'])
+                if not fila['carrera']:
+                    raise ValueError("Complete los campos obligatorios")
+                nacimiento = validar_nacimiento(fila['nacimiento'])
+                if correo.lower() in correos:
+                    raise ValueError(f"Ya existe un estudiante con el correo {correo}")
+            except ValueError as e:
+                errores.append((linea, str(e)))
+                continue
+            correos.add(correo.lower())
+            validas.append({"nombre": nombre, "apellido": apellido, "carrera": fila['carrera'],
+                            "nacimiento": nacimiento, "correo": correo,
+                            "activo": fila.get('activo', '').lower() not in self.VALORES_INACTIVO})
+            lineas.append(linea)
+        return self._guardar(validas, lineas, errores, self.db.registrar_estudiantes_lote), errores
+
+    def _importar_cursos(self, filas):
+        codigos = set(self.db.nombres_cursos())
+        validas, lineas, errores = [], [], []
+        for linea, fila in filas:
+            try:
+                codigo, nombre, profesor, creditos = validar_curso(fila['codigo'], fila['nombre'],
+                                                                   fila['profesor'], fila['creditos'])
+                if codigo in codigos:
+                    raise ValueError(f"El código de curso {codigo} ya existe.")
+            except ValueError as e:
+                errores.append((linea, str(e)))
+                continue
+            codigos.add(codigo)
+            validas.append({"codigo": codigo, "nombre": nombre, "profesor": profesor, "creditos": creditos})
+            lineas.append(linea)
+        return self._guardar(validas, lineas, errores, self.db.registrar_cursos_lote), errores
+
+    def _importar_matriculas(self, filas):
+        estudiantes = self.db.nombres_estudiantes()
+        cursos = self.db.nombres_cursos()
+        hoy = date.today().isoformat()
+        vistas = set()
+        validas, lineas, errores = [], [], []
+        for linea, fila in filas:
+            id_est, cod_curso = fila['id_estudiante'], fila['codigo_curso'].upper()
+            try:
+                self._validar_referencias(id_est, cod_curso, estudiantes, cursos)
+                periodo, estado = validar_matricula(fila['periodo'], fila.get('estado') or "Matriculado")
+                if self.db.periodo_cerrado(periodo):
+                    raise ValueError(f"El periodo {periodo} está cerrado.")
+                fecha = fila.get('fecha') or hoy
+                try:
+                    fecha = date.fromisoformat(fecha).isoformat()
+                except ValueError:
+                    raise ValueError("La fecha debe tener el formato AAAA-MM-DD")
+                if (id_est, cod_curso) in vistas or self.db.existe_matricula(id_est, cod_curso):
+                    raise ValueError("El estudiante ya está matriculado en este curso.")
+            except ValueError as e:
+                errores.append((linea, str(e)))
+                continue
+            vistas.add((id_est, cod_curso))
+            validas.append({"id_est": id_est, "cod_curso": cod_curso, "fecha": fecha,
+                            "periodo": periodo, "estado": estado})
+            lineas.append(linea)
+        return self._guardar(validas, lineas, errores, self.db.registrar_matriculas_lote), errores
+
+    def _importar_notas(self, filas):
+        estudiantes = self.db.nombres_estudiantes()
+        cursos = self.db.nombres_cursos()
+        vistas = {}
+        validas, lineas, errores = [], [], []
+        for linea, fila in filas:
+            id_est, cod_curso = fila['id_estudiante'], fila['codigo_curso'].upper()
+            try:
+                self._validar_referencias(id_est, cod_curso, estudiantes, cursos)
+                if not self.db.existe_matricula(id_est, cod_curso):
+                    raise ValueError("El estudiante no está matriculado en el curso")
+                n1, n2, n3 = validar_notas(fila['n1'], fila['n2'], fila['n3'])
+                if (id_est, cod_curso) in vistas:
+                    raise ValueError(f"Notas repetidas (ya están en la línea {vistas[(id_est, cod_curso)]})")
+            except ValueError as e:
+                errores.append((linea, str(e)))
+                continue
+            vistas[(id_est, cod_curso)] = linea
+            validas.append((id_est, cod_curso, n1, n2, n3))
+            lineas.append(linea)
+        return self._guardar(validas, lineas, errores, self.db.registrar_notas_lote), errores
+
+    @staticmethod
+    def _validar_referencias(id_est, cod_curso, estudiantes, cursos):
+        if id_est not in estudiantes:
+            raise ValueError(f"No existe el estudiante {id_est}")
+        if cod_curso not in cursos:
+            raise ValueError(f"No existe el curso {cod_curso}")
+
+    # --- REPORTE ---
+    @staticmethod
+    def escribir_reporte_errores(ruta, errores):
+        """CSV con una fila (linea, error) por cada fila rechazada."""
+        with open(ruta, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["linea", "error"])
+            writer.writerows(errores)
+
+
+if __name__ == "__main__":
+    # python -m controllers.importacion_controller <tipo> <archivo.csv> [errores.csv]
+    from data.data_manager import DataManager
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ImportacionController.TIPOS:
+        print(f"Uso: python -m controllers.importacion_controller "
+              f"{{{'|'.join(ImportacionController.TIPOS)}}} archivo.csv [errores.csv]")
+        sys.exit(2)
+    importador = ImportacionController(DataManager("notas_db.txt"))
+    importadas, errores = importador.importar(sys.argv[1], sys.argv[2])
+    print(f"{importadas} filas importadas, {len(errores)} con errores")
+    if len(sys.argv) > 3:
+        importador.escribir_reporte_errores(sys.argv[3], errores)
+    else:
+        for linea, mensaje in errores:
+            print(f"  línea {linea}: {mensaje}")
@@ -0,0 +1,99 @@
+from collections import Counter
+
+from model.validaciones import validar_notas
+
+ESTADOS_ASISTENCIA = ("Presente", "Tardanza", "Ausente")
+
+
+class MantenimientoController:
+    """
+    Tareas de mantenimiento sin interfaz (ver cli.py): recalculo de
+    promedios y verificacion de integridad entre las tablas.
+    """
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def recalcular_promedios(self, aplicar=True):
+        """
+        Vuelve a calcular el promedio de cada nota a partir de n1, n2 y n3.
+        Retorna la lista de (id_est, cod_curso, promedio_guardado, promedio_correcto)
+        que no coincidian; si `aplicar`, los corrige con una sola escritura.
+        Las notas de periodos archivados son de solo lectura y no se revisan.
+        """
+        diferencias = []
+        correcciones = []
+        for n in self.db.iterar_todas_las_notas(archivadas=False):
+            try:
+                n1, n2, n3 = validar_notas(n['n1'], n['n2'], n['n3'])
+                guardado = float(n['promedio'])
+            except ValueError:
+                continue  # Lo reporta verificar_integridad
+            correcto = round((n1 + n2 + n3) / 3, 2)
+            if abs(guardado - correcto) > 0.005:
+                diferencias.append((n['id'], n['cod_curso'], guardado, correcto))
+                correcciones.append((n['id'], n['cod_curso'], n1, n2, n3))
+
+        if aplicar and correcciones:
+            exito, mensaje, _ = self.db.registrar_notas_lote(correcciones)
+            if not exito:
+                raise IOError(mensaje)
+        return diferencias
+
+    def verificar_integridad(self):
+        """
+        Retorna una lista de (tabla, clave, problema) con:
+        claves repetidas, referencias a estudiantes o cursos inexistentes,
+        notas fuera de rango o sin matricula, promedios que no coinciden y
+        estados de asistencia invalidos.
+        """
+        problemas = []
+        estudiantes = self.db.nombres_estudiantes()
+        cursos = self.db.nombres_cursos()
+
+        for id_est, veces in Counter(e['id'] for e in self.db.obtener_estudiantes()).items():
+            if veces > 1:
+                problemas.append(("estudiantes", id_est, f"ID repetido {veces} veces"))
+        for codigo, veces in Counter(c['codigo'] for c in self.db.obtener_cursos()).items():
+            if veces > 1:
+                problemas.append(("cursos", codigo, f"Código repetido {veces} veces"))
+
+        pares = Counter()
+        for m in self.db.obtener_matriculas():
+            par = (m['id_est'], m['cod_curso'])
+            pares[par] += 1
+            if pares[par] == 1:
+                problemas.extend(("matriculas", f"{par[0]}/{par[1]}", p)
+                                 for p in self._referencias(par[0], par[1], estudiantes, cursos))
+        problemas.extend(("matriculas", f"{i}/{c}", f"Matrícula repetida {veces} veces")
+                         for (i, c), veces in pares.items() if veces > 1)
+
+        for n in self.db.iterar_todas_las_notas():
+            clave = f"{n['id']}/{n['cod_curso']}"
+            problemas.extend(("notas", clave, p) for p in self._referencias(n['id'], n['cod_curso'], estudiantes, cursos))
+            if (n['id'], n['cod_curso']) not in pares:
+                problemas.append(("notas", clave, "Nota sin matrícula"))
+            try:
+                n1, n2, n3 = validar_notas(n['n1'], n['n2'], n['n3'])
+            except ValueError as e:
+                problemas.append(("notas", clave, str(e)))
+                continue
+            try:
+                promedio = float(n['promedio'])
+            except ValueError:
+                promedio = None
+            if promedio is None or abs(promedio - round((n1 + n2 + n3) / 3, 2)) > 0.005:
+                problemas.append(("notas", clave, f"Promedio {n['promedio']} no coincide con las notas"))
+
+        for a in self.db.obtener_asistencias_raw():
+            clave = f"{a['id']}/{a['curso']}/{a['fecha']}"
+            problemas.extend(("asistencias", clave, p) for p in self._referencias(a['id'], a['curso'], estudiantes, cursos))
+            if a['estado'] not in ESTADOS_ASISTENCIA:
+                problemas.append(("asistencias", clave, f"Estado inválido: {a['estado']}"))
+        return problemas
+
+    @staticmethod
+    def _referencias(id_est, cod_curso, estudiantes, cursos):
+        if id_est not in estudiantes:
+            yield f"Estudiante inexistente: {id_est}"
+        if cod_curso not in cursos:
+            yield f"Curso inexistente: {cod_curso}"
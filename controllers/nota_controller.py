@@ -1,4 +1,5 @@
 from model.nota import Nota
+from model.validaciones import validar_notas
 
 class NotaController:
     def __init__(self, db_manager):
@@ -13,9 +14,8 @@ class NotaController:
             # Crear objeto Nota (validación automática en setters)
             nota = Nota(id_estudiante, cod_curso, n1, n2, n3)
             
-            # Validar rango de notas (0-20)
-            if not (0 <= n1 <= 20 and 0 <= n2 <= 20 and 0 <= n3 <= 20):
-                raise ValueError("Las notas deben estar entre 0 y 20")
+            # Validar rango de notas (0-20), igual que la importacion masiva
+            n1, n2, n3 = validar_notas(n1, n2, n3)
             
             # Persistir usando DataManager
             return self.db.registrar_nota(id_estudiante, cod_curso, n1, n2, n3)
@@ -0,0 +1,158 @@
+from itertools import islice
+
+
+def escribir_csv(f, titulos, filas):
+    """Escribe titulos y filas en el archivo abierto `f`. Retorna la cantidad de filas."""
+    import csv  # csv y json se importan al exportar, no al abrir la ventana de reportes
+    writer = csv.writer(f)
+    writer.writerow(titulos)
+    cantidad = 0
+    for fila in filas:
+        writer.writerow(fila)
+        cantidad += 1
+    return cantidad
+
+
+def escribir_json(f, titulos, filas, lineas=False):
+    """
+    Escribe las filas como objetos {titulo: valor}: una por linea (JSON Lines)
+    si `lineas`, o como un arreglo escrito de a un objeto a la vez.
+    Retorna la cantidad de filas.
+    """
+    import json
+    cantidad = 0
+    if not lineas:
+        f.write("[")
+    for fila in filas:
+        objeto = json.dumps(dict(zip(titulos, fila)), ensure_ascii=False)
+        if lineas:
+            f.write(objeto + "\n")
+        else:
+            f.write(("\n    " if cantidad == 0 else ",\n    ") + objeto)
+        cantidad += 1
+    if not lineas:
+        f.write("\n]\n")
+    return cantidad
+
+
+class ReporteController:
+    """
+    Motor de reportes. Cada tipo de reporte es un generador de filas que lee
+    directamente de DataManager: la vista previa toma solo la primera pagina
+    y las exportaciones recorren el generador escribiendo a disco, sin
+    armar el reporte completo en memoria.
+    """
+    TAMANO_PAGINA = 500
+
+    TITULOS = {
+        "Historial Académico": ["Curso", "N1", "N2", "N3", "Promedio", "Estado"],
+        "Lista de Asistencia": ["ID", "Nombre", "Fecha", "Estado"],
+        "Padrón de Matrícula": ["ID", "Nombre", "Apellido", "Carrera", "Correo"],
+        "Rendimiento / Riesgo": ["ID", "Nombre", "Curso", "Promedio", "Estado"],
+        "Estadísticas por Curso": ["Código", "Curso", "Notas", "Media", "Mediana", "Desv. Est.",
+                                   "P25", "P75", "P90", "Aprobación %"],
+        "Estadísticas por Carrera": ["Carrera", "Notas", "Media", "Mediana", "Desv. Est.",
+                                     "P25", "P75", "P90", "Aprobación %"],
+        "Distribución de Promedios": ["Rango", "Cantidad", "Porcentaje"],
+    }
+    # Reportes globales calculados con DataManager.analitica_notas (sin filtros)
+    ESTADISTICAS = ("Estadísticas por Curso", "Estadísticas por Carrera", "Distribución de Promedios")
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self._generadores = {
+            "Historial Académico": self._historial_academico,
+            "Lista de Asistencia": self._lista_asistencia,
+            "Padrón de Matrícula": self._padron_matricula,
+            "Rendimiento / Riesgo": self._rendimiento_riesgo,
+            "Estadísticas por Curso": self._estadisticas_curso,
+            "Estadísticas por Carrera": self._estadisticas_carrera,
+            "Distribución de Promedios": self._distribucion_promedios,
+        }
+
+    def titulos(self, tipo):
+        return list(self.TITULOS.get(tipo, []))
+
+    def filas(self, tipo, id_est=None, cod_curso=None, desde=None, hasta=None):
+        """
+        Generador de las filas (listas de str) del reporte `tipo`. `desde` y
+        `hasta` (AAAA-MM-DD) acotan la Lista de Asistencia.
+        """
+        generador = self._generadores.get(tipo)
+        if generador is None:
+            return iter(())
+        return generador(id_est=id_est, cod_curso=cod_curso, desde=desde, hasta=hasta)
+
+    def primera_pagina(self, tipo, id_est=None, cod_curso=None, tamano=None):
+        """Retorna (titulos, filas, hay_mas) con solo las primeras `tamano` filas."""
+        tamano = tamano or self.TAMANO_PAGINA
+        filas = list(islice(self.filas(tipo, id_est, cod_curso), tamano + 1))
+        return self.titulos(tipo), filas[:tamano], len(filas) > tamano
+
+    # --- EXPORTACION (streaming) ---
+    def exportar_csv(self, ruta, tipo, id_est=None, cod_curso=None):
+        """Escribe el reporte completo en CSV fila por fila. Retorna la cantidad de filas."""
+        with open(ruta, 'w', newline='', encoding='utf-8') as f:
+            return escribir_csv(f, self.titulos(tipo), self.filas(tipo, id_est, cod_curso))
+
+    def exportar_json(self, ruta, tipo, id_est=None, cod_curso=None):
+        """
+        Escribe el reporte completo como JSON Lines (un objeto por linea) si
+        `ruta` termina en .jsonl, o como un arreglo JSON escrito de a un
+        objeto a la vez. Retorna la cantidad de filas.
+        """
+        with open(ruta, 'w', encoding='utf-8') as f:
+            return escribir_json(f, self.titulos(tipo), self.filas(tipo, id_est, cod_curso),
+                                 lineas=ruta.lower().endswith(".jsonl"))
+
+    @staticmethod
+    def fila_historial(n):
+        """Fila del Historial Académico para una nota de iterar_todas_las_notas."""
+        valid_prom = float(n['promedio']) if n['promedio'] else 0.0
+        estado = "Aprobado" if valid_prom >= 13 else "Desaprobado"
+        return [n['curso'], str(n['n1']), str(n['n2']), str(n['n3']), str(n['promedio']), estado]
+
+    # --- GENERADORES POR TIPO ---
+    def _historial_academico(self, id_est=None, **_):
+        # Notas de este estudiante en todos los cursos
+        for n in self.db.iterar_todas_las_notas():
+            if n['id'] == id_est:
+                yield self.fila_historial(n)
+
+    def _lista_asistencia(self, cod_curso=None, desde=None, hasta=None, **_):
+        estudiantes = self.db.nombres_estudiantes()
+        for a in self.db.iterar_historial_asistencia(cod_curso, desde, hasta):
+            nombre = estudiantes.get(a['id_est'], "Desconocido")
+            yield [a['id_est'], nombre, a['fecha'], a['estado']]
+
+    def _padron_matricula(self, cod_curso=None, **_):
+        for m in self.db.obtener_matriculados(cod_curso):
+            yield [m['id'], m['nombre'], m['apellido'], m['carrera'], m['correo']]
+
+    def _rendimiento_riesgo(self, **_):
+        for n in self.db.iterar_todas_las_notas():
+            prom = float(n['promedio'])
+            estado = "Riesgo" if prom < 13 else "OK"
+            yield [n['id'], n['nombre'], n['curso'], str(prom), estado]
+
+    @staticmethod
+    def _columnas_estadisticas(g):
+        p = g['percentiles']
+        return [str(g['cantidad']), f"{g['media']:.2f}", f"{g['mediana']:.2f}", f"{g['desviacion']:.2f}",
+                f"{p[25]:.2f}", f"{p[75]:.2f}", f"{p[90]:.2f}", f"{g['tasa_aprobacion'] * 100:.1f}"]
+
+    def _estadisticas_curso(self, **_):
+        nombres = self.db.nombres_cursos()
+        for g in self.db.analitica_notas().por_curso():
+            yield [g['grupo'], nombres.get(g['grupo'], g['grupo'])] + self._columnas_estadisticas(g)
+
+    def _estadisticas_carrera(self, **_):
+        for g in self.db.analitica_notas().por_carrera():
+            yield [g['grupo']] + self._columnas_estadisticas(g)
+
+    def _distribucion_promedios(self, **_):
+        analitica = self.db.analitica_notas()
+        conteos = analitica.histograma()
+        total = max(len(analitica), 1)
+        for i, cantidad in enumerate(conteos):
+            yield [f"{i} a {i + 1}", str(int(cantidad)), f"{cantidad * 100 / total:.1f}%"]
@@ -1 +1,2 @@
 from .data_manager import DataManager
+from .sqlite_manager import SQLiteDataManager
@@ -0,0 +1,176 @@
+"""
+Estadisticas de notas vectorizadas con NumPy.
+
+Las notas se cargan una sola vez en arreglos (n1, n2, n3, promedio) y el
+curso y la carrera de cada fila se guardan como enteros categoricos
+(indices en `cursos` / `carreras`). Las agrupaciones se resuelven sin
+bucles de Python por fila:
+    - conteos, sumas y aprobados con np.bincount
+    - mediana y percentiles ordenando una vez por (grupo, promedio) e
+      interpolando dentro del tramo de cada grupo
+"""
+import numpy as np
+
+NOTA_APROBATORIA = 13
+PERCENTILES = (25, 75, 90)
+# Histograma de promedios: tramos de un punto, 0-1 ... 19-20 (el 20 entra en el ultimo)
+BORDES_HISTOGRAMA = np.arange(0, 21)
+
+
+def _a_float(valores):
+    """Arreglo float64; los valores vacios o invalidos quedan como NaN."""
+    try:
+        return np.array(valores, dtype=np.float64)
+    except ValueError:
+        def convertir(v):
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return np.nan
+        return np.fromiter((convertir(v) for v in valores), dtype=np.float64, count=len(valores))
+
+
+def _categorias(valores):
+    """Retorna (codigos int32, etiquetas) asignando un entero a cada valor distinto."""
+    indice = {}
+    codigos = np.fromiter((indice.setdefault(v, len(indice)) for v in valores),
+                          dtype=np.int32, count=len(valores))
+    return codigos, list(indice)
+
+
+class AnaliticaNotas:
+    """
+    Notas en arreglos NumPy con estadisticas globales y por grupo.
+    Se construye con `desde_filas` y no se modifica: ante cambios en las
+    notas DataManager arma una nueva (ver DataManager.analitica_notas).
+    """
+    def __init__(self, n1, n2, n3, promedio, curso, carrera, cursos, carreras):
+        # Las filas sin promedio valido no cuentan en ninguna estadistica
+        validas = ~np.isnan(promedio)
+        self.n1 = n1[validas]
+        self.n2 = n2[validas]
+        self.n3 = n3[validas]
+        self.promedio = promedio[validas]
+        self.curso = curso[validas]
+        self.carrera = carrera[validas]
+        self.cursos = cursos      # Etiquetas: codigo de curso por indice categorico
+        self.carreras = carreras  # Etiquetas: carrera por indice categorico
+
+    @classmethod
+    def desde_filas(cls, filas, carrera_de):
+        """
+        `filas`: lista de notas crudas {id, cod_curso, n1, n2, n3, promedio}
+        (texto o numero). `carrera_de`: {id_est: carrera}.
+        """
+        curso, cursos = _categorias([f['cod_curso'] for f in filas])
+        carrera, carreras = _categorias([carrera_de.get(f['id']) or "Sin carrera" for f in filas])
+        return cls(
+            _a_float([f['n1'] for f in filas]),
+            _a_float([f['n2'] for f in filas]),
+            _a_float([f['n3'] for f in filas]),
+            _a_float([f['promedio'] for f in filas]),
+            curso, carrera, cursos, carreras
+        )
+
+    def __len__(self):
+        return len(self.promedio)
+
+    # --- GLOBAL ---
+    def resumen(self):
+        """Estadisticas de todos los promedios: cantidad, media, mediana, desviacion, percentiles, aprobacion."""
+        p = self.promedio
+        if len(p) == 0:
+            return {"cantidad": 0, "media": 0.0, "mediana": 0.0, "desviacion": 0.0,
+                    "percentiles": {q: 0.0 for q in PERCENTILES}, "aprobados": 0, "riesgo": 0,
+                    "tasa_aprobacion": 0.0}
+        aprobados = int(np.count_nonzero(p >= NOTA_APROBATORIA))
+        return {
+            "cantidad": len(p),
+            "media": float(p.mean()),
+            "mediana": float(np.median(p)),
+            "desviacion": float(p.std()),
+            "percentiles": dict(zip(PERCENTILES, np.percentile(p, PERCENTILES).tolist())),
+            "aprobados": aprobados,
+            "riesgo": len(p) - aprobados,
+            "tasa_aprobacion": aprobados / len(p),
+        }
+
+    def histograma(self):
+        """Cantidad de promedios en cada tramo de BORDES_HISTOGRAMA."""
+        return np.histogram(self.promedio, bins=BORDES_HISTOGRAMA)[0]
+
+    # --- POR GRUPO ---
+    def por_curso(self):
+        return self._agrupar(self.curso, self.cursos)
+
+    def por_carrera(self):
+        return self._agrupar(self.carrera, self.carreras)
+
+    def histograma_por_curso(self):
+        """{codigo: conteos por tramo} con un solo bincount sobre (curso, tramo)."""
+        return self._histograma_grupos(self.curso, self.cursos)
+
+    def histograma_por_carrera(self):
+        return self._histograma_grupos(self.carrera, self.carreras)
+
+    def _histograma_grupos(self, codigos, etiquetas):
+        tramos = len(BORDES_HISTOGRAMA) - 1
+        tramo = np.clip(np.floor(self.promedio).astype(np.int64), 0, tramos - 1)
+        conteos = np.bincount(codigos.astype(np.int64) * tramos + tramo,
+                              minlength=len(etiquetas) * tramos).reshape(len(etiquetas), tramos)
+        return {etiqueta: conteos[i] for i, etiqueta in enumerate(etiquetas)}
+
+    def _agrupar(self, codigos, etiquetas):
+        """
+        Lista de {grupo, cantidad, media, mediana, desviacion, percentiles,
+        aprobados, tasa_aprobacion} por grupo con notas, en orden de aparicion.
+        """
+        k = len(etiquetas)
+        p = self.promedio
+        cantidad = np.bincount(codigos, minlength=k)
+        suma = np.bincount(codigos, weights=p, minlength=k)
+        suma_cuadrados = np.bincount(codigos, weights=p * p, minlength=k)
+        aprobados = np.bincount(codigos, weights=p >= NOTA_APROBATORIA, minlength=k)
+
+        con_notas = cantidad > 0
+        n = np.where(con_notas, cantidad, 1)
+        media = suma / n
+        desviacion = np.sqrt(np.maximum(suma_cuadrados / n - media * media, 0.0))
+
+        # Ordenado por grupo y, dentro de cada grupo, por promedio: se ordena una
+        # sola clave float (grupo * ancho + promedio), mas rapido que lexsort
+        ordenado = np.zeros(0)
+        if len(p):
+            minimo = p.min()
+            ancho = p.max() - minimo + 1
+            ordenado = np.sort(codigos * ancho + (p - minimo)) - np.repeat(np.arange(k) * ancho, cantidad) + minimo
+        inicios = np.cumsum(cantidad) - cantidad
+        cuantiles = {q: self._percentil_grupos(ordenado, inicios, cantidad, q) for q in (50,) + PERCENTILES}
+
+        resultado = []
+        for i in np.flatnonzero(con_notas):
+            resultado.append({
+                "grupo": etiquetas[i],
+                "cantidad": int(cantidad[i]),
+                "media": float(media[i]),
+                "mediana": float(cuantiles[50][i]),
+                "desviacion": float(desviacion[i]),
+                "percentiles": {q: float(cuantiles[q][i]) for q in PERCENTILES},
+                "aprobados": int(aprobados[i]),
+                "tasa_aprobacion": float(aprobados[i] / cantidad[i]),
+            })
+        return resultado
+
+    @staticmethod
+    def _percentil_grupos(ordenado, inicios, cantidad, q):
+        """Percentil q de cada grupo (interpolacion lineal, como np.percentile)."""
+        if len(ordenado) == 0:
+            return np.zeros(len(cantidad))
+        posicion = (q / 100.0) * np.maximum(cantidad - 1, 0)
+        bajo = np.floor(posicion).astype(np.int64)
+        alto = np.minimum(bajo + 1, np.maximum(cantidad - 1, 0))
+        fraccion = posicion - bajo
+        # Los grupos vacios apuntan al indice 0; se descartan al armar el resultado
+        i_bajo = np.minimum(inicios + bajo, len(ordenado) - 1)
+        i_alto = np.minimum(inicios + alto, len(ordenado) - 1)
+        return ordenado[i_bajo] + (ordenado[i_alto] - ordenado[i_bajo]) * fraccion
@@ -0,0 +1,51 @@
+"""
+Archivos comprimidos de los periodos archivados.
+
+Archivar un periodo cerrado (`DataManager.archivar_periodo`, o
+`python cli.py archivar-periodo 2024-2`) comprime en archivos .gz de solo
+lectura sus matriculas y las asistencias y notas de esas matriculas. Los
+periodos no tienen fechas: las asistencias y notas son las de los pares
+(estudiante, curso) del periodo que no estan matriculados en otro periodo
+sin archivar.
+
+    matriculas/2024-2.cerrado.txt.gz    sus matriculas (el archivo cerrado, comprimido)
+    asistencias/CUR-001/2024-2.txt.gz   las asistencias de esos pares en el curso, una
+                                        linea por registro, que salen de los segmentos;
+                                        asistencias/archivados.txt anota cada archivo
+                                        y sus meses
+    notas_archivadas/2024-2.txt.gz      sus notas, que salen de notas_db.txt, ordenadas
+                                        por curso e ID; notas_archivadas/manifiesto.txt
+                                        anota los cursos de cada archivo
+
+`abrir` (data/contabilidad_io.py) descomprime al vuelo: las consultas leen
+las asistencias y notas archivadas linea por linea, sin guardarlas en la
+cache (las matriculas, pequeñas, se cachean como las de un periodo
+cerrado), y solo si tocan el periodo (por curso, fechas o periodo). Las
+escrituras de asistencias y notas de esos pares se rechazan.
+"""
+import os
+import stat
+
+from .contabilidad_io import abrir
+
+CABECERA_NOTAS = "ID_ESTUDIANTE|CODIGO_CURSO|NOTA1|NOTA2|NOTA3|PROMEDIO\n"
+CABECERA_MANIFIESTO_NOTAS = "CODIGO_CURSO|PERIODO|ARCHIVO\n"
+SOLO_LECTURA = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def escribir_comprimido(ruta, lineas, cabecera=""):
+    """
+    Escribe `cabecera` y `lineas` en el archivo .gz `ruta` (via un temporal,
+    de forma atomica) y lo deja de solo lectura. Retorna la cantidad de lineas.
+    """
+    temporal = ruta + ".tmp"
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    cantidad = 0
+    with abrir(temporal, 'w', encoding='utf-8') as f:
+        f.write(cabecera)
+        for linea in lineas:
+            f.write(linea)
+            cantidad += 1
+    os.chmod(temporal, SOLO_LECTURA)
+    os.replace(temporal, ruta)
+    return cantidad
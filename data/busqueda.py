@@ -0,0 +1,128 @@
+"""
+Indice de busqueda en memoria (estudiantes y cursos).
+
+Cada fila se divide en palabras normalizadas (minusculas, sin tildes,
+separando por cualquier caracter no alfanumerico). El indice guarda:
+    - el vocabulario ordenado de palabras, para buscar por prefijo con bisect
+    - {palabra: {claves}} con las filas que contienen cada palabra
+Una consulta con varias palabras exige que todas coincidan (por prefijo)
+con alguna palabra de la fila: "perez an" encuentra a "Ana Pérez".
+"""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+# Por encima de esta cantidad de palabras nuevas se reordena el vocabulario
+# completo en lugar de insertar una por una
+_LIMITE_INSERCION = 64
+
+
+def normalizar(texto):
+    """Minusculas y sin tildes: 'Pérez Ñique' -> 'perez nique'."""
+    texto = str(texto).lower()
+    if texto.isascii():
+        return texto
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def _tokenizar(texto):
+    # Nombres, apellidos y carreras se repiten mucho: se cachea por valor
+    return tuple(t for t in _NO_ALFANUMERICO.split(normalizar(texto)) if t)
+
+
+def tokenizar(texto):
+    return list(_tokenizar(str(texto)))
+
+
+def _palabras_fila(fila, campos):
+    palabras = set()
+    for campo in campos:
+        palabras.update(_tokenizar(str(fila.get(campo, ""))))
+    return palabras
+
+
+class IndiceBusqueda:
+    """Indice de palabras por prefijo sobre los `campos` de cada fila, identificada por `clave`."""
+    def __init__(self, campos, clave):
+        self.campos = campos
+        self.clave = clave
+        self._palabras = {}      # {clave: " palabra1 palabra2 ..."}
+        self._filas_por = {}     # {palabra: {claves}}
+        self._vocabulario = []   # Palabras ordenadas
+
+    def __len__(self):
+        return len(self._palabras)
+
+    def agregar(self, filas):
+        nuevas = []
+        for fila in filas:
+            clave = fila[self.clave]
+            if clave in self._palabras:
+                self.quitar(clave)
+            palabras = _palabras_fila(fila, self.campos)
+            # Con un espacio delante de cada palabra, "tiene una palabra que
+            # empieza con t" es simplemente (" " + t) in texto
+            self._palabras[clave] = " " + " ".join(palabras)
+            for p in palabras:
+                claves = self._filas_por.get(p)
+                if claves is None:
+                    self._filas_por[p] = {clave}
+                    nuevas.append(p)
+                else:
+                    claves.add(clave)
+
+        if len(nuevas) > _LIMITE_INSERCION:
+            self._vocabulario = sorted(self._filas_por)
+        else:
+            for p in set(nuevas):
+                if p in self._filas_por and not self._en_vocabulario(p):
+                    insort(self._vocabulario, p)
+
+    def _en_vocabulario(self, palabra):
+        i = bisect_left(self._vocabulario, palabra)
+        return i < len(self._vocabulario) and self._vocabulario[i] == palabra
+
+    def quitar(self, clave):
+        for p in self._palabras.pop(clave, "").split():
+            claves = self._filas_por[p]
+            claves.discard(clave)
+            if not claves:
+                del self._filas_por[p]
+                # Puede no estar aun si se agrego en este mismo lote
+                if self._en_vocabulario(p):
+                    del self._vocabulario[bisect_left(self._vocabulario, p)]
+
+    def actualizar(self, fila):
+        self.agregar([fila])
+
+    def _con_prefijo(self, prefijo):
+        claves = set()
+        i = bisect_left(self._vocabulario, prefijo)
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(prefijo):
+            claves |= self._filas_por[self._vocabulario[i]]
+            i += 1
+        return claves
+
+    def buscar(self, consulta):
+        """
+        Retorna el conjunto de claves que coinciden con `consulta`,
+        o None si la consulta no tiene palabras (equivale a "todas").
+        """
+        terminos = sorted(set(tokenizar(consulta)), key=len, reverse=True)
+        if not terminos:
+            return None
+
+        # El termino mas largo suele ser el mas selectivo: se usa el indice
+        # para el y los demas se verifican sobre las palabras de cada candidata
+        candidatas = self._con_prefijo(terminos[0])
+        for t in terminos[1:]:
+            if not candidatas:
+                break
+            t = " " + t
+            candidatas = {c for c in candidatas if t in self._palabras[c]}
+        return candidatas
@@ -0,0 +1,276 @@
+"""
+Contabilidad de E/S de archivos por accion del usuario.
+
+Todas las aperturas de archivos de la capa de datos (DataManager,
+notas_fijas, SecuenciaIds) pasan por `abrir`. Dentro de un bloque
+
+    with contabilizar("abrir notas") as accion:
+        ...
+
+cada apertura suma en `accion`, por archivo: aperturas, lecturas y
+escrituras (aperturas en las que se leyo / escribio algo), bytes leidos y
+escritos y reescrituras completas (abrir con 'w' o truncar a 0). Los
+archivos se nombran con su ruta relativa (p. ej. matriculas/2025-1.txt) y
+los temporales "<archivo>.tmp" cuentan como <archivo>.
+
+Las rutas terminadas en .gz (archivos de periodos archivados, ver
+data/archivado.py) se comprimen y descomprimen al vuelo: quien las abre
+lee y escribe texto como en cualquier otro archivo, y la contabilidad
+cuenta los bytes comprimidos, que son los que tocan el disco.
+
+Fuera de un bloque `abrir` es `open` mas una comprobacion. Se cuenta la E/S
+de todos los hilos (las ventanas consultan en hilos de trabajo), asi que
+las acciones medidas no deben solaparse con otras.
+
+`presupuesto(...)` verifica limites al terminar el bloque y lanza
+PresupuestoExcedido; benchmarks/presupuestos.py define los de la carga de
+cada ventana y de cada escritura (`python -m benchmarks presupuestos`).
+"""
+import gzip
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+SUFIJO_COMPRIMIDO = ".gz"
+NIVEL_COMPRESION = 6  # El de zlib por defecto: casi la misma reduccion que 9, bastante mas rapido
+CAMPOS = ("aperturas", "lecturas", "escrituras", "bytes_leidos", "bytes_escritos", "reescrituras")
+
+_lock = threading.Lock()
+_acciones = []  # Acciones contabilizandose ahora
+
+
+class ConteoArchivo:
+    """E/S de un archivo dentro de una accion."""
+    __slots__ = CAMPOS
+
+    def __init__(self):
+        for campo in CAMPOS:
+            setattr(self, campo, 0)
+
+    def como_dict(self):
+        return {campo: getattr(self, campo) for campo in CAMPOS}
+
+
+class Accion:
+    """E/S contabilizada durante un bloque `contabilizar`: {archivo: ConteoArchivo}."""
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.archivos = {}
+
+    def conteo(self, archivo):
+        """ConteoArchivo de `archivo` (en cero si no se toco)."""
+        return self.archivos.get(archivo) or ConteoArchivo()
+
+    def total(self, campo):
+        return sum(getattr(c, campo) for c in self.archivos.values())
+
+    def como_dict(self):
+        return {
+            "archivos": {archivo: c.como_dict() for archivo, c in sorted(self.archivos.items())},
+            "totales": {campo: self.total(campo) for campo in CAMPOS},
+        }
+
+    def __repr__(self):
+        return f"Accion({self.nombre!r}, {self.como_dict()['totales']})"
+
+
+def _nombre(ruta):
+    ruta = os.fspath(ruta)
+    nombre = os.path.basename(ruta) if os.path.isabs(ruta) else os.path.normpath(ruta)
+    return nombre[:-4] if nombre.endswith(".tmp") else nombre
+
+
+def _sumar(archivo, campo, cantidad=1):
+    with _lock:
+        for accion in _acciones:
+            conteo = accion.archivos.get(archivo)
+            if conteo is None:
+                conteo = accion.archivos[archivo] = ConteoArchivo()
+            setattr(conteo, campo, getattr(conteo, campo) + cantidad)
+
+
+class _CrudoContado(io.RawIOBase):
+    """Archivo crudo (FileIO) que cuenta lo que efectivamente se lee y escribe en disco."""
+    def __init__(self, crudo, archivo):
+        super().__init__()
+        self._crudo = crudo
+        self._archivo = archivo
+        self._leyo = False
+        self._escribio = False
+
+    @property
+    def name(self):
+        return self._crudo.name
+
+    @property
+    def mode(self):
+        return self._crudo.mode
+
+    def readable(self):
+        return self._crudo.readable()
+
+    def writable(self):
+        return self._crudo.writable()
+
+    def seekable(self):
+        return self._crudo.seekable()
+
+    def fileno(self):
+        return self._crudo.fileno()
+
+    def seek(self, posicion, desde=io.SEEK_SET):
+        return self._crudo.seek(posicion, desde)
+
+    def tell(self):
+        return self._crudo.tell()
+
+    def readinto(self, destino):
+        if not self._leyo:
+            self._leyo = True
+            _sumar(self._archivo, "lecturas")
+        leidos = self._crudo.readinto(destino)
+        if leidos:
+            _sumar(self._archivo, "bytes_leidos", leidos)
+        return leidos
+
+    def write(self, datos):
+        if not self._escribio:
+            self._escribio = True
+            _sumar(self._archivo, "escrituras")
+        escritos = self._crudo.write(datos)
+        if escritos:
+            _sumar(self._archivo, "bytes_escritos", escritos)
+        return escritos
+
+    def truncate(self, tamano=None):
+        tamano = self._crudo.truncate(tamano)
+        if tamano == 0:
+            _sumar(self._archivo, "reescrituras")
+        return tamano
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._crudo.close()
+
+
+class _Comprimido(gzip.GzipFile):
+    """GzipFile que al cerrarse cierra tambien el archivo sobre el que trabaja."""
+    def close(self):
+        archivo = self.fileobj
+        try:
+            super().close()
+        finally:
+            if archivo is not None:
+                archivo.close()
+
+
+def es_comprimido(ruta):
+    """True si `ruta` (o su temporal "<ruta>.tmp") es un archivo .gz."""
+    ruta = os.fspath(ruta)
+    return (ruta[:-4] if ruta.endswith(".tmp") else ruta).endswith(SUFIJO_COMPRIMIDO)
+
+
+def abrir(ruta, modo='r', encoding=None):
+    """
+    `open` que, dentro de una accion contabilizada, cuenta la E/S del
+    archivo. Las rutas .gz se leen y escriben descomprimidas, en streaming.
+    """
+    if not es_comprimido(ruta):
+        return _abrir(ruta, modo, encoding)
+    binario = modo.replace('t', '').replace('b', '') + 'b'
+    comprimido = _Comprimido(fileobj=_abrir(ruta, binario), mode=binario, compresslevel=NIVEL_COMPRESION,
+                             mtime=0)  # Sin fecha: el mismo contenido da el mismo archivo (respaldos)
+    return comprimido if 'b' in modo else io.TextIOWrapper(comprimido, encoding=encoding)
+
+
+def _abrir(ruta, modo, encoding=None):
+    if not _acciones:
+        return open(ruta, modo, encoding=encoding)
+
+    archivo = _nombre(ruta)
+    crudo = _CrudoContado(io.FileIO(ruta, modo.replace('b', '').replace('t', '')), archivo)
+    _sumar(archivo, "aperturas")
+    if 'w' in modo:
+        _sumar(archivo, "reescrituras")
+    if '+' in modo:
+        buffer = io.BufferedRandom(crudo)
+    elif 'r' in modo:
+        buffer = io.BufferedReader(crudo)
+    else:
+        buffer = io.BufferedWriter(crudo)
+    if 'b' in modo:
+        return buffer
+    return io.TextIOWrapper(buffer, encoding=encoding)
+
+
+@contextmanager
+def contabilizar(nombre="accion"):
+    """Cuenta la E/S de la capa de datos mientras dura el bloque (ver Accion)."""
+    accion = Accion(nombre)
+    with _lock:
+        _acciones.append(accion)
+    try:
+        yield accion
+    finally:
+        with _lock:
+            _acciones.remove(accion)
+
+
+# --- PRESUPUESTOS ---
+class PresupuestoExcedido(AssertionError):
+    """Una accion hizo mas E/S de la permitida; `excesos` describe cada limite superado."""
+    def __init__(self, accion, excesos):
+        self.accion = accion
+        self.excesos = excesos
+        super().__init__(f"{accion.nombre}: " + "; ".join(excesos))
+
+
+def excesos(accion, solo_archivos=None, **limites):
+    """
+    Textos con cada limite superado por `accion` (lista vacia si cumple).
+
+    Cada limite es un campo de CAMPOS y vale para cada archivo por separado:
+    un entero (igual para todos) o {archivo: entero}, donde "*" es el valor
+    para los archivos no nombrados. `lecturas=1` es "cada archivo se lee a lo
+    sumo una vez". `solo_archivos` son los unicos archivos que se pueden abrir.
+    """
+    desconocidos = set(limites) - set(CAMPOS)
+    if desconocidos:
+        raise ValueError(f"Limites desconocidos: {', '.join(sorted(desconocidos))}")
+
+    encontrados = []
+    for archivo, conteo in sorted(accion.archivos.items()):
+        if solo_archivos is not None and archivo not in solo_archivos:
+            encontrados.append(f"{archivo} no deberia abrirse")
+            continue
+        for campo, limite in limites.items():
+            if isinstance(limite, dict):
+                limite = limite.get(archivo, limite.get("*"))
+            valor = getattr(conteo, campo)
+            if limite is not None and valor > limite:
+                encontrados.append(f"{archivo}: {campo} {valor} > {limite}")
+    return encontrados
+
+
+def verificar(accion, solo_archivos=None, **limites):
+    """Lanza PresupuestoExcedido si `accion` supera algun limite (ver `excesos`)."""
+    encontrados = excesos(accion, solo_archivos, **limites)
+    if encontrados:
+        raise PresupuestoExcedido(accion, encontrados)
+    return accion
+
+
+@contextmanager
+def presupuesto(nombre="accion", solo_archivos=None, **limites):
+    """
+    Contabiliza el bloque y al terminar verifica los limites, p. ej.
+
+        with presupuesto("abrir notas", lecturas=1, escrituras=0):
+            VentanaNotas._consultar_tabla(ventana, "MAT-101")
+    """
+    with contabilizar(nombre) as accion:
+        yield accion
+    verificar(accion, solo_archivos, **limites)
@@ -1,266 +1,846 @@
 import re
 import os
+import threading
+import time
+from functools import partial
+from itertools import chain
+
+from . import instrumentacion
+from .archivado import CABECERA_MANIFIESTO_NOTAS, CABECERA_NOTAS, escribir_comprimido
+from .contabilidad_io import SUFIJO_COMPRIMIDO, abrir, es_comprimido
+from .indices import IndiceAsistencias, IndiceCursos, IndiceEstudiantes, IndiceMatriculas, IndiceNotas, IndiceSegmentos
+from .particiones import (CABECERA_ABIERTA, PERIODO_POR_DEFECTO, escribir_cerrada, listar_particiones,
+                          nombre_particion, particionar_matriculas, ruta_particion)
+from .segmentos import (ARCHIVADOS, CABECERA_ARCHIVADOS, CABECERA_ASISTENCIAS, MANIFIESTO, archivo_archivado,
+                        archivo_segmento, crear_segmento, leer_manifiesto, linea_archivado, linea_manifiesto,
+                        mes_de_fecha, preparar_carpeta, segmentar_asistencias)
+from .notas_fijas import (CABECERA_BYTES, ANCHO_REGISTRO, es_cabecera_fija, formatear_nota, formatear_registro,
+                          convertir_a_ancho_fijo, quitar_registros)
+from .secuencia import SecuenciaIds
 
 class DataManager:
     """
     Clase encargada de la persistencia de datos.
     Cumple con el criterio de 'Manejo de Archivos' y uso de 'Regex'.
+
+    Mantiene una cache en memoria por tabla (archivo .txt). Cada tabla se
+    vuelve a parsear solo si cambia su firma (mtime/tamaño) en disco; los
+    metodos de escritura actualizan la cache directamente.
+
+    Las matriculas se guardan en un archivo por periodo (data/particiones.py):
+    las consultas con `periodo` leen solo ese archivo y los periodos cerrados
+    quedan archivados en solo lectura.
+
+    Las asistencias se guardan en segmentos por curso y mes (data/segmentos.py).
+    Cada segmento funciona como diario (journal) de solo-agregar: cada
+    registro se anexa como linea nueva y al leer gana la ultima linea de
+    cada (id, curso, fecha). La compactacion elimina las lineas superadas.
+
+    Un periodo cerrado se puede archivar (`archivar_periodo`): sus
+    matriculas, y las asistencias y notas de esas matriculas, pasan a
+    archivos .gz de solo lectura (data/archivado.py). Las asistencias y
+    notas archivadas se leen al vuelo, sin cache.
+
+    Las lecturas pueden hacerse desde hilos de trabajo (ver views/trabajadores.py)
+    tomando `bloqueo`; los metodos de escritura lo toman al modificar la cache.
     """
+    # Compactar un segmento cuando tenga al menos este numero de lineas...
+    UMBRAL_COMPACTACION = 1000
+    # ...y las lineas superen en este factor a los registros vigentes
+    FACTOR_COMPACTACION = 2
+
     def __init__(self, archivo_notas):
         self.archivo_notas = archivo_notas
         self.archivo_estudiantes = "estudiantes.txt"
         self.archivo_cursos = "cursos.txt"
-        self.archivo_matriculas = "matriculas.txt"
-        self.archivo_asistencias = "asistencias.txt"
+        self.archivo_matriculas = "matriculas.txt"  # Formato anterior: se migra a carpeta_matriculas
+        self.carpeta_matriculas = "matriculas"
+        self.archivo_asistencias = "asistencias.txt"  # Formato anterior: se migra a carpeta_asistencias
+        self.carpeta_asistencias = "asistencias"
+        self.manifiesto_asistencias = os.path.join(self.carpeta_asistencias, MANIFIESTO)
+        self.archivados_asistencias = os.path.join(self.carpeta_asistencias, ARCHIVADOS)
+        self.carpeta_notas_archivadas = "notas_archivadas"
+        self.manifiesto_notas_archivadas = os.path.join(self.carpeta_notas_archivadas, MANIFIESTO)
+        self.archivo_secuencia_estudiantes = "estudiantes.seq"
+        # Cache de tablas: {archivo: (firma, filas)}
+        self._cache = {}
+        # Particiones de matriculas: (firma de la carpeta, {periodo: (ruta, cerrado)})
+        self._particiones = None
+        # Estadisticas de notas: (firmas de notas y estudiantes, AnaliticaNotas)
+        self._analitica = None
+        self.bloqueo = threading.RLock()
+        # Diario de asistencias
+        self._lock_asistencias = threading.Lock()
+        self._lock_notas = threading.Lock()
+        self._hilo_compactacion = None
+        # Secuencia de IDs de estudiantes
+        self._secuencia_estudiantes = SecuenciaIds(self.archivo_secuencia_estudiantes, self._max_id_en_archivo)
         self._inicializar_archivo_notas()
         self._inicializar_archivo_estudiantes()
         self._inicializar_archivo_cursos()
         self._inicializar_archivo_matriculas()
         self._inicializar_archivo_asistencias()
+        # Sin REGISTRO_INSTRUMENTACION no hace nada (ver data/instrumentacion.py)
+        instrumentacion.instrumentar(self)
 
     def _inicializar_archivo_notas(self):
+        # Las notas usan registros de ancho fijo (ver data/notas_fijas.py)
         if not os.path.exists(self.archivo_notas):
-            with open(self.archivo_notas, 'w', encoding='utf-8') as f:
-                f.write("ID_ESTUDIANTE|CODIGO_CURSO|NOTA1|NOTA2|NOTA3|PROMEDIO\n")
+            with abrir(self.archivo_notas, 'wb') as f:
+                f.write(CABECERA_BYTES)
 
     def _inicializar_archivo_matriculas(self):
-        if not os.path.exists(self.archivo_matriculas):
-            with open(self.archivo_matriculas, 'w', encoding='utf-8') as f:
-                f.write("ID_ESTUDIANTE|CODIGO_CURSO|FECHA\n")
+        if os.path.isdir(self.carpeta_matriculas):
+            return
+        if os.path.exists(self.archivo_matriculas):
+            # Formato anterior (un solo archivo): se migra una vez y se conserva como .migrado
+            particionar_matriculas(self.archivo_matriculas, self.carpeta_matriculas)
+            os.replace(self.archivo_matriculas, self.archivo_matriculas + ".migrado")
+        else:
+            os.makedirs(self.carpeta_matriculas, exist_ok=True)
 
     def _inicializar_archivo_cursos(self):
         if not os.path.exists(self.archivo_cursos):
-            with open(self.archivo_cursos, 'w', encoding='utf-8') as f:
+            with abrir(self.archivo_cursos, 'w', encoding='utf-8') as f:
                 f.write("CODIGO|NOMBRE|PROFESOR|CREDITOS\n")
 
+    # --- CACHE DE TABLAS ---
+    def _firma_archivo(self, archivo):
+        """Retorna (mtime_ns, tamaño) del archivo o None si no existe."""
+        try:
+            st = os.stat(archivo)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _leer_tabla(self, archivo, parser):
+        """
+        Retorna las filas parseadas de `archivo`.
+        Solo vuelve a llamar a `parser` si la firma del archivo cambio.
+        La lista retornada es la de la cache: no modificarla desde fuera.
+        """
+        firma = self._firma_archivo(archivo)
+        entrada = self._cache.get(archivo)
+        if entrada is not None and entrada[0] == firma:
+            return entrada[1]
+
+        inicio = time.perf_counter()
+        filas = parser()
+        instrumentacion.registrar_parseo(archivo, time.perf_counter() - inicio, len(filas))
+        self._cache[archivo] = (firma, filas)
+        return filas
+
+    def _anexar_lineas(self, archivo, parser, lineas, filas_nuevas, aplicar=None):
+        """
+        Agrega lineas al final del archivo y las filas equivalentes a la cache.
+        `aplicar(filas, filas_nuevas)` integra las filas en la cache (por defecto
+        list.extend; las tablas indexadas pasan su metodo `agregar`). Si el archivo crecio mas de lo que escribimos (otro
+        proceso escribio), se descarta la cache para forzar una relectura.
+        """
+        with self.bloqueo:
+            filas = self._leer_tabla(archivo, parser)
+            firma_previa = self._cache[archivo][0]
+            texto = "".join(lineas)
+
+            with abrir(archivo, 'a', encoding='utf-8') as f:
+                f.write(texto)
+
+            firma = self._firma_archivo(archivo)
+            tamano_esperado = (firma_previa[1] if firma_previa else 0) + len(texto.encode('utf-8'))
+            if firma is not None and firma[1] == tamano_esperado:
+                if aplicar is None:
+                    filas.extend(filas_nuevas)
+                else:
+                    aplicar(filas, filas_nuevas)
+                self._cache[archivo] = (firma, filas)
+            else:
+                self._cache.pop(archivo, None)
+
+    def _reescribir_tabla(self, archivo, cabecera, lineas, filas):
+        """Reescribe el archivo completo y deja `filas` como contenido de la cache."""
+        with self.bloqueo:
+            with abrir(archivo, 'w', encoding='utf-8') as f:
+                f.write(cabecera)
+                f.writelines(lineas)
+            self._cache[archivo] = (self._firma_archivo(archivo), filas)
+            self._analitica = None  # Un cambio del mismo tamaño puede no mover la firma
+
+    def invalidar_cache(self, archivo=None):
+        """Descarta la cache de una tabla (o de todas si no se indica)."""
+        with self.bloqueo:
+            self._analitica = None
+            if archivo is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(archivo, None)
+
     # --- CURSOS ---
     # --- CURSOS ---
+    def _linea_curso(self, c):
+        return f"{c['codigo']}|{c['nombre']}|{c['profesor']}|{c['creditos']}\n"
+
     def registrar_curso(self, codigo, nombre, profesor, creditos):
+        curso = {"codigo": codigo, "nombre": nombre, "profesor": profesor, "creditos": str(creditos)}
         try:
-            with open(self.archivo_cursos, 'a', encoding='utf-8') as f:
-                linea = f"{codigo}|{nombre}|{profesor}|{creditos}\n"
-                f.write(linea)
+            self._anexar_lineas(self.archivo_cursos, self._parsear_cursos,
+                                [self._linea_curso(curso)], [curso], aplicar=IndiceCursos.agregar)
             return True
         except IOError:
             return False
 
-    def obtener_cursos(self):
+    def registrar_cursos_lote(self, cursos):
+        """
+        Registra varios cursos {codigo, nombre, profesor, creditos} (validados y
+        sin codigos repetidos) en una sola escritura. Retorna (exito, mensaje, cantidad).
+        """
+        filas = [{"codigo": c['codigo'], "nombre": c['nombre'], "profesor": c['profesor'],
+                  "creditos": str(c['creditos'])} for c in cursos]
+        if not filas:
+            return True, "Sin cambios", 0
+        try:
+            self._anexar_lineas(self.archivo_cursos, self._parsear_cursos,
+                                [self._linea_curso(c) for c in filas], filas, aplicar=IndiceCursos.agregar)
+        except IOError:
+            return False, "Error al guardar cursos", 0
+        return True, "Cursos registrados", len(filas)
+
+    def _parsear_cursos(self):
         data = []
         if not os.path.exists(self.archivo_cursos):
-            return data
-        with open(self.archivo_cursos, 'r', encoding='utf-8') as f:
+            return IndiceCursos()
+        with abrir(self.archivo_cursos, 'r', encoding='utf-8') as f:
             for i, linea in enumerate(f):
                 if i == 0: continue
                 partes = linea.strip().split('|')
-                
+
                 curso = {"codigo": "", "nombre": "", "profesor": "", "creditos": ""}
-                
+
                 if len(partes) >= 1: curso["codigo"] = partes[0]
                 if len(partes) >= 2: curso["nombre"] = partes[1]
                 if len(partes) >= 3: curso["profesor"] = partes[2]
                 if len(partes) >= 4: curso["creditos"] = partes[3]
-                
+
                 if curso["codigo"]:
                     data.append(curso)
-        return data
+        return IndiceCursos(data)
+
+    def obtener_cursos(self):
+        return [dict(c) for c in self._leer_tabla(self.archivo_cursos, self._parsear_cursos)]
 
     def actualizar_curso(self, codigo, nombre, profesor, creditos):
-        cursos = self.obtener_cursos()
-        encontrado = False
-        for c in cursos:
-            if c['codigo'] == codigo:
-                c['nombre'] = nombre
-                c['profesor'] = profesor
-                c['creditos'] = creditos
-                encontrado = True
-                break
-        
-        if not encontrado: return False
-        
-        try:
-            with open(self.archivo_cursos, 'w', encoding='utf-8') as f:
-                f.write("CODIGO|NOMBRE|PROFESOR|CREDITOS\n")
-                for c in cursos:
-                    linea = f"{c['codigo']}|{c['nombre']}|{c['profesor']}|{c['creditos']}\n"
-                    f.write(linea)
+        with self.bloqueo:
+            cursos = self._leer_tabla(self.archivo_cursos, self._parsear_cursos)
+            actual = cursos.obtener(codigo)
+            if actual is None: return False
+
+            nuevo = dict(actual, nombre=nombre, profesor=profesor, creditos=str(creditos))
+            try:
+                self._reescribir_tabla(self.archivo_cursos, "CODIGO|NOMBRE|PROFESOR|CREDITOS\n",
+                                       [self._linea_curso(nuevo if c is actual else c) for c in cursos], cursos)
+            except IOError:
+                return False
+            # La cache (y su indice de busqueda) se actualiza en el lugar
+            cursos.actualizar(nuevo)
             return True
-        except IOError:
-            return False
 
     def eliminar_curso(self, codigo):
-        cursos = self.obtener_cursos()
-        filtrados = [c for c in cursos if c['codigo'] != codigo]
-        
-        if len(cursos) == len(filtrados): return False # No existia
-        
-        try:
-            with open(self.archivo_cursos, 'w', encoding='utf-8') as f:
-                f.write("CODIGO|NOMBRE|PROFESOR|CREDITOS\n")
-                for c in filtrados:
-                    linea = f"{c['codigo']}|{c['nombre']}|{c['profesor']}|{c['creditos']}\n"
-                    f.write(linea)
+        with self.bloqueo:
+            cursos = self._leer_tabla(self.archivo_cursos, self._parsear_cursos)
+            if cursos.obtener(codigo) is None: return False # No existia
+
+            try:
+                self._reescribir_tabla(self.archivo_cursos, "CODIGO|NOMBRE|PROFESOR|CREDITOS\n",
+                                       [self._linea_curso(c) for c in cursos if c['codigo'] != codigo], cursos)
+            except IOError:
+                return False
+            cursos.quitar(codigo)
             return True
-        except IOError:
-            return False
+
+    def nombres_cursos(self):
+        """
+        {codigo: nombre} de todos los cursos, para cruces. Es el mapeo de la
+        cache (se mantiene con cada escritura): no modificarlo desde fuera.
+        """
+        return self._leer_tabla(self.archivo_cursos, self._parsear_cursos).nombres
 
     def buscar_cursos(self, termino):
-        termino = termino.lower().strip()
-        todos = self.obtener_cursos()
-        resultados = []
-        for c in todos:
-            if (termino in c['codigo'].lower() or 
-                termino in c['nombre'].lower() or 
-                termino in c['profesor'].lower()):
-                resultados.append(c)
-        return resultados
+        """
+        Busca cursos por codigo, nombre o profesor usando el indice por prefijo
+        (sin distinguir mayusculas ni tildes). Conserva el orden del archivo.
+        """
+        cursos = self._leer_tabla(self.archivo_cursos, self._parsear_cursos)
+        codigos = cursos.buscador().buscar(termino)
+        return [dict(c) for c in cursos if codigos is None or c['codigo'] in codigos]
 
     # --- ASISTENCIA ---
     def _inicializar_archivo_asistencias(self):
-        if not os.path.exists(self.archivo_asistencias):
-            with open(self.archivo_asistencias, 'w', encoding='utf-8') as f:
-                f.write("ID_ESTUDIANTE|CODIGO_CURSO|FECHA|ESTADO\n")
+        if not os.path.isdir(self.carpeta_asistencias) and os.path.exists(self.archivo_asistencias):
+            # Formato anterior (un solo diario): se migra una vez y se conserva como .migrado
+            segmentar_asistencias(self.archivo_asistencias, self.carpeta_asistencias)
+            os.replace(self.archivo_asistencias, self.archivo_asistencias + ".migrado")
+        else:
+            preparar_carpeta(self.carpeta_asistencias)
+
+    def _segmentos_asistencias(self):
+        return self._leer_tabla(self.manifiesto_asistencias, partial(leer_manifiesto, self.carpeta_asistencias))
+
+    def _tabla_segmento(self, ruta):
+        return self._leer_tabla(ruta, partial(self._parsear_asistencias, ruta))
+
+    def _parsear_archivados_asistencias(self):
+        return leer_manifiesto(self.carpeta_asistencias, ARCHIVADOS)
+
+    def _asistencias_archivadas(self):
+        """IndiceSegmentos {curso: {periodo: ruta}} de las asistencias de periodos archivados."""
+        return self._leer_tabla(self.archivados_asistencias, self._parsear_archivados_asistencias)
+
+    def _tabla_asistencias(self, cod_curso, fecha):
+        """IndiceAsistencias del segmento del curso en el mes de `fecha`, o None si no existe."""
+        ruta = self._segmentos_asistencias().ruta(cod_curso, mes_de_fecha(fecha))
+        return None if ruta is None else self._tabla_segmento(ruta)
+
+    def _iterar_asistencias(self, cod_curso=None, desde=None, hasta=None):
+        """
+        Registros vigentes del curso (o de todos) entre `desde` y `hasta`: los
+        de periodos archivados y luego los de los segmentos. Lee solo los
+        archivos de ese curso y esos meses.
+        """
+        planos = (self._tabla_segmento(ruta).registros.values()
+                  for ruta in self._segmentos_asistencias().rutas(cod_curso, desde, hasta))
+        for r in chain(self._iterar_archivadas(cod_curso, desde, hasta), chain.from_iterable(planos)):
+            if cod_curso is not None and r['curso'] != cod_curso:
+                continue
+            if (desde is not None and r['fecha'] < desde) or (hasta is not None and r['fecha'] > hasta):
+                continue
+            yield r
+
+    def _iterar_archivadas(self, cod_curso=None, desde=None, hasta=None):
+        """Asistencias archivadas del curso (o de todos) cuyos archivos cubren esos meses, leidas al vuelo."""
+        for ruta in self._asistencias_archivadas().rutas(cod_curso, desde, hasta):
+            # Ya tienen una linea por registro: se recorren sin armar el indice
+            yield from self._filas_asistencias(ruta)
+
+    def _segmento_abierto(self, cod_curso, fecha):
+        """Ruta del segmento del curso en el mes de `fecha`; lo crea y lo anota en el manifiesto si falta."""
+        mes = mes_de_fecha(fecha)
+        with self.bloqueo:
+            ruta = self._segmentos_asistencias().ruta(cod_curso, mes)
+            if ruta is not None:
+                return ruta
+            archivo = archivo_segmento(cod_curso, mes)
+            ruta = os.path.join(self.carpeta_asistencias, archivo)
+            crear_segmento(ruta)
+            self._anexar_lineas(self.manifiesto_asistencias, partial(leer_manifiesto, self.carpeta_asistencias),
+                                [linea_manifiesto(cod_curso, mes, archivo)],
+                                [{"curso": cod_curso, "clave": mes, "ruta": ruta}], aplicar=IndiceSegmentos.agregar)
+            return ruta
 
     def registrar_asistencia(self, id_estudiante, cod_curso, fecha, estado):
-        registros = self.obtener_asistencias_raw()
-        encontrado = False
-        
-        for reg in registros:
-            if (reg['id'] == id_estudiante and 
-                reg['curso'] == cod_curso and 
-                reg['fecha'] == fecha):
-                reg['estado'] = estado
-                encontrado = True
-                break
-        
-        if not encontrado:
-            registros.append({
-                'id': id_estudiante,
-                'curso': cod_curso,
-                'fecha': fecha,
-                'estado': estado
-            })
-            
+        """
+        UPSERT de asistencia: anexa una linea al segmento del curso y mes.
+        La lectura se queda con la ultima linea de cada (id, curso, fecha).
+        """
+        if self._matricula_archivada(id_estudiante, cod_curso):
+            return False, "La matrícula del estudiante en el curso pertenece a un periodo archivado"
+        fila = {'id': id_estudiante, 'curso': cod_curso, 'fecha': fecha, 'estado': estado}
         try:
-            with open(self.archivo_asistencias, 'w', encoding='utf-8') as f:
-                f.write("ID_ESTUDIANTE|CODIGO_CURSO|FECHA|ESTADO\n")
-                for r in registros:
-                    f.write(f"{r['id']}|{r['curso']}|{r['fecha']}|{r['estado']}\n")
-            return True, "Asistencia registrada"
+            with self._lock_asistencias:
+                ruta = self._segmento_abierto(cod_curso, fecha)
+                self._anexar_lineas(
+                    ruta, partial(self._parsear_asistencias, ruta),
+                    [f"{id_estudiante}|{cod_curso}|{fecha}|{estado}\n"], [fila],
+                    aplicar=IndiceAsistencias.agregar
+                )
         except IOError:
             return False, "Error al guardar asistencia"
 
-    def obtener_asistencias_raw(self):
-        data = []
-        if not os.path.exists(self.archivo_asistencias):
-            return data
-            
-        with open(self.archivo_asistencias, 'r', encoding='utf-8') as f:
+        self._compactar_si_corresponde(ruta)
+        return True, "Asistencia registrada"
+
+    def registrar_asistencias_lote(self, cod_curso, fecha, registros):
+        """
+        Registra la asistencia de todo un curso para una fecha en una sola escritura.
+        `registros` es una lista de (id_estudiante, estado) ya validados.
+        Las filas cuyo estado no cambia no se vuelven a escribir.
+        Retorna (exito, mensaje, cantidad_escrita).
+        """
+        vigentes = self.obtener_asistencias_curso_fecha(cod_curso, fecha)
+        nuevas = {}
+        for id_est, estado in registros:
+            if vigentes.get(id_est) == estado:
+                nuevas.pop(id_est, None)
+                continue
+            nuevas[id_est] = {'id': id_est, 'curso': cod_curso, 'fecha': fecha, 'estado': estado}
+
+        if not nuevas:
+            return True, "Sin cambios", 0
+        archivadas = [i for i in nuevas if self._matricula_archivada(i, cod_curso)]
+        if archivadas:
+            return False, f"Matrículas de periodos archivados: {', '.join(archivadas)}", 0
+
+        filas = list(nuevas.values())
+        try:
+            with self._lock_asistencias:
+                ruta = self._segmento_abierto(cod_curso, fecha)
+                self._anexar_lineas(
+                    ruta, partial(self._parsear_asistencias, ruta),
+                    [f"{r['id']}|{r['curso']}|{r['fecha']}|{r['estado']}\n" for r in filas], filas,
+                    aplicar=IndiceAsistencias.agregar
+                )
+        except IOError:
+            return False, "Error al guardar asistencia", 0
+
+        self._compactar_si_corresponde(ruta)
+        return True, "Asistencia registrada", len(filas)
+
+    def _filas_asistencias(self, ruta):
+        """Generador de las filas de un segmento (o de un archivo .gz archivado), en el orden del archivo."""
+        if not os.path.exists(ruta):
+            return
+        with abrir(ruta, 'r', encoding='utf-8') as f:
             for i, linea in enumerate(f):
                 if i == 0: continue
                 partes = linea.strip().split('|')
                 if len(partes) >= 4:
-                    data.append({
+                    yield {
                         'id': partes[0],
                         'curso': partes[1],
                         'fecha': partes[2],
                         'estado': partes[3]
-                    })
-        return data
+                    }
+
+    def _parsear_asistencias(self, ruta):
+        """
+        Lee un segmento completo y retorna un IndiceAsistencias
+        que conserva solo la ultima linea de cada (id, curso, fecha).
+        """
+        indice = IndiceAsistencias()
+        indice.agregar(self._filas_asistencias(ruta))
+        return indice
+
+    def _compactar_si_corresponde(self, ruta):
+        """Lanza la compactacion del segmento en segundo plano si crecio demasiado."""
+        indice = self._tabla_segmento(ruta)
+        if indice.lineas < self.UMBRAL_COMPACTACION or indice.lineas < self.FACTOR_COMPACTACION * len(indice):
+            return
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            return
+        self._hilo_compactacion = threading.Thread(target=self._compactar_segmento, args=(ruta,), daemon=True)
+        self._hilo_compactacion.start()
+
+    def _compactar_segmento(self, ruta):
+        """
+        Reescribe un segmento dejando una sola linea por (id, curso, fecha).
+        Escribe a un archivo temporal y lo reemplaza de forma atomica.
+        """
+        with self._lock_asistencias, self.bloqueo:
+            indice = self._tabla_segmento(ruta)
+            if indice.lineas == len(indice):
+                return True  # Ya esta compacto
+            temporal = ruta + ".tmp"
+            try:
+                with abrir(temporal, 'w', encoding='utf-8') as f:
+                    f.write(CABECERA_ASISTENCIAS)
+                    for r in indice.registros.values():
+                        f.write(f"{r['id']}|{r['curso']}|{r['fecha']}|{r['estado']}\n")
+                os.replace(temporal, ruta)
+            except IOError as e:
+                print(f"Error al compactar asistencias: {e}")
+                return False
+            indice.lineas = len(indice)
+            self._cache[ruta] = (self._firma_archivo(ruta), indice)
+        return True
+
+    def compactar_asistencias(self):
+        """Compacta los segmentos que tienen lineas superadas. Retorna False si alguno fallo."""
+        return all([self._compactar_segmento(ruta) for ruta in self._segmentos_asistencias().rutas()])
+
+    def obtener_asistencias_raw(self, cod_curso=None, desde=None, hasta=None):
+        """
+        Registros vigentes {id, curso, fecha, estado}, opcionalmente de un curso
+        y entre dos fechas AAAA-MM-DD (inclusive). Solo lee los segmentos necesarios.
+        """
+        return [dict(r) for r in self._iterar_asistencias(cod_curso, desde, hasta)]
 
     def obtener_asistencia_estudiante(self, id_est, cod_curso, fecha):
-        registros = self.obtener_asistencias_raw()
-        for r in registros:
-            if r['id'] == id_est and r['curso'] == cod_curso and r['fecha'] == fecha:
-                return r['estado']
-        return None
+        tabla = self._tabla_asistencias(cod_curso, fecha)
+        estado = None if tabla is None else tabla.estado(id_est, cod_curso, fecha)
+        if estado is None:
+            estado = next((r['estado'] for r in self._iterar_archivadas(cod_curso, fecha, fecha)
+                           if r['id'] == id_est and r['curso'] == cod_curso and r['fecha'] == fecha), None)
+        return estado
+
+    def obtener_asistencias_curso_fecha(self, cod_curso, fecha):
+        """
+        Retorna {id_estudiante: estado} con la asistencia de todo un curso
+        en una fecha. Permite cargar el roster sin una consulta por alumno.
+        """
+        asistencias = {r['id']: r['estado'] for r in self._iterar_archivadas(cod_curso, fecha, fecha)
+                       if r['curso'] == cod_curso and r['fecha'] == fecha}
+        tabla = self._tabla_asistencias(cod_curso, fecha)
+        if tabla is not None:
+            asistencias.update(tabla.del_curso_fecha(cod_curso, fecha))
+        return asistencias
 
     # --- MATRICULAS ---
+    # Un archivo por periodo en carpeta_matriculas (ver data/particiones.py)
 
-    def existe_matricula(self, id_est, cod_curso):
-        if not os.path.exists(self.archivo_matriculas):
-            return False
-            
-        with open(self.archivo_matriculas, 'r', encoding='utf-8') as f:
+    def _particiones_matriculas(self):
+        """{periodo: (ruta, cerrado)}; la carpeta se vuelve a listar solo si cambio."""
+        firma = self._firma_archivo(self.carpeta_matriculas)
+        if self._particiones is None or self._particiones[0] != firma:
+            self._particiones = (firma, listar_particiones(self.carpeta_matriculas))
+        return self._particiones[1]
+
+    def _tabla_particion(self, periodo, ruta, cerrado):
+        return self._leer_tabla(ruta, partial(self._parsear_matriculas, ruta, periodo if cerrado else None))
+
+    def _tablas_matriculas(self, periodo=None):
+        """IndiceMatriculas de cada periodo en orden (o solo el de `periodo`, si existe)."""
+        particiones = self._particiones_matriculas()
+        if periodo is not None:
+            nombre = nombre_particion(periodo)
+            particiones = {nombre: particiones[nombre]} if nombre in particiones else {}
+        return [self._tabla_particion(p, ruta, cerrado) for p, (ruta, cerrado) in particiones.items()]
+
+    def _parsear_matriculas(self, ruta, periodo_cerrado=None):
+        """
+        Filas crudas de una particion (sin nombres), indexadas. Los archivos
+        cerrados no tienen la columna del periodo: se recibe en `periodo_cerrado`.
+        """
+        filas = []
+        if not os.path.exists(ruta):
+            return IndiceMatriculas()
+        with abrir(ruta, 'r', encoding='utf-8') as f:
             for i, linea in enumerate(f):
                 if i == 0: continue
-                partes = linea.strip().split('|')
-                if len(partes) >= 2:
-                    if partes[0] == id_est and partes[1] == cod_curso:
-                        return True
-        return False
+                fila = self._fila_matricula(linea, periodo_cerrado)
+                if fila is not None:
+                    filas.append(fila)
+        return IndiceMatriculas(filas)
+
+    def _fila_matricula(self, linea, periodo_cerrado=None):
+        """Fila de una linea de matriculas, o None si no tiene las columnas minimas."""
+        partes = linea.strip().split('|')
+        if len(partes) < 3:
+            return None
+        if periodo_cerrado is not None:
+            partes.insert(3, periodo_cerrado)
+        return {
+            "id_est": partes[0],
+            "cod_curso": partes[1],
+            "fecha": partes[2],
+            # Backward compatibility
+            "periodo": partes[3] if len(partes) > 3 else PERIODO_POR_DEFECTO,
+            "estado": partes[4] if len(partes) > 4 else "Matriculado"
+        }
+
+    def _particion_abierta(self, periodo):
+        """Ruta del archivo abierto de `periodo`; lo crea si es el primero del periodo."""
+        with self.bloqueo:
+            particion = self._particiones_matriculas().get(nombre_particion(periodo))
+            if particion is not None:
+                return particion[0]
+            ruta = ruta_particion(self.carpeta_matriculas, periodo)
+            with abrir(ruta, 'w', encoding='utf-8') as f:
+                f.write(CABECERA_ABIERTA)
+            self._particiones = None
+            return ruta
+
+    def periodos_matriculas(self):
+        """Lista de (periodo, cerrado) con matriculas, en orden."""
+        return [(periodo, cerrado) for periodo, (_, cerrado) in self._particiones_matriculas().items()]
+
+    def periodo_cerrado(self, periodo):
+        particion = self._particiones_matriculas().get(nombre_particion(periodo))
+        return particion is not None and particion[1]
+
+    def cerrar_periodo(self, periodo):
+        """
+        Archiva las matriculas de `periodo` en un archivo compacto de solo
+        lectura; desde entonces no se pueden agregar ni eliminar matriculas
+        del periodo. Retorna (exito, mensaje, cantidad).
+        """
+        if nombre_particion(periodo) != periodo:
+            return False, f"Periodo inválido: {periodo}", 0  # El archivo cerrado lleva el periodo en el nombre
+        with self.bloqueo:
+            particion = self._particiones_matriculas().get(periodo)
+            if particion is None:
+                return False, f"No hay matrículas del periodo {periodo}.", 0
+            ruta, cerrado = particion
+            if cerrado:
+                return False, f"El periodo {periodo} ya está cerrado.", 0
+            filas = list(self._tabla_particion(periodo, ruta, False))
+            try:
+                escribir_cerrada(self.carpeta_matriculas, periodo, filas)
+            except OSError as e:
+                return False, str(e), 0
+            self._cache.pop(ruta, None)
+            self._particiones = None
+            return True, f"Periodo {periodo} cerrado", len(filas)
+
+    def periodo_archivado(self, periodo):
+        particion = self._particiones_matriculas().get(nombre_particion(periodo))
+        return particion is not None and es_comprimido(particion[0])
+
+    def _particion_por_archivar(self, periodo):
+        """(ruta, None) del archivo cerrado y sin archivar de `periodo`, o (None, mensaje) si no se puede archivar."""
+        if nombre_particion(periodo) != periodo:
+            return None, f"Periodo inválido: {periodo}"
+        particion = self._particiones_matriculas().get(periodo)
+        if particion is None or not particion[1]:
+            return None, f"El periodo {periodo} no está cerrado."
+        if es_comprimido(particion[0]):
+            return None, f"El periodo {periodo} ya está archivado."
+        return particion[0], None
+
+    def _pares_por_archivar(self, periodo, matriculas):
+        """
+        Pares (id, curso) de las `matriculas` del periodo cuyas asistencias y
+        notas se archivan con el: los que no tienen matricula en otro periodo
+        sin archivar (esas filas no dicen de que periodo son).
+        """
+        otras = [self._tabla_particion(p, ruta, cerrado) for p, (ruta, cerrado) in self._particiones_matriculas().items()
+                 if p != periodo and not es_comprimido(ruta)]
+        return {par for par in matriculas.pares if not any(t.existe(*par) for t in otras)}
+
+    def _matricula_archivada(self, id_est, cod_curso):
+        """
+        True si las asistencias y notas de (id, curso) son de solo lectura: esta
+        matriculado en un periodo archivado y en ninguno sin archivar.
+        """
+        particiones = self._particiones_matriculas()
+        archivadas = [(p, ruta) for p, (ruta, _) in particiones.items() if es_comprimido(ruta)]
+        if not any(self._tabla_particion(p, ruta, True).existe(id_est, cod_curso) for p, ruta in archivadas):
+            return False
+        return not any(self._tabla_particion(p, ruta, cerrado).existe(id_est, cod_curso)
+                       for p, (ruta, cerrado) in particiones.items() if not es_comprimido(ruta))
+
+    def _asistencias_de_pares(self, pares):
+        """{ruta del segmento: [registros]} con las asistencias vigentes de `pares` en los segmentos de sus cursos."""
+        segmentos = self._segmentos_asistencias()
+        rutas = dict.fromkeys(chain.from_iterable(segmentos.rutas(c) for c in sorted({c for _, c in pares})))
+        por_segmento = {}
+        for ruta in rutas:
+            filas = [r for r in self._tabla_segmento(ruta).registros.values() if (r['id'], r['curso']) in pares]
+            if filas:
+                por_segmento[ruta] = filas
+        return por_segmento
+
+    def alcance_archivado(self, periodo):
+        """
+        {codigo_curso: [meses AAAA-MM]} de lo que archivar_periodo(periodo)
+        dejaria en solo lectura: los cursos con matriculas que se archivan y
+        los meses en que tienen asistencias. Vacio si no se puede archivar.
+        """
+        with self.bloqueo:
+            ruta, _ = self._particion_por_archivar(periodo)
+            if ruta is None:
+                return {}
+            pares = self._pares_por_archivar(periodo, self._tabla_particion(periodo, ruta, True))
+            meses = {c: set() for _, c in pares}
+            for filas in self._asistencias_de_pares(pares).values():
+                for r in filas:
+                    meses[r['curso']].add(mes_de_fecha(r['fecha']))
+        return {c: sorted(m) for c, m in sorted(meses.items())}
+
+    def archivar_periodo(self, periodo):
+        """
+        Comprime en archivos .gz de solo lectura lo de un periodo cerrado
+        (data/archivado.py): sus matriculas y las asistencias y notas de esas
+        matriculas (ver _pares_por_archivar), que salen de los segmentos y de
+        notas_db.txt. Las consultas las siguen viendo; las que no tocan esos
+        cursos, meses o el periodo no las abren. alcance_archivado dice antes
+        que cursos y meses quedan en solo lectura.
+        Retorna (exito, mensaje, {tabla: registros archivados}).
+        """
+        with self._lock_asistencias, self._lock_notas, self.bloqueo:
+            ruta, error = self._particion_por_archivar(periodo)
+            if ruta is None:
+                return False, error, {}
+            matriculas = self._tabla_particion(periodo, ruta, True)
+            pares = self._pares_por_archivar(periodo, matriculas)
+            try:
+                cantidades = {"matriculas": len(matriculas),
+                              "asistencias": self._archivar_asistencias(periodo, pares),
+                              "notas": self._archivar_notas(periodo, pares)}
+                # Las matriculas al final: si se interrumpe, el periodo sigue sin archivar y se puede repetir
+                archivo = escribir_cerrada(self.carpeta_matriculas, periodo, matriculas, comprimido=True)
+                os.remove(ruta)
+            except (OSError, ValueError) as e:
+                return False, str(e), {}
+            self._cache.pop(ruta, None)
+            self._cache[archivo] = (self._firma_archivo(archivo), matriculas)
+            self._particiones = None
+        return True, f"Periodo {periodo} archivado", cantidades
+
+    def _archivar_asistencias(self, periodo, pares):
+        """
+        Mueve las asistencias de `pares` de sus segmentos a un .gz por curso
+        (CUR-001/<periodo>.txt.gz, en orden de fecha) anotado en archivados.txt
+        con sus meses. Retorna la cantidad de registros archivados.
+        """
+        por_segmento = self._asistencias_de_pares(pares)
+        if not por_segmento:
+            return 0
+
+        por_archivo = {}
+        for filas in por_segmento.values():
+            for r in filas:
+                por_archivo.setdefault(archivo_archivado(r['curso'], periodo), {})[(r['id'], r['curso'], r['fecha'])] = r
+        archivados = self._asistencias_archivadas()
+        lineas, filas_nuevas = [], []
+        for archivo, registros in sorted(por_archivo.items()):
+            ruta = os.path.join(self.carpeta_asistencias, archivo)
+            # Un archivado interrumpido pudo dejar el archivo y quitar ya algunas filas de los segmentos
+            previos = {(r['id'], r['curso'], r['fecha']): r for r in self._filas_asistencias(ruta)}
+            registros = sorted({**previos, **registros}.values(), key=lambda r: (r['curso'], r['fecha'], r['id']))
+            escribir_comprimido(ruta, (f"{r['id']}|{r['curso']}|{r['fecha']}|{r['estado']}\n" for r in registros),
+                                CABECERA_ASISTENCIAS)
+            for curso in sorted({r['curso'] for r in registros}):
+                if archivados.ruta(curso, periodo) is None:
+                    meses = sorted(mes_de_fecha(r['fecha']) for r in registros if r['curso'] == curso)
+                    lineas.append(linea_archivado(curso, periodo, archivo, (meses[0], meses[-1])))
+                    filas_nuevas.append({"curso": curso, "clave": periodo, "ruta": ruta,
+                                         "meses": (meses[0], meses[-1])})
+        if not os.path.exists(self.archivados_asistencias):
+            with abrir(self.archivados_asistencias, 'w', encoding='utf-8') as f:
+                f.write(CABECERA_ARCHIVADOS)
+        self._anexar_lineas(self.archivados_asistencias, self._parsear_archivados_asistencias, lineas, filas_nuevas,
+                            aplicar=IndiceSegmentos.agregar)
+
+        # Recien ahora salen de los segmentos, que quedan compactos
+        for ruta, filas in por_segmento.items():
+            archivadas = {(r['id'], r['curso'], r['fecha']) for r in filas}
+            restantes = [r for clave, r in self._tabla_segmento(ruta).registros.items() if clave not in archivadas]
+            indice = IndiceAsistencias()
+            indice.agregar(restantes)
+            self._reescribir_tabla(ruta, CABECERA_ASISTENCIAS,
+                                   [f"{r['id']}|{r['curso']}|{r['fecha']}|{r['estado']}\n" for r in restantes], indice)
+        return sum(len(filas) for filas in por_segmento.values())
+
+    def _archivar_notas(self, periodo, pares):
+        """
+        Mueve las notas de `pares` de notas_db.txt a
+        notas_archivadas/<periodo>.txt.gz. Retorna la cantidad archivada.
+        """
+        tabla, _ = self._tabla_notas_ancho_fijo()
+        if tabla is None:
+            raise ValueError("No se pudo convertir el archivo de notas")
+        notas = sorted((n for n in tabla if (n['id'], n['cod_curso']) in pares),
+                       key=lambda n: (n['cod_curso'], n['id']))
+        if not notas:
+            return 0
+
+        preparar_carpeta(self.carpeta_notas_archivadas, CABECERA_MANIFIESTO_NOTAS)
+        archivo = nombre_particion(periodo) + ".txt" + SUFIJO_COMPRIMIDO
+        ruta = os.path.join(self.carpeta_notas_archivadas, archivo)
+        escribir_comprimido(ruta, (f"{n['id']}|{n['cod_curso']}|{n['n1']}|{n['n2']}|{n['n3']}|{n['promedio']}\n"
+                                   for n in notas), CABECERA_NOTAS)
+        archivadas = self._notas_archivadas()
+        cursos = sorted({n['cod_curso'] for n in notas if archivadas.ruta(n['cod_curso'], periodo) is None})
+        self._anexar_lineas(self.manifiesto_notas_archivadas, self._parsear_manifiesto_notas,
+                            [linea_manifiesto(c, periodo, archivo) for c in cursos],
+                            [{"curso": c, "clave": periodo, "ruta": ruta} for c in cursos],
+                            aplicar=IndiceSegmentos.agregar)
+        # Recien ahora salen de notas_db.txt: si se interrumpe antes, solo queda repetir el archivado
+        quitar_registros(self.archivo_notas, {(n['id'], n['cod_curso']) for n in notas})
+        self.invalidar_cache(self.archivo_notas)
+        return len(notas)
+
+    def existe_matricula(self, id_est, cod_curso, periodo=None):
+        return any(t.existe(id_est, cod_curso) for t in self._tablas_matriculas(periodo))
+
+    def _ids_matriculados(self, cod_curso, periodo=None):
+        """IDs del roster de un curso sin repetir, en orden de periodo y de matricula."""
+        tablas = self._tablas_matriculas(periodo)
+        if len(tablas) == 1:
+            return tablas[0].ids_curso(cod_curso)
+        return list(dict.fromkeys(chain.from_iterable(t.ids_curso(cod_curso) for t in tablas)))
 
     def registrar_matricula(self, id_est, cod_curso, fecha, periodo, estado):
+        if self.periodo_cerrado(periodo):
+            return False, f"El periodo {periodo} está cerrado."
         if self.existe_matricula(id_est, cod_curso):
              return False, "El estudiante ya está matriculado en este curso."
-             
+
         try:
-            with open(self.archivo_matriculas, 'a', encoding='utf-8') as f:
-                linea = f"{id_est}|{cod_curso}|{fecha}|{periodo}|{estado}\n"
-                f.write(linea)
+            linea = f"{id_est}|{cod_curso}|{fecha}|{periodo}|{estado}\n"
+            fila = {"id_est": id_est, "cod_curso": cod_curso, "fecha": fecha,
+                    "periodo": periodo, "estado": estado}
+            ruta = self._particion_abierta(periodo)
+            self._anexar_lineas(ruta, partial(self._parsear_matriculas, ruta), [linea], [fila],
+                                aplicar=IndiceMatriculas.agregar)
             return True, "Matrícula exitosa"
         except IOError as e:
             return False, str(e)
 
-    def obtener_matriculados(self, cod_curso):
-        """Devuelve lista de objetos estudiante inscritos en un curso."""
-        estudiantes_activos = {e['id']: e for e in self.obtener_estudiantes(activos=True)}
-        matriculados = []
-        
-        matriculas = self.obtener_matriculas() # Obtiene lista con 'id_est', 'cod_curso'
-        
-        # Filtramos por curso y validamos que el estudiante exista y este activo
+    def registrar_matriculas_lote(self, matriculas):
+        """
+        Registra varias matriculas {id_est, cod_curso, fecha, periodo, estado}
+        (validadas y sin duplicados) con una escritura por periodo. Retorna (exito, mensaje, cantidad).
+        """
+        por_periodo = {}
         for m in matriculas:
-            if m['cod_curso'] == cod_curso:
-                est = estudiantes_activos.get(m['id_est'])
-                if est:
-                    matriculados.append(est)
+            por_periodo.setdefault(m['periodo'], []).append(
+                {"id_est": m['id_est'], "cod_curso": m['cod_curso'], "fecha": m['fecha'],
+                 "periodo": m['periodo'], "estado": m['estado']})
+        if not por_periodo:
+            return True, "Sin cambios", 0
+        cerrados = [p for p in por_periodo if self.periodo_cerrado(p)]
+        if cerrados:
+            return False, f"Periodos cerrados: {', '.join(cerrados)}", 0
+        try:
+            for periodo, filas in por_periodo.items():
+                ruta = self._particion_abierta(periodo)
+                self._anexar_lineas(ruta, partial(self._parsear_matriculas, ruta),
+                                    [f"{m['id_est']}|{m['cod_curso']}|{m['fecha']}|{m['periodo']}|{m['estado']}\n"
+                                     for m in filas], filas, aplicar=IndiceMatriculas.agregar)
+        except IOError as e:
+            return False, str(e), 0
+        return True, "Matrículas registradas", sum(map(len, por_periodo.values()))
+
+    def obtener_matriculados(self, cod_curso, periodo=None):
+        """Devuelve lista de objetos estudiante inscritos en un curso (en un periodo o en todos)."""
+        estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+        matriculados = []
+
+        # Recorremos solo el roster del curso y validamos que el estudiante exista y este activo
+        for id_est in self._ids_matriculados(cod_curso, periodo):
+            est = estudiantes.obtener(id_est)
+            if est and est['activo']:
+                matriculados.append(dict(est))
         return matriculados
 
-    def obtener_matriculas(self):
-        data = []
-        if not os.path.exists(self.archivo_matriculas):
-            return data
-        
+    def obtener_matriculas(self, periodo=None):
         # Necesitamos cruzar datos para mostrar nombres
-        estudiantes = {e['id']: f"{e['nombre']} {e['apellido']}" for e in self.obtener_estudiantes()}
-        cursos = {c['codigo']: c['nombre'] for c in self.obtener_cursos()}
-        
-        with open(self.archivo_matriculas, 'r', encoding='utf-8') as f:
-            for i, linea in enumerate(f):
-                if i == 0: continue
-                partes = linea.strip().split('|')
-                if len(partes) >= 3:
-                    id_est = partes[0]
-                    cod_curso = partes[1]
-                    fecha = partes[2]
-                    # Backward compatibility
-                    periodo = partes[3] if len(partes) > 3 else "2024-1"
-                    estado = partes[4] if len(partes) > 4 else "Matriculado"
-                    
-                    nombre_est = estudiantes.get(id_est, id_est)
-                    nombre_curso = cursos.get(cod_curso, cod_curso)
-                    
-                    data.append({
-                        "id_est": id_est,
-                        "cod_curso": cod_curso,
-                        "estudiante": nombre_est,
-                        "curso": nombre_curso,
-                        "fecha": fecha,
-                        "periodo": periodo,
-                        "estado": estado
-                    })
+        estudiantes = self.nombres_estudiantes()
+        cursos = self.nombres_cursos()
+
+        data = []
+        for m in chain.from_iterable(self._tablas_matriculas(periodo)):
+            data.append({
+                "id_est": m['id_est'],
+                "cod_curso": m['cod_curso'],
+                "estudiante": estudiantes.get(m['id_est'], m['id_est']),
+                "curso": cursos.get(m['cod_curso'], m['cod_curso']),
+                "fecha": m['fecha'],
+                "periodo": m['periodo'],
+                "estado": m['estado']
+            })
         return data
 
     def eliminar_matricula(self, id_est, cod_curso):
-        matriculas = self.obtener_matriculas() # Esto nos da dicts enriquecidos, necesitamos leer raw mejor o re-escribir con cuidado
-        
-        # Leemos raw para escribir
+        # Solo en los periodos abiertos: los cerrados son de solo lectura
+        ruta = next((r for p, (r, cerrado) in self._particiones_matriculas().items()
+                     if not cerrado and self._tabla_particion(p, r, False).existe(id_est, cod_curso)), None)
+        if ruta is None: return False
+
+        # Leemos raw para escribir (conservando las lineas tal cual estan)
         lines_to_keep = []
         header = None
-        
-        if not os.path.exists(self.archivo_matriculas): return False
-        
-        with open(self.archivo_matriculas, 'r', encoding='utf-8') as f:
+
+        with abrir(ruta, 'r', encoding='utf-8') as f:
             lines = f.readlines()
             if not lines: return False
             header = lines[0]
@@ -270,114 +850,123 @@ class DataManager:
                     if parts[0] == id_est and parts[1] == cod_curso:
                         continue # Skip (delete)
                 lines_to_keep.append(line)
-                
+
+        # La cache se arma con las mismas lineas: el archivo se lee una sola vez
+        filas = [fila for fila in map(self._fila_matricula, lines_to_keep) if fila is not None]
+
         try:
-            with open(self.archivo_matriculas, 'w', encoding='utf-8') as f:
-                f.write(header)
-                f.writelines(lines_to_keep)
+            self._reescribir_tabla(ruta, header, lines_to_keep, IndiceMatriculas(filas))
             return True
         except IOError:
             return False
 
-    def obtener_estudiantes_por_curso(self, cod_curso):
-        """Devuelve los objetos estudiante matriculados en un curso."""
-        ids_permitidos = []
-        if os.path.exists(self.archivo_matriculas):
-            with open(self.archivo_matriculas, 'r', encoding='utf-8') as f:
-                for linea in f:
-                    partes = linea.strip().split('|')
-                    if len(partes) >= 2 and partes[1] == cod_curso:
-                        ids_permitidos.append(partes[0])
-        
-        todos = self.obtener_estudiantes()
-        return [est for est in todos if est['id'] in ids_permitidos]
+    def obtener_estudiantes_por_curso(self, cod_curso, periodo=None):
+        """Devuelve los objetos estudiante matriculados en un curso (activos o no)."""
+        estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+        ids = self._ids_matriculados(cod_curso, periodo)
+        return [dict(estudiantes.obtener(i)) for i in ids if estudiantes.obtener(i)]
 
     def _inicializar_archivo_estudiantes(self):
         """Crea el archivo de estudiantes con cabeceras si no existe."""
         if not os.path.exists(self.archivo_estudiantes):
-            with open(self.archivo_estudiantes, 'w', encoding='utf-8') as f:
+            with abrir(self.archivo_estudiantes, 'w', encoding='utf-8') as f:
                 f.write("ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n")
 
+    def _linea_estudiante(self, est):
+        activo_str = "1" if est.get('activo', True) else "0"
+        return f"{est['id']}|{est['nombre']}|{est['apellido']}|{est['carrera']}|{est['nacimiento']}|{est['correo']}|{activo_str}\n"
+
     def registrar_estudiante(self, nombre, apellido, carrera, nacimiento, correo, activo=True):
         """
         Genera ID automatico y guarda al estudiante.
         """
         nuevo_id = self._generar_nuevo_id()
-        activo_str = "1" if activo else "0"
+        est = {
+            "id": nuevo_id, "nombre": nombre, "apellido": apellido, "carrera": carrera,
+            "nacimiento": nacimiento, "correo": correo, "activo": bool(activo)
+        }
         try:
-            with open(self.archivo_estudiantes, 'a', encoding='utf-8') as f:
-                linea = f"{nuevo_id}|{nombre}|{apellido}|{carrera}|{nacimiento}|{correo}|{activo_str}\n"
-                f.write(linea)
+            self._anexar_lineas(self.archivo_estudiantes, self._parsear_estudiantes,
+                                [self._linea_estudiante(est)], [est], aplicar=IndiceEstudiantes.agregar)
             return True
         except IOError as e:
             print(f"Error al guardar estudiante: {e}")
             return False
 
-    def actualizar_estudiante(self, id_est, nombre, apellido, carrera, nacimiento, correo, activo):
-        estudiantes = self.obtener_estudiantes()
-        encontrado = False
-        
-        # Actualizamos la lista en memoria
-        for est in estudiantes:
-            if est['id'] == id_est:
-                est['nombre'] = nombre
-                est['apellido'] = apellido
-                est['carrera'] = carrera
-                est['nacimiento'] = nacimiento
-                est['correo'] = correo
-                est['activo'] = activo
-                encontrado = True
-                break
-        
-        if not encontrado:
-            return False
-            
-        # Reescribimos todo el archivo
+    def registrar_estudiantes_lote(self, estudiantes):
+        """
+        Registra varios estudiantes {nombre, apellido, carrera, nacimiento, correo, activo}
+        (ya validados) en una sola escritura, con un bloque de IDs reservado de una vez.
+        Retorna (exito, mensaje, ids_asignados).
+        """
+        if not estudiantes:
+            return True, "Sin cambios", []
+        ids = self.reservar_ids_estudiantes(len(estudiantes))
+        filas = [{
+            "id": id_est, "nombre": e['nombre'], "apellido": e['apellido'], "carrera": e['carrera'],
+            "nacimiento": e['nacimiento'], "correo": e['correo'], "activo": bool(e.get('activo', True))
+        } for id_est, e in zip(ids, estudiantes)]
         try:
-            with open(self.archivo_estudiantes, 'w', encoding='utf-8') as f:
-                f.write("ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n")
-                for est in estudiantes:
-                    activo_str = "1" if est.get('activo', True) else "0"
-                    linea = f"{est['id']}|{est['nombre']}|{est['apellido']}|{est['carrera']}|{est['nacimiento']}|{est['correo']}|{activo_str}\n"
-                    f.write(linea)
+            self._anexar_lineas(self.archivo_estudiantes, self._parsear_estudiantes,
+                                [self._linea_estudiante(e) for e in filas], filas, aplicar=IndiceEstudiantes.agregar)
+        except IOError as e:
+            print(f"Error al guardar estudiantes: {e}")
+            return False, "Error al guardar estudiantes", []
+        return True, "Estudiantes registrados", ids
+
+    def actualizar_estudiante(self, id_est, nombre, apellido, carrera, nacimiento, correo, activo):
+        with self.bloqueo:
+            estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+            actual = estudiantes.obtener(id_est)
+            if actual is None:
+                return False
+
+            nuevo = dict(actual, nombre=nombre, apellido=apellido, carrera=carrera,
+                         nacimiento=nacimiento, correo=correo, activo=activo)
+
+            # Reescribimos todo el archivo
+            try:
+                self._reescribir_tabla(self.archivo_estudiantes, "ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n",
+                                       [self._linea_estudiante(nuevo if e is actual else e) for e in estudiantes],
+                                       estudiantes)
+            except IOError:
+                return False
+            # La cache (y su indice de busqueda) se actualiza en el lugar
+            estudiantes.actualizar(nuevo)
             return True
-        except IOError:
-            return False
 
     def eliminar_estudiante(self, id_est):
         """Elimina un estudiante por su ID."""
-        estudiantes = self.obtener_estudiantes()
-        estudiantes_filtrados = [e for e in estudiantes if e['id'] != id_est]
-        
-        if len(estudiantes) == len(estudiantes_filtrados):
-            return False # No se encontro
-            
-        try:
-            with open(self.archivo_estudiantes, 'w', encoding='utf-8') as f:
-                f.write("ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n")
-                for est in estudiantes_filtrados:
-                    activo_str = "1" if est.get('activo', True) else "0"
-                    linea = f"{est['id']}|{est['nombre']}|{est['apellido']}|{est['carrera']}|{est['nacimiento']}|{est['correo']}|{activo_str}\n"
-                    f.write(linea)
+        with self.bloqueo:
+            estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+            if estudiantes.obtener(id_est) is None:
+                return False # No se encontro
+
+            try:
+                self._reescribir_tabla(self.archivo_estudiantes, "ID|NOMBRE|APELLIDO|CARRERA|NACIMIENTO|CORREO|ACTIVO\n",
+                                       [self._linea_estudiante(e) for e in estudiantes if e['id'] != id_est],
+                                       estudiantes)
+            except IOError:
+                return False
+            estudiantes.quitar(id_est)
             return True
-        except IOError:
-            return False
 
-    def obtener_estudiantes(self, activos=False):
-        data = []
+    def _parsear_estudiantes(self):
+        data = IndiceEstudiantes()
         if not os.path.exists(self.archivo_estudiantes):
             return data
-            
-        with open(self.archivo_estudiantes, 'r', encoding='utf-8') as f:
+
+        filas = []
+        with abrir(self.archivo_estudiantes, 'r', encoding='utf-8') as f:
             for i, linea in enumerate(f):
-                if i == 0: continue 
+                if i == 0: continue
                 partes = linea.strip().split('|')
-                
+
                 est = {
-                    "id": "", "nombre": "", "apellido": "", "carrera": "", 
+                    "id": "", "nombre": "", "apellido": "", "carrera": "",
                     "nacimiento": "", "correo": "", "activo": True
                 }
-                
+
                 if len(partes) >= 1: est["id"] = partes[0]
                 if len(partes) >= 2: est["nombre"] = partes[1]
                 if len(partes) >= 3: est["apellido"] = partes[2]
@@ -385,165 +974,320 @@ class DataManager:
                 if len(partes) >= 5: est["nacimiento"] = partes[4]
                 if len(partes) >= 6: est["correo"] = partes[5]
                 if len(partes) >= 7: est["activo"] = (partes[6].strip() == "1")
-                
+
                 if est["id"]: # Solo agregar si tiene ID
-                    if activos:
-                        if est["activo"]:
-                            data.append(est)
-                    else:
-                        data.append(est)
-                    
+                    filas.append(est)
+
+        data.agregar(filas)
         return data
 
+    def obtener_estudiantes(self, activos=False):
+        todos = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+        if activos:
+            return [dict(e) for e in todos if e["activo"]]
+        return [dict(e) for e in todos]
+
+    def _max_id_en_archivo(self):
+        """Mayor ID numerico presente en estudiantes.txt (None si no hay)."""
+        return self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes).max_id
+
     def _generar_nuevo_id(self):
-        """Lee el ultimo ID del archivo y retorna el siguiente."""
-        if not os.path.exists(self.archivo_estudiantes):
-            return "2024001"
-            
-        ids = []
-        try:
-            with open(self.archivo_estudiantes, 'r', encoding='utf-8') as f:
-                next(f) # Skip header
-                for linea in f:
-                    partes = linea.strip().split('|')
-                    if partes and partes[0].isdigit():
-                        ids.append(int(partes[0]))
-        except:
-            pass
-            
-        if not ids:
-            return "2024001"
-            
-        return str(max(ids) + 1)
+        """
+        Retorna el siguiente ID de la secuencia persistente (estudiantes.seq).
+        Si otro proceso agrego estudiantes, la cache se recarga y el mayor ID
+        visto se usa como minimo de la secuencia.
+        """
+        return self._secuencia_estudiantes.siguiente(minimo=self._max_id_en_archivo())
+
+    def reservar_ids_estudiantes(self, cantidad):
+        """
+        Reserva un bloque de `cantidad` IDs consecutivos (para importaciones
+        masivas) y los retorna como lista de strings.
+        """
+        primero = self._secuencia_estudiantes.reservar(cantidad, minimo=self._max_id_en_archivo())
+        return [str(primero + i) for i in range(cantidad)]
+
+    def nombres_estudiantes(self):
+        """
+        {id: "nombre apellido"} de todos los estudiantes, para cruces. Es el
+        mapeo de la cache (se mantiene con cada escritura): no modificarlo desde fuera.
+        """
+        return self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes).nombres
 
     def buscar_estudiantes(self, termino):
-        """Busca estudiantes por ID, nombre o apellido (case insensitive)."""
-        termino = termino.lower().strip()
-        data = []
-        todos = self.obtener_estudiantes()
-        
-        for est in todos:
-            # Busqueda simple: si el termino esta en id, nombre, apellido, carrera o correo
-            if (termino in est['id'].lower() or 
-                termino in est['nombre'].lower() or 
-                termino in est['apellido'].lower() or
-                termino in est['carrera'].lower() or
-                termino in est['correo'].lower()):
-                data.append(est)
-        return data
+        """
+        Busca estudiantes por ID, nombre, apellido, carrera o correo usando el
+        indice por prefijo (sin distinguir mayusculas ni tildes; ver data/busqueda.py).
+        Conserva el orden del archivo.
+        """
+        estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+        ids = estudiantes.buscador().buscar(termino)
+        return [dict(e) for e in estudiantes if ids is None or e['id'] in ids]
 
-        return data
+    def iterar_historial_asistencia(self, cod_curso, desde=None, hasta=None):
+        """
+        Generador de {id_est, fecha, estado} para un curso dado (opcionalmente
+        entre dos fechas). Sin curso no hay filas: no recorre todos los segmentos.
+        """
+        if cod_curso is None:
+            return
+        for r in self._iterar_asistencias(cod_curso, desde, hasta):
+            yield {
+                "id_est": r['id'],
+                "fecha": r['fecha'],
+                "estado": r['estado']
+            }
 
-    def obtener_historial_asistencia(self, cod_curso):
+    def obtener_historial_asistencia(self, cod_curso, desde=None, hasta=None):
         """
         Retorna lista de {id_est, fecha, estado} para un curso dado.
         """
-        data = []
-        if not os.path.exists(self.archivo_asistencias):
-            return data
-            
-        with open(self.archivo_asistencias, 'r', encoding='utf-8') as f:
-            for line in f:
-                parts = line.strip().split('|')
-                if len(parts) >= 4:
-                    # ID_EST|COD_CURSO|FECHA|ESTADIO
-                    if parts[1] == cod_curso:
-                        data.append({
-                            "id_est": parts[0],
-                            "fecha": parts[2],
-                            "estado": parts[3]
-                        })
-        return data
+        return list(self.iterar_historial_asistencia(cod_curso, desde, hasta))
+
+    def _parsear_notas(self):
+        """
+        Filas crudas de notas (valores como texto) en un IndiceNotas.
+        Ignora la cabecera y cualquier linea que no tenga las 6 columnas.
+        Si el archivo es de ancho fijo registra el offset de cada registro.
+        """
+        tabla = IndiceNotas()
+        if not os.path.exists(self.archivo_notas):
+            return tabla
+        with abrir(self.archivo_notas, 'rb') as f:
+            primera = f.readline()
+            tabla.ancho_fijo = es_cabecera_fija(primera)
+            offset = len(primera) if tabla.ancho_fijo else 0
+
+            # En el formato anterior la primera linea puede ser un dato
+            for linea in (f if tabla.ancho_fijo else chain([primera], f)):
+                if tabla.ancho_fijo and len(linea) != ANCHO_REGISTRO:
+                    tabla.ancho_fijo = False  # Editado a mano: se convierte en la proxima escritura
+                partes = linea.decode('utf-8').strip().split('|')
+                if len(partes) >= 6 and partes[0] not in ("ID_EST", "ID_ESTUDIANTE"):
+                    tabla.agregar({
+                        "id": partes[0],
+                        "cod_curso": partes[1],
+                        "n1": partes[2],
+                        "n2": partes[3],
+                        "n3": partes[4],
+                        "promedio": partes[5]
+                    }, offset if tabla.ancho_fijo else None)
+                offset += len(linea)
+        return tabla
+
+    def convertir_notas_a_ancho_fijo(self):
+        """Convierte el archivo de notas del formato anterior al de ancho fijo."""
+        try:
+            convertir_a_ancho_fijo(self.archivo_notas)
+        except (IOError, ValueError) as e:
+            print(f"Error al convertir notas: {e}")
+            return False
+        self.invalidar_cache(self.archivo_notas)
+        return True
+
+    def _tabla_notas_ancho_fijo(self):
+        """
+        Retorna (tabla, firma) de las notas asegurando el formato de ancho fijo
+        (el anterior se convierte una sola vez), o (None, None) si no se pudo.
+        Llamar con _lock_notas y bloqueo tomados.
+        """
+        tabla = self._leer_tabla(self.archivo_notas, self._parsear_notas)
+        firma = self._cache[self.archivo_notas][0]
+        if not tabla.ancho_fijo or firma is None or firma[1] % ANCHO_REGISTRO != 0:
+            # Formato anterior (o archivo danado): se convierte una sola vez
+            if not self.convertir_notas_a_ancho_fijo():
+                return None, None
+            tabla = self._leer_tabla(self.archivo_notas, self._parsear_notas)
+            firma = self._cache[self.archivo_notas][0]
+        return tabla, firma
+
+    def _parsear_manifiesto_notas(self):
+        return leer_manifiesto(self.carpeta_notas_archivadas)
+
+    def _notas_archivadas(self):
+        """IndiceSegmentos {curso: {periodo: ruta}} de las notas de periodos archivados."""
+        return self._leer_tabla(self.manifiesto_notas_archivadas, self._parsear_manifiesto_notas)
+
+    def _iterar_notas_archivadas(self, cod_curso=None):
+        """
+        Notas de los periodos archivados (solo de `cod_curso`, si se indica),
+        leidas al vuelo de sus .gz. Solo se abren los archivos que tienen el curso.
+        """
+        for ruta in self._notas_archivadas().rutas(cod_curso):
+            with abrir(ruta, 'r', encoding='utf-8') as f:
+                next(f, None)  # Cabecera
+                for linea in f:
+                    partes = linea.strip().split('|')
+                    if len(partes) < 6:
+                        continue
+                    if cod_curso is not None and partes[1] != cod_curso:
+                        if partes[1] > cod_curso:
+                            break  # Ordenado por curso: ya no quedan notas del curso
+                        continue
+                    yield {"id": partes[0], "cod_curso": partes[1], "n1": partes[2], "n2": partes[3],
+                           "n3": partes[4], "promedio": partes[5]}
 
     def registrar_nota(self, id_est, cod_curso, n1, n2, n3):
         """
         Guarda o actualiza las notas (UPSERT).
-        Evita duplicados reemplazando la linea existente.
+        Si la clave ya existe su registro de ancho fijo se sobreescribe en el
+        lugar (un seek + write); si no, se agrega al final del archivo.
         """
+        if self._matricula_archivada(id_est, cod_curso):
+            print(f"Error al guardar nota: {id_est}/{cod_curso} es de un periodo archivado")
+            return False
         promedio = round((n1 + n2 + n3) / 3, 2)
-        notas_existentes = []
-        encontrado = False
-        
-        # 1. Leer todas
-        if os.path.exists(self.archivo_notas):
-            with open(self.archivo_notas, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parts = line.strip().split('|')
-                    if len(parts) >= 2:
-                        if parts[0] == id_est and parts[1] == cod_curso:
-                            # Reemplazamos esta linea con los nuevos datos
-                            linea_nueva = f"{id_est}|{cod_curso}|{n1}|{n2}|{n3}|{promedio}\n"
-                            notas_existentes.append(linea_nueva)
-                            encontrado = True
-                        else:
-                            notas_existentes.append(line) # Mantener original
-                            
-        # 2. Si no existia, agregar al final
-        if not encontrado:
-            linea_nueva = f"{id_est}|{cod_curso}|{n1}|{n2}|{n3}|{promedio}\n"
-            notas_existentes.append(linea_nueva)
-            
-        # 3. Reescribir archivo
+        fila = {"id": id_est, "cod_curso": cod_curso, "n1": formatear_nota(n1), "n2": formatear_nota(n2),
+                "n3": formatear_nota(n3), "promedio": formatear_nota(promedio)}
         try:
-            with open(self.archivo_notas, 'w', encoding='utf-8') as f:
-                f.writelines(notas_existentes)
-            return True
-        except IOError as e:
+            registro = formatear_registro(id_est, cod_curso, n1, n2, n3, promedio)
+        except ValueError as e:
             print(f"Error al guardar nota: {e}")
             return False
 
+        with self._lock_notas, self.bloqueo:
+            tabla, firma_previa = self._tabla_notas_ancho_fijo()
+            if tabla is None:
+                return False
+
+            offset = tabla.offsets.get((id_est, cod_curso))
+            existia = offset is not None
+            try:
+                if existia:
+                    with abrir(self.archivo_notas, 'r+b') as f:
+                        f.seek(offset)
+                        f.write(registro)
+                else:
+                    offset = firma_previa[1]
+                    with abrir(self.archivo_notas, 'ab') as f:
+                        f.write(registro)
+            except IOError as e:
+                print(f"Error al guardar nota: {e}")
+                return False
+
+            firma = self._firma_archivo(self.archivo_notas)
+            tamano_esperado = firma_previa[1] + (0 if existia else ANCHO_REGISTRO)
+            if firma is None or firma[1] != tamano_esperado:
+                self._cache.pop(self.archivo_notas, None)  # Otro proceso escribio: releer
+            else:
+                if existia:
+                    tabla.actualizar(fila)
+                else:
+                    tabla.agregar(fila, offset)
+                self._cache[self.archivo_notas] = (firma, tabla)
+            self._analitica = None
+        return True
+
+    def registrar_notas_lote(self, notas):
+        """
+        UPSERT de varias notas [(id_est, cod_curso, n1, n2, n3)] ya validadas
+        abriendo el archivo una sola vez: los registros existentes se
+        sobreescriben en su offset y los nuevos se agregan juntos al final.
+        Si una clave se repite gana la ultima. Retorna (exito, mensaje, cantidad).
+        """
+        por_clave = {}
+        for id_est, cod_curso, n1, n2, n3 in notas:
+            promedio = round((n1 + n2 + n3) / 3, 2)
+            fila = {"id": id_est, "cod_curso": cod_curso, "n1": formatear_nota(n1), "n2": formatear_nota(n2),
+                    "n3": formatear_nota(n3), "promedio": formatear_nota(promedio)}
+            try:
+                por_clave[(id_est, cod_curso)] = (fila, formatear_registro(id_est, cod_curso, n1, n2, n3, promedio))
+            except ValueError as e:
+                return False, str(e), 0
+        if not por_clave:
+            return True, "Sin cambios", 0
+        archivadas = [f"{i}/{c}" for i, c in por_clave if self._matricula_archivada(i, c)]
+        if archivadas:
+            return False, f"Notas de periodos archivados: {', '.join(archivadas)}", 0
+
+        with self._lock_notas, self.bloqueo:
+            tabla, firma_previa = self._tabla_notas_ancho_fijo()
+            if tabla is None:
+                return False, "No se pudo convertir el archivo de notas", 0
+
+            existentes = [(tabla.offsets[c], fila, reg) for c, (fila, reg) in por_clave.items() if c in tabla.offsets]
+            nuevas = [(fila, reg) for c, (fila, reg) in por_clave.items() if c not in tabla.offsets]
+            try:
+                with abrir(self.archivo_notas, 'r+b') as f:
+                    for offset, _, registro in sorted(existentes, key=lambda e: e[0]):
+                        f.seek(offset)
+                        f.write(registro)
+                    f.seek(firma_previa[1])
+                    f.write(b"".join(reg for _, reg in nuevas))
+            except IOError as e:
+                return False, str(e), 0
+
+            firma = self._firma_archivo(self.archivo_notas)
+            if firma is None or firma[1] != firma_previa[1] + len(nuevas) * ANCHO_REGISTRO:
+                self._cache.pop(self.archivo_notas, None)  # Otro proceso escribio: releer
+            else:
+                for _, fila, _ in existentes:
+                    tabla.actualizar(fila)
+                for i, (fila, _) in enumerate(nuevas):
+                    tabla.agregar(fila, firma_previa[1] + i * ANCHO_REGISTRO)
+                self._cache[self.archivo_notas] = (firma, tabla)
+            self._analitica = None
+        return True, "Notas registradas", len(por_clave)
+
     def obtener_notas_diccionario(self, cod_curso):
         """
         Retorna dictionario {(id_est): {n1, n2, n3, prom}} para acceso rapido O(1).
         """
         data = {}
-        if not os.path.exists(self.archivo_notas):
-            return data
-            
-        with open(self.archivo_notas, 'r', encoding='utf-8') as f:
-            for line in f:
-                parts = line.strip().split('|')
-                if len(parts) >= 6:
-                    # id|curso|n1|n2|n3|prom
-                    if parts[1] == cod_curso:
-                        data[parts[0]] = {
-                            "n1": float(parts[2]),
-                            "n2": float(parts[3]),
-                            "n3": float(parts[4]),
-                            "promedio": float(parts[5])
-                        }
+        activas = self._leer_tabla(self.archivo_notas, self._parsear_notas).por_curso.get(cod_curso, {}).values()
+        for n in chain(self._iterar_notas_archivadas(cod_curso), activas):
+            data[n['id']] = {
+                "n1": float(n['n1']),
+                "n2": float(n['n2']),
+                "n3": float(n['n3']),
+                "promedio": float(n['promedio'])
+            }
         return data
 
-    def obtener_todas_las_notas(self):
-        """Lee todo el archivo y retorna una lista de diccionarios, enriqueciendo con nombres."""
-        data = []
-        if not os.path.exists(self.archivo_notas):
-            return data
-            
+    def iterar_todas_las_notas(self, archivadas=True):
+        """
+        Generador de las notas enriquecidas con nombres: primero las de los
+        periodos archivados (si `archivadas`) y luego las de notas_db.txt, en
+        el orden del archivo. Permite recorrer (y exportar) todas las notas
+        sin armar la lista completa.
+        """
         # Mapeos para mostrar nombres en lugar de IDs
-        estudiantes = {e['id']: f"{e['nombre']} {e['apellido']}" for e in self.obtener_estudiantes()}
-        cursos = {c['codigo']: c['nombre'] for c in self.obtener_cursos()}
+        estudiantes = self.nombres_estudiantes()
+        cursos = self.nombres_cursos()
 
-        with open(self.archivo_notas, 'r', encoding='utf-8') as f:
-            for i, linea in enumerate(f):
-                if i == 0: continue # Saltar header (si lo tuviera, pero upsert escribe todo raw, ojo)
-                # EL upsert mantiene todo, pero si la primera vez se creo sin header... 
-                # Asumamos que el archivo NO tiene header explicito o lo tratamos por split
-                partes = linea.strip().split('|')
-                if len(partes) >= 6 and partes[0] != "ID_EST": # Ignorar header si existe
-                    id_est = partes[0]
-
-                    cod_curso = partes[1]
-                    
-                    data.append({
-                        "id": id_est,
-                        "nombre": estudiantes.get(id_est, id_est),
-                        "curso": cursos.get(cod_curso, cod_curso),
-                        "cod_curso": cod_curso,
-                        "n1": partes[2],
-                        "n2": partes[3],
-                        "n3": partes[4],
-                        "promedio": partes[5],
-                        "nota": partes[5] # Backward compatibility for Dashboard
-                    })
-        return data
+        activas = self._leer_tabla(self.archivo_notas, self._parsear_notas)
+        for n in (chain(self._iterar_notas_archivadas(), activas) if archivadas else activas):
+            yield {
+                "id": n['id'],
+                "nombre": estudiantes.get(n['id'], n['id']),
+                "curso": cursos.get(n['cod_curso'], n['cod_curso']),
+                "cod_curso": n['cod_curso'],
+                "n1": n['n1'],
+                "n2": n['n2'],
+                "n3": n['n3'],
+                "promedio": n['promedio'],
+                "nota": n['promedio'] # Backward compatibility for Dashboard
+            }
+
+    def obtener_todas_las_notas(self):
+        """Retorna todas las notas como lista de diccionarios, enriqueciendo con nombres."""
+        return list(self.iterar_todas_las_notas())
+
+    def analitica_notas(self):
+        """
+        AnaliticaNotas (data/analitica.py) con todas las notas en arreglos NumPy.
+        Se arma una vez y se reutiliza mientras no cambien las notas ni los
+        estudiantes (de quienes sale la carrera).
+        """
+        with self.bloqueo:
+            notas = self._leer_tabla(self.archivo_notas, self._parsear_notas)
+            estudiantes = self._leer_tabla(self.archivo_estudiantes, self._parsear_estudiantes)
+            archivadas = self._notas_archivadas()
+            firmas = (self._cache[self.archivo_notas][0], self._cache[self.archivo_estudiantes][0],
+                      self._cache[self.manifiesto_notas_archivadas][0])
+            if self._analitica is None or self._analitica[0] != firmas:
+                from .analitica import AnaliticaNotas  # NumPy solo se importa si se usan estadisticas
+                carreras = {e['id']: e['carrera'] for e in estudiantes}
+                filas = notas.filas + list(self._iterar_notas_archivadas()) if len(archivadas) else notas.filas
+                self._analitica = (firmas, AnaliticaNotas.desde_filas(filas, carreras))
+            return self._analitica[1]
@@ -0,0 +1,252 @@
+from .busqueda import IndiceBusqueda
+
+
+class IndiceAsistencias:
+    """
+    Registros vigentes de asistencia en memoria.
+    Indexa por clave compuesta (id_estudiante, codigo_curso, fecha) y por
+    (codigo_curso, fecha) para obtener el roster de un dia en una sola consulta.
+    """
+    def __init__(self):
+        self.registros = {}        # {(id, curso, fecha): fila}
+        self.por_curso_fecha = {}  # {(curso, fecha): {id: estado}}
+        self.lineas = 0            # Lineas del diario (incluye las superadas)
+
+    def __len__(self):
+        return len(self.registros)
+
+    def agregar(self, filas):
+        """Integra filas del diario (gana la ultima de cada clave)."""
+        for fila in filas:
+            self.registros[(fila['id'], fila['curso'], fila['fecha'])] = fila
+            self.por_curso_fecha.setdefault((fila['curso'], fila['fecha']), {})[fila['id']] = fila['estado']
+            self.lineas += 1
+
+    def estado(self, id_est, cod_curso, fecha):
+        fila = self.registros.get((id_est, cod_curso, fecha))
+        return fila['estado'] if fila else None
+
+    def del_curso_fecha(self, cod_curso, fecha):
+        """Retorna una copia de {id_estudiante: estado} para el curso y fecha."""
+        return dict(self.por_curso_fecha.get((cod_curso, fecha), {}))
+
+
+class IndiceSegmentos:
+    """
+    Manifiesto de archivos por curso: {codigo_curso: {clave: ruta}} para
+    elegir que archivos leer sin listar carpetas. La clave es el mes en los
+    segmentos de asistencia (data/segmentos.py) y el periodo en los archivos
+    archivados (data/archivado.py); varias claves pueden compartir archivo.
+    Las asistencias archivadas anotan ademas el rango de meses que cubren.
+    """
+    def __init__(self, filas=()):
+        self.por_curso = {}
+        self.meses = {}  # {(curso, clave): (primer_mes, ultimo_mes)} si la clave no es un mes
+        self.agregar(filas)
+
+    def __len__(self):
+        return sum(len(claves) for claves in self.por_curso.values())
+
+    def agregar(self, filas):
+        for fila in filas:
+            self.por_curso.setdefault(fila['curso'], {})[fila['clave']] = fila['ruta']
+            if 'meses' in fila:
+                self.meses[(fila['curso'], fila['clave'])] = fila['meses']
+
+    def ruta(self, cod_curso, clave):
+        return self.por_curso.get(cod_curso, {}).get(clave)
+
+    def rutas(self, cod_curso=None, desde=None, hasta=None):
+        """
+        Rutas del curso (o de todos) en orden de curso y clave, sin repetir.
+        `desde` y `hasta` (fechas AAAA-MM-DD, opcionales) dejan solo los
+        archivos con meses entre los de esas fechas.
+        """
+        cursos = sorted(self.por_curso) if cod_curso is None else [cod_curso]
+        rutas = []
+        for curso in cursos:
+            for clave, ruta in sorted(self.por_curso.get(curso, {}).items()):
+                primero, ultimo = self.meses.get((curso, clave), (clave, clave))
+                if (desde is None or ultimo >= desde[:7]) and (hasta is None or primero <= hasta[:7]):
+                    rutas.append(ruta)
+        return list(dict.fromkeys(rutas))  # Dos codigos pueden compartir archivo si difieren en simbolos
+
+
+def nombre_completo(est):
+    return f"{est['nombre']} {est['apellido']}"
+
+
+class IndiceEstudiantes:
+    """
+    Estudiantes en el orden del archivo, indexados por ID.
+    Se puede iterar como la lista de filas. El indice de busqueda se arma
+    la primera vez que se pide y luego se mantiene con cada cambio.
+    `nombres` ({id: "nombre apellido"}) es el mapeo que usan los cruces
+    (matriculas, notas, reportes) para mostrar nombres en lugar de IDs.
+    """
+    CAMPOS_BUSQUEDA = ("id", "nombre", "apellido", "carrera", "correo")
+
+    def __init__(self, filas=()):
+        self.filas = []
+        self.por_id = {}
+        self.nombres = {}
+        self.max_id = None  # Mayor ID numerico visto
+        self._busqueda = None
+        self.agregar(filas)
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def agregar(self, filas):
+        filas = list(filas)
+        for est in filas:
+            self.filas.append(est)
+            self.por_id[est['id']] = est
+            self.nombres[est['id']] = nombre_completo(est)
+            if est['id'].isdigit() and (self.max_id is None or int(est['id']) > self.max_id):
+                self.max_id = int(est['id'])
+        if self._busqueda is not None:
+            self._busqueda.agregar(filas)
+
+    def actualizar(self, est):
+        """Reemplaza los datos de un estudiante existente sin cambiar su posicion."""
+        self.por_id[est['id']].update(est)
+        self.nombres[est['id']] = nombre_completo(self.por_id[est['id']])
+        if self._busqueda is not None:
+            self._busqueda.actualizar(self.por_id[est['id']])
+
+    def quitar(self, id_est):
+        self.filas = [e for e in self.filas if e['id'] != id_est]
+        self.por_id.pop(id_est, None)
+        self.nombres.pop(id_est, None)
+        if self._busqueda is not None:
+            self._busqueda.quitar(id_est)
+
+    def obtener(self, id_est):
+        return self.por_id.get(id_est)
+
+    def buscador(self):
+        if self._busqueda is None:
+            self._busqueda = IndiceBusqueda(self.CAMPOS_BUSQUEDA, 'id')
+            self._busqueda.agregar(self.filas)
+        return self._busqueda
+
+
+class IndiceCursos:
+    """
+    Cursos en el orden del archivo, indexados por codigo (con indice de
+    busqueda perezoso) y con el mapeo `nombres` ({codigo: nombre}) para los cruces.
+    """
+    CAMPOS_BUSQUEDA = ("codigo", "nombre", "profesor")
+
+    def __init__(self, filas=()):
+        self.filas = []
+        self.por_codigo = {}
+        self.nombres = {}
+        self._busqueda = None
+        self.agregar(filas)
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def agregar(self, filas):
+        filas = list(filas)
+        for c in filas:
+            self.filas.append(c)
+            self.por_codigo[c['codigo']] = c
+            self.nombres[c['codigo']] = c['nombre']
+        if self._busqueda is not None:
+            self._busqueda.agregar(filas)
+
+    def actualizar(self, curso):
+        self.por_codigo[curso['codigo']].update(curso)
+        self.nombres[curso['codigo']] = self.por_codigo[curso['codigo']]['nombre']
+        if self._busqueda is not None:
+            self._busqueda.actualizar(self.por_codigo[curso['codigo']])
+
+    def quitar(self, codigo):
+        self.filas = [c for c in self.filas if c['codigo'] != codigo]
+        self.por_codigo.pop(codigo, None)
+        self.nombres.pop(codigo, None)
+        if self._busqueda is not None:
+            self._busqueda.quitar(codigo)
+
+    def obtener(self, codigo):
+        return self.por_codigo.get(codigo)
+
+    def buscador(self):
+        if self._busqueda is None:
+            self._busqueda = IndiceBusqueda(self.CAMPOS_BUSQUEDA, 'codigo')
+            self._busqueda.agregar(self.filas)
+        return self._busqueda
+
+
+class IndiceMatriculas:
+    """
+    Matriculas crudas con dos indices en memoria:
+    el conjunto de pares (id_est, cod_curso) para detectar duplicados en O(1)
+    y la lista de IDs por curso para armar rosters sin recorrer todo.
+    """
+    def __init__(self, filas=()):
+        self.filas = []
+        self.pares = set()
+        self.por_curso = {}  # {cod_curso: [id_est, ...]} en orden de matricula
+        self.agregar(filas)
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def agregar(self, filas):
+        for m in filas:
+            self.filas.append(m)
+            par = (m['id_est'], m['cod_curso'])
+            if par not in self.pares:
+                self.pares.add(par)
+                self.por_curso.setdefault(m['cod_curso'], []).append(m['id_est'])
+
+    def existe(self, id_est, cod_curso):
+        return (id_est, cod_curso) in self.pares
+
+    def ids_curso(self, cod_curso):
+        return self.por_curso.get(cod_curso, [])
+
+
+class IndiceNotas:
+    """
+    Notas en memoria indexadas por (id_est, cod_curso) y por curso.
+    En archivos de ancho fijo guarda ademas el offset en bytes de cada
+    registro, para actualizarlo en el lugar.
+    """
+    def __init__(self):
+        self.filas = []       # Orden del archivo
+        self.por_clave = {}   # {(id_est, cod_curso): fila}
+        self.por_curso = {}   # {cod_curso: {id_est: fila}}
+        self.offsets = {}     # {(id_est, cod_curso): offset}
+        self.ancho_fijo = False
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def agregar(self, fila, offset=None):
+        clave = (fila['id'], fila['cod_curso'])
+        self.filas.append(fila)
+        self.por_clave[clave] = fila
+        self.por_curso.setdefault(fila['cod_curso'], {})[fila['id']] = fila
+        if offset is not None:
+            self.offsets[clave] = offset
+
+    def actualizar(self, fila):
+        """Reemplaza los valores de una clave existente sin cambiar su posicion."""
+        self.por_clave[(fila['id'], fila['cod_curso'])].update(fila)
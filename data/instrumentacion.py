@@ -0,0 +1,226 @@
+"""
+Instrumentacion opcional de tiempos para diagnosticar lentitud.
+
+Se activa con REGISTRO_INSTRUMENTACION=1 (o `activar()`, o `cli.py --metricas`).
+Con la instrumentacion activa:
+    - cada metodo publico de DataManager / SQLiteDataManager se mide
+      (ver `instrumentar`, llamado al crear la instancia)
+    - cada vez que un archivo se vuelve a parsear se registra "parseo:<archivo>"
+      con las filas obtenidas; esas filas tambien se suman a todas las
+      llamadas en curso en ese hilo (la consulta de la ventana y el metodo de
+      DataManager que provocaron la lectura)
+    - CargadorDatos mide cada carga de las ventanas (views/trabajadores.py)
+
+Por cada nombre se guarda: llamadas, tiempo total/min/max, histograma de
+latencias (tramos LIMITES_MS) y filas parseadas. Se ve en el panel de
+depuracion (Ctrl+Shift+D en el dashboard) y se vuelca a JSON con `volcar`
+o, al salir, en REGISTRO_INSTRUMENTACION_JSON.
+
+Desactivada no se envuelve ningun metodo: el unico costo es comprobar un
+booleano cuando un archivo se parsea (lo que ya cuesta milisegundos).
+"""
+import atexit
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# Limites superiores (ms) de los tramos del histograma; el ultimo tramo es "mas de 5000"
+LIMITES_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_activa = False
+
+
+class Estadistica:
+    """Acumulado de las llamadas de un mismo nombre."""
+    __slots__ = ("llamadas", "total_ms", "min_ms", "max_ms", "histograma", "filas")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.histograma = [0] * (len(LIMITES_MS) + 1)
+        self.filas = 0
+
+    def agregar(self, ms, filas):
+        self.llamadas += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.histograma[bisect_left(LIMITES_MS, ms)] += 1
+        self.filas += filas
+
+    def percentil(self, q):
+        """Limite superior del tramo que contiene el percentil q (aproximado por el histograma)."""
+        objetivo = self.llamadas * q / 100
+        acumulado = 0
+        for i, conteo in enumerate(self.histograma):
+            acumulado += conteo
+            if conteo and acumulado >= objetivo:
+                return LIMITES_MS[i] if i < len(LIMITES_MS) else self.max_ms
+        return 0.0
+
+    def como_dict(self):
+        return {
+            "llamadas": self.llamadas,
+            "total_ms": round(self.total_ms, 3),
+            "media_ms": round(self.total_ms / self.llamadas, 3) if self.llamadas else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "histograma": self.histograma[:],
+            "filas_parseadas": self.filas,
+            "filas_por_llamada": round(self.filas / self.llamadas, 1) if self.llamadas else 0.0,
+        }
+
+
+class _Marco:
+    """Una llamada medida en curso (se compara por identidad al sacarla de la pila)."""
+    __slots__ = ("filas",)
+
+    def __init__(self):
+        self.filas = 0
+
+
+class Metricas:
+    """Registro de estadisticas por nombre; se puede usar desde cualquier hilo."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._estadisticas = {}
+        self._local = threading.local()
+
+    def _pila(self):
+        """Llamadas medidas en curso en este hilo (_Marco)."""
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    def registrar(self, nombre, segundos, filas=0):
+        with self._lock:
+            estadistica = self._estadisticas.get(nombre)
+            if estadistica is None:
+                estadistica = self._estadisticas[nombre] = Estadistica()
+            estadistica.agregar(segundos * 1000, filas)
+
+    def sumar_filas(self, filas):
+        """Atribuye `filas` parseadas a todas las llamadas en curso del hilo."""
+        for marco in self._pila():
+            marco.filas += filas
+
+    @contextmanager
+    def medir(self, nombre):
+        pila = self._pila()
+        marco = _Marco()
+        pila.append(marco)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            pila.remove(marco)
+            self.registrar(nombre, segundos, marco.filas)
+
+    def envolver(self, nombre, funcion):
+        """`funcion` medida bajo `nombre`. En los generadores se mide solo el tiempo dentro del generador."""
+        if inspect.isgeneratorfunction(funcion):
+            @wraps(funcion)
+            def envoltura_generador(*args, **kwargs):
+                iterador = funcion(*args, **kwargs)
+                pila = self._pila()
+                marco = _Marco()
+                total = 0.0
+                try:
+                    while True:
+                        pila.append(marco)
+                        inicio = time.perf_counter()
+                        try:
+                            valor = next(iterador)
+                        except StopIteration:
+                            return
+                        finally:
+                            total += time.perf_counter() - inicio
+                            pila.remove(marco)
+                        yield valor
+                finally:
+                    # Tambien si el consumidor deja de iterar antes (islice, vista previa)
+                    self.registrar(nombre, total, marco.filas)
+            return envoltura_generador
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with self.medir(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+    def instantanea(self):
+        """{nombre: estadisticas} ordenado por tiempo total, de mayor a menor."""
+        with self._lock:
+            datos = {nombre: e.como_dict() for nombre, e in self._estadisticas.items()}
+        return dict(sorted(datos.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def reiniciar(self):
+        with self._lock:
+            self._estadisticas.clear()
+
+
+metricas = Metricas()
+
+
+def activa():
+    return _activa
+
+
+def activar(volcar_en=None):
+    """Activa la instrumentacion (para instancias creadas desde ahora). Si `volcar_en`, guarda el JSON al salir."""
+    global _activa
+    _activa = True
+    if volcar_en:
+        atexit.register(volcar, volcar_en)
+
+
+def instrumentar(objeto):
+    """Reemplaza en la instancia cada metodo publico por su version medida ("Clase.metodo")."""
+    if not _activa:
+        return objeto
+    prefijo = type(objeto).__name__
+    for nombre, metodo in inspect.getmembers(objeto, inspect.ismethod):
+        if not nombre.startswith("_"):
+            setattr(objeto, nombre, metricas.envolver(f"{prefijo}.{nombre}", metodo))
+    return objeto
+
+
+def registrar(nombre, segundos, filas=0):
+    if _activa:
+        metricas.registrar(nombre, segundos, filas)
+
+
+def registrar_parseo(archivo, segundos, filas):
+    """Lo llama DataManager cada vez que parsea un archivo completo."""
+    if _activa:
+        metricas.registrar(f"parseo:{os.path.basename(archivo)}", segundos, filas)
+        metricas.sumar_filas(filas)
+
+
+def volcar(ruta):
+    """Guarda las metricas en `ruta` (JSON)."""
+    datos = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "limites_histograma_ms": list(LIMITES_MS),
+        "metricas": metricas.instantanea(),
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return ruta
+
+
+if os.environ.get("REGISTRO_INSTRUMENTACION") == "1":
+    activar(os.environ.get("REGISTRO_INSTRUMENTACION_JSON"))
@@ -0,0 +1,151 @@
+"""
+Migrador de los archivos .txt (pipe-delimited) al backend SQLite.
+
+Uso:
+    python -m data.migrador [registro.db]
+
+Lee cada archivo linea por linea (sin cargarlo completo en memoria) y lo
+inserta en lotes. Si un registro aparece repetido gana la ultima linea,
+igual que en el diario de asistencias. Los archivos .gz de los periodos
+archivados (data/archivado.py) se leen descomprimiendolos al vuelo.
+"""
+import os
+import sys
+from itertools import chain, islice
+
+from .contabilidad_io import abrir
+from .particiones import PERIODO_POR_DEFECTO, listar_particiones
+from .segmentos import ARCHIVADOS, leer_manifiesto
+from .sqlite_manager import SQLiteDataManager
+
+TAMANO_LOTE = 5000
+
+
+def _leer_filas(archivo, columnas_minimas):
+    """Genera las lineas del archivo partidas por '|', saltando cabeceras y lineas cortas."""
+    if not os.path.exists(archivo):
+        return
+    with abrir(archivo, 'r', encoding='utf-8') as f:
+        for linea in f:
+            partes = linea.strip().split('|')
+            if len(partes) < columnas_minimas or not partes[0]:
+                continue
+            if partes[0] in ("ID", "ID_EST", "ID_ESTUDIANTE", "CODIGO"):
+                continue  # Cabecera
+            yield partes
+
+
+def _filas_estudiantes(archivo):
+    for p in _leer_filas(archivo, 1):
+        activo = 1 if (len(p) < 7 or p[6] == "1") else 0
+        p = p + [""] * (7 - len(p))
+        yield (p[0], p[1], p[2], p[3], p[4], p[5], activo)
+
+
+def _filas_cursos(archivo):
+    for p in _leer_filas(archivo, 1):
+        p = p + [""] * (4 - len(p))
+        yield (p[0], p[1], p[2], p[3])
+
+
+def _filas_matriculas(archivo, periodo_cerrado=None):
+    # Las filas antiguas solo tienen ID|CURSO|FECHA: se completan con los valores por defecto
+    for p in _leer_filas(archivo, 3):
+        if periodo_cerrado is not None:
+            p.insert(3, periodo_cerrado)  # Los archivos cerrados no tienen la columna del periodo
+        periodo = p[3] if len(p) > 3 else PERIODO_POR_DEFECTO
+        estado = p[4] if len(p) > 4 else "Matriculado"
+        yield (p[0], p[1], p[2], periodo, estado)
+
+
+def _filas_matriculas_particionadas(carpeta, archivo_anterior):
+    """Filas de todas las particiones de `carpeta` (o del archivo unico anterior si no se migro)."""
+    if not os.path.isdir(carpeta):
+        yield from _filas_matriculas(archivo_anterior)
+        return
+    for periodo, (ruta, cerrado) in listar_particiones(carpeta).items():
+        yield from _filas_matriculas(ruta, periodo if cerrado else None)
+
+
+def _filas_notas(archivo):
+    for p in _leer_filas(archivo, 6):
+        try:
+            yield (p[0], p[1], float(p[2]), float(p[3]), float(p[4]), float(p[5]))
+        except ValueError:
+            continue  # Linea corrupta
+
+
+def _filas_notas_con_archivadas(archivo, carpeta_archivadas):
+    """Filas de notas_db.txt seguidas de las de los periodos archivados."""
+    rutas = leer_manifiesto(carpeta_archivadas).rutas()
+    return chain(chain.from_iterable(map(_filas_notas, rutas)), _filas_notas(archivo))
+
+
+def _filas_asistencias(archivo):
+    for p in _leer_filas(archivo, 4):
+        yield (p[0], p[1], p[2], p[3])
+
+
+def _filas_asistencias_segmentadas(carpeta, archivo_anterior):
+    """
+    Filas de los periodos archivados y de todos los segmentos de `carpeta`
+    (o del diario unico anterior si no se migro).
+    """
+    if not os.path.isdir(carpeta):
+        yield from _filas_asistencias(archivo_anterior)
+        return
+    for ruta in chain(leer_manifiesto(carpeta, ARCHIVADOS).rutas(), leer_manifiesto(carpeta).rutas()):
+        yield from _filas_asistencias(ruta)
+
+
+def _insertar_en_lotes(db, sql, filas):
+    total = 0
+    while True:
+        lote = list(islice(filas, TAMANO_LOTE))
+        if not lote:
+            return total
+        db._escribir_muchos(sql, lote)
+        total += len(lote)
+
+
+def migrar_txt_a_sqlite(archivo_db="registro.db", archivo_notas="notas_db.txt",
+                        archivo_estudiantes="estudiantes.txt", archivo_cursos="cursos.txt",
+                        archivo_matriculas="matriculas.txt", archivo_asistencias="asistencias.txt",
+                        carpeta_matriculas="matriculas", carpeta_asistencias="asistencias",
+                        carpeta_notas_archivadas="notas_archivadas"):
+    """
+    Copia todos los archivos .txt a la base SQLite indicada.
+    Retorna un diccionario {tabla: filas_leidas}.
+    """
+    db = SQLiteDataManager(archivo_db)
+    resumen = {}
+    try:
+        resumen["estudiantes"] = _insertar_en_lotes(
+            db, "INSERT OR REPLACE INTO estudiantes (id, nombre, apellido, carrera, nacimiento, correo, activo) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _filas_estudiantes(archivo_estudiantes))
+        resumen["cursos"] = _insertar_en_lotes(
+            db, "INSERT OR REPLACE INTO cursos (codigo, nombre, profesor, creditos) VALUES (?, ?, ?, ?)",
+            _filas_cursos(archivo_cursos))
+        resumen["matriculas"] = _insertar_en_lotes(
+            db, "INSERT OR REPLACE INTO matriculas (id_est, cod_curso, fecha, periodo, estado) VALUES (?, ?, ?, ?, ?)",
+            _filas_matriculas_particionadas(carpeta_matriculas, archivo_matriculas))
+        db._escribir_muchos("INSERT OR IGNORE INTO periodos_cerrados (periodo) VALUES (?)",
+                            [(p,) for p, (_, cerrado) in listar_particiones(carpeta_matriculas).items() if cerrado])
+        resumen["notas"] = _insertar_en_lotes(
+            db, "INSERT OR REPLACE INTO notas (id_est, cod_curso, n1, n2, n3, promedio) VALUES (?, ?, ?, ?, ?, ?)",
+            _filas_notas_con_archivadas(archivo_notas, carpeta_notas_archivadas))
+        resumen["asistencias"] = _insertar_en_lotes(
+            db, "INSERT OR REPLACE INTO asistencias (id_est, cod_curso, fecha, estado) VALUES (?, ?, ?, ?)",
+            _filas_asistencias_segmentadas(carpeta_asistencias, archivo_asistencias))
+        # La secuencia de IDs se reconstruye desde los estudiantes importados
+        db._escribir("DELETE FROM secuencias WHERE nombre = 'estudiantes'")
+    finally:
+        db.cerrar()
+    return resumen
+
+
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else "registro.db"
+    for tabla, cantidad in migrar_txt_a_sqlite(destino).items():
+        print(f"{tabla}: {cantidad} filas")
@@ -0,0 +1,97 @@
+"""
+Formato de ancho fijo para el archivo de notas.
+
+Cada registro (y la cabecera) ocupa exactamente ANCHO_REGISTRO bytes:
+    ID|CURSO|N1|N2|N3|PROMEDIO<espacios>\\n
+Como las lineas siguen separadas por '|', los lectores que hacen
+strip().split('|') funcionan igual; pero ahora el registro de una clave
+vive en un offset conocido y se puede actualizar en el lugar con un
+solo seek + write.
+
+Conversion del formato anterior:
+    python -m data.notas_fijas [notas_db.txt]
+"""
+import os
+import sys
+
+from .contabilidad_io import abrir
+
+ANCHO_REGISTRO = 80
+CABECERA = "ID_ESTUDIANTE|CODIGO_CURSO|NOTA1|NOTA2|NOTA3|PROMEDIO"
+
+
+def _rellenar(texto):
+    datos = texto.encode('utf-8')
+    if len(datos) > ANCHO_REGISTRO - 1:
+        raise ValueError(f"El registro excede {ANCHO_REGISTRO - 1} bytes: {texto}")
+    return datos + b" " * (ANCHO_REGISTRO - 1 - len(datos)) + b"\n"
+
+
+CABECERA_BYTES = _rellenar(CABECERA)
+
+
+def formatear_nota(valor):
+    """Texto corto y estable para una nota (max. 2 decimales)."""
+    return str(round(float(valor), 2))
+
+
+def formatear_registro(id_est, cod_curso, n1, n2, n3, promedio):
+    """Retorna los bytes del registro, exactamente ANCHO_REGISTRO de largo."""
+    return _rellenar("|".join([id_est, cod_curso, formatear_nota(n1), formatear_nota(n2),
+                               formatear_nota(n3), formatear_nota(promedio)]))
+
+
+def es_cabecera_fija(linea):
+    """True si `linea` (bytes) es la cabecera del formato de ancho fijo."""
+    return linea == CABECERA_BYTES
+
+
+def convertir_a_ancho_fijo(archivo):
+    """
+    Reescribe `archivo` en formato de ancho fijo.
+    Si una clave (id, curso) aparece repetida se conserva su primera
+    posicion con los valores de la ultima linea. Retorna la cantidad de registros.
+    """
+    registros = {}
+    if os.path.exists(archivo):
+        with abrir(archivo, 'r', encoding='utf-8') as f:
+            for linea in f:
+                partes = linea.strip().split('|')
+                if len(partes) < 6 or partes[0] in ("ID_EST", "ID_ESTUDIANTE"):
+                    continue
+                try:
+                    registros[(partes[0], partes[1])] = [float(p) for p in partes[2:6]]
+                except ValueError:
+                    continue  # Linea corrupta
+
+    temporal = archivo + ".tmp"
+    with abrir(temporal, 'wb') as f:
+        f.write(CABECERA_BYTES)
+        for (id_est, cod_curso), notas in registros.items():
+            f.write(formatear_registro(id_est, cod_curso, *notas))
+    os.replace(temporal, archivo)
+    return len(registros)
+
+
+def quitar_registros(archivo, claves):
+    """
+    Reescribe `archivo` (ya en ancho fijo) sin los registros de `claves`
+    {(id, curso)}; los demas se copian tal cual. Retorna la cantidad quitada.
+    """
+    quitados = 0
+    temporal = archivo + ".tmp"
+    with abrir(archivo, 'rb') as origen, abrir(temporal, 'wb') as destino:
+        destino.write(origen.read(ANCHO_REGISTRO))  # Cabecera
+        for registro in iter(lambda: origen.read(ANCHO_REGISTRO), b""):
+            partes = registro.decode('utf-8').split('|', 2)
+            if len(partes) > 2 and (partes[0], partes[1]) in claves:
+                quitados += 1
+                continue
+            destino.write(registro)
+    os.replace(temporal, archivo)
+    return quitados
+
+
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else "notas_db.txt"
+    print(f"{convertir_a_ancho_fijo(destino)} registros convertidos en {destino}")
@@ -0,0 +1,139 @@
+"""
+Matriculas particionadas por periodo.
+
+    matriculas/
+        2025-1.txt            periodo abierto: ID|CURSO|FECHA|PERIODO|ESTADO
+                              (el mismo formato del matriculas.txt anterior)
+        2024-2.cerrado.txt    periodo cerrado: archivo compacto de solo lectura,
+                              ID|CURSO|FECHA|ESTADO ordenado por curso e ID
+                              (el periodo va en el nombre)
+        2023-2.cerrado.txt.gz periodo archivado: el cerrado, comprimido
+                              (ver data/archivado.py)
+
+Una consulta de un periodo lee solo su archivo; sin periodo se leen todos.
+Al cerrar un periodo (`DataManager.cerrar_periodo`) su archivo abierto se
+reemplaza por el cerrado y ya no admite escrituras.
+
+Migracion del matriculas.txt anterior (DataManager la hace sola al iniciar
+si no existe la carpeta; el archivo original queda como matriculas.txt.migrado):
+    python -m data.particiones [matriculas.txt] [matriculas]
+"""
+import os
+import re
+import shutil
+import stat
+import sys
+
+from .contabilidad_io import SUFIJO_COMPRIMIDO, abrir
+
+CABECERA_ABIERTA = "ID_ESTUDIANTE|CODIGO_CURSO|FECHA|PERIODO|ESTADO\n"
+CABECERA_CERRADA = "ID_ESTUDIANTE|CODIGO_CURSO|FECHA|ESTADO\n"
+SUFIJO_CERRADO = ".cerrado"
+PERIODO_POR_DEFECTO = "2024-1"  # Filas antiguas sin periodo (igual que al parsear)
+PATRON_PARTICION = re.compile(r"^([\w-]+?)(\.cerrado)?\.txt(\.gz)?$")
+
+
+def nombre_particion(periodo):
+    """Nombre de archivo seguro para `periodo` (los periodos validos AAAA-N quedan igual)."""
+    return re.sub(r"[^\w-]", "_", periodo) or "_"
+
+
+def ruta_particion(carpeta, periodo, cerrado=False):
+    return os.path.join(carpeta, nombre_particion(periodo) + (SUFIJO_CERRADO if cerrado else "") + ".txt")
+
+
+def listar_particiones(carpeta):
+    """
+    {periodo: (ruta, cerrado)} ordenado por periodo; los archivados (.gz)
+    cuentan como cerrados. Si un periodo tiene varios archivos (cierre o
+    archivado interrumpido) vale el mas avanzado, que ya esta completo.
+    """
+    particiones, etapas = {}, {}
+    try:
+        entradas = os.listdir(carpeta)
+    except FileNotFoundError:
+        return particiones
+    for nombre in entradas:
+        coincidencia = PATRON_PARTICION.match(nombre)
+        if coincidencia is None:
+            continue
+        periodo, cerrado, comprimido = (coincidencia.group(1), coincidencia.group(2) is not None,
+                                        coincidencia.group(3) is not None)
+        if comprimido and not cerrado:
+            continue  # Solo se archivan periodos cerrados
+        etapa = cerrado + comprimido
+        if etapa >= etapas.get(periodo, 0):
+            particiones[periodo] = (os.path.join(carpeta, nombre), cerrado)
+            etapas[periodo] = etapa
+    return dict(sorted(particiones.items()))
+
+
+def periodo_de_linea(linea):
+    """Periodo de una linea de matriculas en formato abierto (None si la linea no es una matricula)."""
+    partes = linea.strip().split('|')
+    if len(partes) < 3:
+        return None
+    return partes[3] if len(partes) > 3 else PERIODO_POR_DEFECTO
+
+
+def particionar_matriculas(archivo, carpeta):
+    """
+    Reparte las lineas de `archivo` (formato anterior, un solo archivo) en un
+    archivo por periodo dentro de `carpeta`, que no debe existir. Las lineas
+    se copian tal cual. Se escribe en una carpeta temporal que luego se
+    renombra: si se interrumpe, `carpeta` no queda a medias.
+    Retorna {periodo: cantidad}.
+    """
+    temporal = carpeta + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    abiertos, conteos = {}, {}
+    try:
+        with abrir(archivo, 'r', encoding='utf-8') as f:
+            next(f, None)  # Cabecera
+            for linea in f:
+                periodo = periodo_de_linea(linea)
+                if periodo is None:
+                    continue
+                destino = abiertos.get(periodo)
+                if destino is None:
+                    destino = abiertos[periodo] = abrir(ruta_particion(temporal, periodo), 'w', encoding='utf-8')
+                    destino.write(CABECERA_ABIERTA)
+                    conteos[periodo] = 0
+                destino.write(linea if linea.endswith("\n") else linea + "\n")
+                conteos[periodo] += 1
+    finally:
+        for destino in abiertos.values():
+            destino.close()
+    os.replace(temporal, carpeta)
+    return dict(sorted(conteos.items()))
+
+
+def escribir_cerrada(carpeta, periodo, filas, comprimido=False):
+    """
+    Escribe el archivo cerrado de `periodo` con `filas` (dicts de matricula),
+    lo deja de solo lectura y elimina el archivo abierto. Retorna su ruta.
+    Con `comprimido` escribe el .gz de un periodo archivado (data/archivado.py).
+    """
+    ruta = ruta_particion(carpeta, periodo, cerrado=True) + (SUFIJO_COMPRIMIDO if comprimido else "")
+    temporal = ruta + ".tmp"
+    with abrir(temporal, 'w', encoding='utf-8') as f:
+        f.write(CABECERA_CERRADA)
+        f.writelines(f"{m['id_est']}|{m['cod_curso']}|{m['fecha']}|{m['estado']}\n"
+                     for m in sorted(filas, key=lambda m: (m['cod_curso'], m['id_est'])))
+    os.chmod(temporal, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(temporal, ruta)
+    abierta = ruta_particion(carpeta, periodo)
+    if os.path.exists(abierta):
+        os.remove(abierta)
+    return ruta
+
+
+if __name__ == "__main__":
+    origen = sys.argv[1] if len(sys.argv) > 1 else "matriculas.txt"
+    destino = sys.argv[2] if len(sys.argv) > 2 else "matriculas"
+    if os.path.exists(destino):
+        sys.exit(f"{destino} ya existe")
+    for periodo, cantidad in particionar_matriculas(origen, destino).items():
+        print(f"{periodo}: {cantidad} matriculas")
+    os.replace(origen, origen + ".migrado")
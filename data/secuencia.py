@@ -0,0 +1,75 @@
+import os
+
+from .contabilidad_io import abrir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class SecuenciaIds:
+    """
+    Secuencia persistente de IDs numericos (high-water mark).
+
+    El archivo guarda el ultimo ID entregado, por lo que asignar uno nuevo es
+    O(1) y nunca se reutilizan IDs de estudiantes eliminados. Cada asignacion
+    bloquea el archivo, asi dos procesos no pueden entregar el mismo ID.
+    Si el archivo falta o esta corrupto se reconstruye con `reconstruir()`,
+    que retorna el ID maximo presente en los datos.
+    """
+    def __init__(self, archivo, reconstruir, inicial=2024001):
+        self.archivo = archivo
+        self._reconstruir = reconstruir
+        self.inicial = inicial
+
+    def _bloquear(self, f):
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _desbloquear(self, f):
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def reservar(self, cantidad=1, minimo=None):
+        """
+        Reserva `cantidad` IDs consecutivos y retorna el primero (int).
+        `minimo` es el mayor ID que se sabe presente en los datos: la
+        secuencia nunca entrega un valor menor o igual a el.
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad de IDs a reservar debe ser positiva")
+
+        # 'a+' crea el archivo si no existe sin truncarlo
+        with abrir(self.archivo, 'a+', encoding='utf-8') as f:
+            self._bloquear(f)
+            try:
+                f.seek(0)
+                contenido = f.read().strip()
+                if contenido.isdigit():
+                    ultimo = int(contenido)
+                else:
+                    maximo = self._reconstruir()
+                    ultimo = maximo if maximo is not None else self.inicial - 1
+                if minimo is not None and minimo > ultimo:
+                    ultimo = minimo
+
+                primero = ultimo + 1
+                f.seek(0)
+                f.truncate()
+                f.write(str(ultimo + cantidad))
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                self._desbloquear(f)
+        return primero
+
+    def siguiente(self, minimo=None):
+        return str(self.reservar(1, minimo))
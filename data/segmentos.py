@@ -0,0 +1,155 @@
+"""
+Asistencias segmentadas por curso y mes.
+
+    asistencias/
+        manifiesto.txt        CODIGO_CURSO|MES|ARCHIVO: un segmento por linea
+        CUR-001/2025-12.txt   diario de asistencias del curso en el mes:
+                              ID|CURSO|FECHA|ESTADO (el formato del
+                              asistencias.txt anterior, gana la ultima linea)
+        archivados.txt        CODIGO_CURSO|PERIODO|ARCHIVO|DESDE|HASTA: las
+                              asistencias de un periodo archivado y sus meses
+        CUR-001/2024-2.txt.gz asistencias del curso de las matriculas del
+                              periodo archivado (ver data/archivado.py)
+
+Una consulta de un curso, o acotada por fechas, lee los manifiestos y solo
+los segmentos (y archivados) de ese curso y esos meses. Registrar la
+asistencia de un dia anexa al segmento de su curso y mes; el manifiesto
+solo se escribe cuando se crea un segmento nuevo.
+
+Migracion del asistencias.txt anterior (DataManager la hace sola al iniciar
+si no existe la carpeta; el archivo original queda como asistencias.txt.migrado):
+    python -m data.segmentos [asistencias.txt] [asistencias]
+"""
+import os
+import re
+import shutil
+import sys
+
+from .contabilidad_io import SUFIJO_COMPRIMIDO, abrir
+from .indices import IndiceSegmentos
+from .particiones import nombre_particion
+
+CABECERA_ASISTENCIAS = "ID_ESTUDIANTE|CODIGO_CURSO|FECHA|ESTADO\n"
+CABECERA_MANIFIESTO = "CODIGO_CURSO|MES|ARCHIVO\n"
+MANIFIESTO = "manifiesto.txt"
+ARCHIVADOS = "archivados.txt"
+CABECERA_ARCHIVADOS = "CODIGO_CURSO|PERIODO|ARCHIVO|DESDE|HASTA\n"
+MES_SIN_FECHA = "sin-fecha"  # Filas cuya fecha no empieza con AAAA-MM
+LINEAS_EN_MEMORIA = 100_000  # Al migrar, lineas acumuladas antes de escribirlas a sus segmentos
+
+
+def mes_de_fecha(fecha):
+    """Mes AAAA-MM de una fecha AAAA-MM-DD."""
+    return fecha[:7] if re.match(r"\d{4}-\d{2}", fecha) else MES_SIN_FECHA
+
+
+def archivo_segmento(cod_curso, mes):
+    """Ruta del segmento relativa a la carpeta (la que se anota en el manifiesto)."""
+    return f"{nombre_particion(cod_curso)}/{nombre_particion(mes)}.txt"
+
+
+def archivo_archivado(cod_curso, periodo):
+    """Archivo comprimido con las asistencias del curso en un periodo archivado (ver data/archivado.py)."""
+    return f"{nombre_particion(cod_curso)}/{nombre_particion(periodo)}.txt{SUFIJO_COMPRIMIDO}"
+
+
+def linea_manifiesto(cod_curso, mes, archivo):
+    return f"{cod_curso}|{mes}|{archivo}\n"
+
+
+def linea_archivado(cod_curso, periodo, archivo, meses):
+    """Linea de archivados.txt; `meses` es (primer_mes, ultimo_mes) de las asistencias del archivo."""
+    return f"{cod_curso}|{periodo}|{archivo}|{meses[0]}|{meses[1]}\n"
+
+
+def leer_manifiesto(carpeta, nombre=MANIFIESTO):
+    """
+    IndiceSegmentos con los archivos anotados en el manifiesto `nombre` de
+    `carpeta` (con las columnas DESDE|HASTA de archivados.txt, si las tiene).
+    """
+    ruta = os.path.join(carpeta, nombre)
+    if not os.path.exists(ruta):
+        return IndiceSegmentos()
+    filas = []
+    with abrir(ruta, 'r', encoding='utf-8') as f:
+        next(f, None)  # Cabecera
+        for linea in f:
+            partes = linea.strip().split('|')
+            if len(partes) >= 3 and partes[0]:
+                fila = {"curso": partes[0], "clave": partes[1], "ruta": os.path.join(carpeta, partes[2])}
+                if len(partes) >= 5:
+                    fila["meses"] = (partes[3], partes[4])
+                filas.append(fila)
+    return IndiceSegmentos(filas)
+
+
+def preparar_carpeta(carpeta, cabecera=CABECERA_MANIFIESTO):
+    """Crea la carpeta y un manifiesto vacio si faltan."""
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, MANIFIESTO)
+    if not os.path.exists(ruta):
+        with abrir(ruta, 'w', encoding='utf-8') as f:
+            f.write(cabecera)
+
+
+def crear_segmento(ruta):
+    """Crea el archivo del segmento con su cabecera (si ya existe lo deja como esta)."""
+    if os.path.exists(ruta):
+        return
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with abrir(ruta, 'w', encoding='utf-8') as f:
+        f.write(CABECERA_ASISTENCIAS)
+
+
+def segmentar_asistencias(archivo, carpeta):
+    """
+    Reparte las lineas de `archivo` (el diario unico anterior) en un segmento
+    por curso y mes dentro de `carpeta`, que no debe existir. Las lineas se
+    copian tal cual y en el mismo orden. Se escribe en una carpeta temporal
+    que luego se renombra: si se interrumpe, `carpeta` no queda a medias.
+    Retorna {(curso, mes): lineas}.
+    """
+    temporal = carpeta + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    preparar_carpeta(temporal)
+    pendientes, conteos = {}, {}
+
+    def volcar():
+        # Un archivo abierto por segmento a la vez (puede haber miles de segmentos)
+        for (curso, mes), lineas in pendientes.items():
+            ruta = os.path.join(temporal, archivo_segmento(curso, mes))
+            crear_segmento(ruta)
+            with abrir(ruta, 'a', encoding='utf-8') as f:
+                f.writelines(lineas)
+        pendientes.clear()
+
+    with abrir(archivo, 'r', encoding='utf-8') as f:
+        next(f, None)  # Cabecera
+        acumuladas = 0
+        for linea in f:
+            partes = linea.strip().split('|')
+            if len(partes) < 4:
+                continue
+            clave = (partes[1], mes_de_fecha(partes[2]))
+            pendientes.setdefault(clave, []).append(linea if linea.endswith("\n") else linea + "\n")
+            conteos[clave] = conteos.get(clave, 0) + 1
+            acumuladas += 1
+            if acumuladas >= LINEAS_EN_MEMORIA:
+                volcar()
+                acumuladas = 0
+    volcar()
+
+    with abrir(os.path.join(temporal, MANIFIESTO), 'a', encoding='utf-8') as f:
+        f.writelines(linea_manifiesto(curso, mes, archivo_segmento(curso, mes)) for curso, mes in sorted(conteos))
+    os.replace(temporal, carpeta)
+    return dict(sorted(conteos.items()))
+
+
+if __name__ == "__main__":
+    origen = sys.argv[1] if len(sys.argv) > 1 else "asistencias.txt"
+    destino = sys.argv[2] if len(sys.argv) > 2 else "asistencias"
+    if os.path.exists(destino):
+        sys.exit(f"{destino} ya existe")
+    conteos = segmentar_asistencias(origen, destino)
+    print(f"{sum(conteos.values())} asistencias en {len(conteos)} segmentos")
+    os.replace(origen, origen + ".migrado")
@@ -0,0 +1,614 @@
+import sqlite3
+import threading
+
+from . import instrumentacion
+from .busqueda import IndiceBusqueda
+from .indices import IndiceCursos, IndiceEstudiantes, nombre_completo
+
+
+class SQLiteDataManager:
+    """
+    Backend alternativo de persistencia sobre sqlite3 (libreria estandar).
+    Expone los mismos metodos publicos que DataManager, de modo que main.py
+    y los controladores funcionan sin cambios.
+
+    Usa modo WAL (lecturas concurrentes con una escritura) e indices sobre
+    las claves naturales: id de estudiante, codigo de curso,
+    (id_est, cod_curso) en matriculas/notas y (id_est, cod_curso, fecha)
+    en asistencias.
+    """
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS estudiantes (
+            id TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL DEFAULT '',
+            apellido TEXT NOT NULL DEFAULT '',
+            carrera TEXT NOT NULL DEFAULT '',
+            nacimiento TEXT NOT NULL DEFAULT '',
+            correo TEXT NOT NULL DEFAULT '',
+            activo INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE TABLE IF NOT EXISTS cursos (
+            codigo TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL DEFAULT '',
+            profesor TEXT NOT NULL DEFAULT '',
+            creditos TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS matriculas (
+            id_est TEXT NOT NULL,
+            cod_curso TEXT NOT NULL,
+            fecha TEXT NOT NULL DEFAULT '',
+            periodo TEXT NOT NULL DEFAULT '2024-1',
+            estado TEXT NOT NULL DEFAULT 'Matriculado',
+            UNIQUE (id_est, cod_curso)
+        );
+        CREATE INDEX IF NOT EXISTS idx_matriculas_curso ON matriculas (cod_curso);
+        CREATE INDEX IF NOT EXISTS idx_matriculas_periodo ON matriculas (periodo);
+        CREATE TABLE IF NOT EXISTS periodos_cerrados (
+            periodo TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS notas (
+            id_est TEXT NOT NULL,
+            cod_curso TEXT NOT NULL,
+            n1 REAL NOT NULL,
+            n2 REAL NOT NULL,
+            n3 REAL NOT NULL,
+            promedio REAL NOT NULL,
+            UNIQUE (id_est, cod_curso)
+        );
+        CREATE INDEX IF NOT EXISTS idx_notas_curso ON notas (cod_curso);
+        CREATE TABLE IF NOT EXISTS asistencias (
+            id_est TEXT NOT NULL,
+            cod_curso TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            estado TEXT NOT NULL,
+            UNIQUE (id_est, cod_curso, fecha)
+        );
+        CREATE INDEX IF NOT EXISTS idx_asistencias_curso_fecha ON asistencias (cod_curso, fecha);
+        CREATE INDEX IF NOT EXISTS idx_asistencias_fecha ON asistencias (fecha);
+        CREATE TABLE IF NOT EXISTS secuencias (
+            nombre TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, archivo_db="registro.db"):
+        self.archivo_db = archivo_db
+        # Un solo objeto conexion compartido; el lock serializa su uso entre hilos
+        self._conexion = sqlite3.connect(archivo_db, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        # Indices de busqueda en memoria (data/busqueda.py), armados al primer uso
+        self._busqueda = {}
+        # Mapeos {clave: nombre} para los cruces, con la misma invalidacion
+        self._nombres = {}
+        self._version_busqueda = None
+        self._analitica = None  # AnaliticaNotas; se descarta con cualquier escritura
+        with self._lock:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(self.ESQUEMA)
+        instrumentacion.instrumentar(self)  # Solo si REGISTRO_INSTRUMENTACION=1
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+    # --- HELPERS ---
+    def _consultar(self, sql, parametros=()):
+        with self._lock:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    def _iterar(self, sql, parametros=(), lote=500):
+        """Generador de filas leidas de a `lote` (memoria constante); el lock se toma por lote."""
+        with self._lock:
+            cursor = self._conexion.execute(sql, parametros)
+        while True:
+            with self._lock:
+                filas = cursor.fetchmany(lote)
+            if not filas:
+                return
+            yield from filas
+
+    def _escribir(self, sql, parametros=()):
+        """Ejecuta una escritura en su propia transaccion y retorna filas afectadas."""
+        with self._lock:
+            self._analitica = None
+            with self._conexion:
+                return self._conexion.execute(sql, parametros).rowcount
+
+    def _escribir_muchos(self, sql, filas):
+        with self._lock:
+            self._busqueda.clear()  # Cargas masivas: los indices se rearman al buscar
+            self._nombres.clear()
+            self._analitica = None
+            with self._conexion:
+                return self._conexion.executemany(sql, filas).rowcount
+
+    def _comprobar_version(self):
+        """Descarta indices y mapeos si otra conexion modifico la base."""
+        version = self._conexion.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version_busqueda:
+            self._busqueda.clear()
+            self._nombres.clear()
+            self._analitica = None
+            self._version_busqueda = version
+
+    def _buscador(self, tabla, campos, clave):
+        """
+        IndiceBusqueda de `tabla`. Si otra conexion modifico la base
+        (PRAGMA data_version cambia) los indices se vuelven a armar.
+        """
+        with self._lock:
+            self._comprobar_version()
+            indice = self._busqueda.get(tabla)
+            if indice is None:
+                indice = IndiceBusqueda(campos, clave)
+                indice.agregar(dict(r) for r in self._conexion.execute(f"SELECT * FROM {tabla}"))
+                self._busqueda[tabla] = indice
+            return indice
+
+    def _reindexar(self, tabla, fila=None, clave=None):
+        """Refleja una escritura propia en el indice de busqueda y en los nombres (si ya existen)."""
+        with self._lock:
+            nombres = self._nombres.get(tabla)
+            if nombres is not None:
+                if fila is not None:
+                    nombres.update(self._nombres_de(tabla, [fila]))
+                else:
+                    nombres.pop(clave, None)
+            indice = self._busqueda.get(tabla)
+            if indice is None:
+                return
+            if fila is not None:
+                indice.actualizar(fila)
+            else:
+                indice.quitar(clave)
+
+    def _nombres_de(self, tabla, filas):
+        if tabla == "estudiantes":
+            return {f["id"]: nombre_completo(f) for f in filas}
+        return {f["codigo"]: f["nombre"] for f in filas}
+
+    def _mapa_nombres(self, tabla):
+        """{clave: nombre} de `tabla`, armado al primer uso y mantenido como los indices de busqueda."""
+        with self._lock:
+            self._comprobar_version()
+            nombres = self._nombres.get(tabla)
+            if nombres is None:
+                nombres = self._nombres_de(tabla, self._conexion.execute(f"SELECT * FROM {tabla}"))
+                self._nombres[tabla] = nombres
+            return nombres
+
+    def _filas_por_claves(self, tabla, clave, claves):
+        """Filas de `tabla` cuya `clave` esta en `claves`, en orden de insercion."""
+        if len(claves) > 900:  # Limite de parametros por consulta de SQLite
+            return [r for r in self._consultar(f"SELECT * FROM {tabla} ORDER BY rowid") if r[clave] in claves]
+        marcas = ",".join("?" * len(claves))
+        return self._consultar(f"SELECT * FROM {tabla} WHERE {clave} IN ({marcas}) ORDER BY rowid", tuple(claves))
+
+    def _estudiante_dict(self, r):
+        return {
+            "id": r["id"], "nombre": r["nombre"], "apellido": r["apellido"],
+            "carrera": r["carrera"], "nacimiento": r["nacimiento"],
+            "correo": r["correo"], "activo": bool(r["activo"])
+        }
+
+    def _curso_dict(self, r):
+        return {"codigo": r["codigo"], "nombre": r["nombre"], "profesor": r["profesor"], "creditos": r["creditos"]}
+
+    def invalidar_cache(self, archivo=None):
+        """Sin cache propia: SQLite ya mantiene su cache de paginas."""
+        pass
+
+    # --- CURSOS ---
+    def registrar_curso(self, codigo, nombre, profesor, creditos):
+        try:
+            self._escribir("INSERT INTO cursos (codigo, nombre, profesor, creditos) VALUES (?, ?, ?, ?)",
+                           (codigo, nombre, profesor, str(creditos)))
+            self._reindexar("cursos", {"codigo": codigo, "nombre": nombre, "profesor": profesor})
+            return True
+        except sqlite3.Error:
+            return False
+
+    def registrar_cursos_lote(self, cursos):
+        if not cursos:
+            return True, "Sin cambios", 0
+        try:
+            escritas = self._escribir_muchos(
+                "INSERT INTO cursos (codigo, nombre, profesor, creditos) VALUES (?, ?, ?, ?)",
+                [(c['codigo'], c['nombre'], c['profesor'], str(c['creditos'])) for c in cursos]
+            )
+        except sqlite3.Error:
+            return False, "Error al guardar cursos", 0
+        return True, "Cursos registrados", escritas
+
+    def obtener_cursos(self):
+        return [self._curso_dict(r) for r in self._consultar("SELECT * FROM cursos ORDER BY rowid")]
+
+    def actualizar_curso(self, codigo, nombre, profesor, creditos):
+        try:
+            if self._escribir("UPDATE cursos SET nombre = ?, profesor = ?, creditos = ? WHERE codigo = ?",
+                              (nombre, profesor, str(creditos), codigo)) == 0:
+                return False
+            self._reindexar("cursos", {"codigo": codigo, "nombre": nombre, "profesor": profesor})
+            return True
+        except sqlite3.Error:
+            return False
+
+    def eliminar_curso(self, codigo):
+        try:
+            if self._escribir("DELETE FROM cursos WHERE codigo = ?", (codigo,)) == 0:
+                return False
+            self._reindexar("cursos", clave=codigo)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def nombres_cursos(self):
+        return self._mapa_nombres("cursos")
+
+    def buscar_cursos(self, termino):
+        """Busca por codigo, nombre o profesor con el mismo indice por prefijo que DataManager."""
+        codigos = self._buscador("cursos", IndiceCursos.CAMPOS_BUSQUEDA, "codigo").buscar(termino)
+        if codigos is None:
+            return self.obtener_cursos()
+        return [self._curso_dict(r) for r in self._filas_por_claves("cursos", "codigo", codigos)]
+
+    # --- ASISTENCIA ---
+    def registrar_asistencia(self, id_estudiante, cod_curso, fecha, estado):
+        try:
+            self._escribir(
+                "INSERT INTO asistencias (id_est, cod_curso, fecha, estado) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (id_est, cod_curso, fecha) DO UPDATE SET estado = excluded.estado",
+                (id_estudiante, cod_curso, fecha, estado)
+            )
+            return True, "Asistencia registrada"
+        except sqlite3.Error:
+            return False, "Error al guardar asistencia"
+
+    def registrar_asistencias_lote(self, cod_curso, fecha, registros):
+        try:
+            escritas = self._escribir_muchos(
+                "INSERT INTO asistencias (id_est, cod_curso, fecha, estado) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (id_est, cod_curso, fecha) DO UPDATE SET estado = excluded.estado "
+                "WHERE estado <> excluded.estado",
+                [(id_est, cod_curso, fecha, estado) for id_est, estado in registros]
+            )
+        except sqlite3.Error:
+            return False, "Error al guardar asistencia", 0
+        if escritas == 0:
+            return True, "Sin cambios", 0
+        return True, "Asistencia registrada", escritas
+
+    def compactar_asistencias(self):
+        """No aplica: SQLite actualiza en el lugar. Se limpia el WAL."""
+        self._consultar("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def _filtro_asistencias(self, cod_curso=None, desde=None, hasta=None):
+        """(condicion SQL, parametros) para acotar asistencias por curso y fechas (inclusive)."""
+        condiciones, parametros = [], []
+        for condicion, valor in (("cod_curso = ?", cod_curso), ("fecha >= ?", desde), ("fecha <= ?", hasta)):
+            if valor is not None:
+                condiciones.append(condicion)
+                parametros.append(valor)
+        return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), tuple(parametros)
+
+    def obtener_asistencias_raw(self, cod_curso=None, desde=None, hasta=None):
+        condicion, parametros = self._filtro_asistencias(cod_curso, desde, hasta)
+        return [{'id': r["id_est"], 'curso': r["cod_curso"], 'fecha': r["fecha"], 'estado': r["estado"]}
+                for r in self._consultar(f"SELECT * FROM asistencias{condicion} ORDER BY rowid", parametros)]
+
+    def obtener_asistencia_estudiante(self, id_est, cod_curso, fecha):
+        filas = self._consultar("SELECT estado FROM asistencias WHERE id_est = ? AND cod_curso = ? AND fecha = ?",
+                                (id_est, cod_curso, fecha))
+        return filas[0]["estado"] if filas else None
+
+    def obtener_asistencias_curso_fecha(self, cod_curso, fecha):
+        filas = self._consultar("SELECT id_est, estado FROM asistencias WHERE cod_curso = ? AND fecha = ?",
+                                (cod_curso, fecha))
+        return {r["id_est"]: r["estado"] for r in filas}
+
+    def iterar_historial_asistencia(self, cod_curso, desde=None, hasta=None):
+        if cod_curso is None:
+            return  # Igual que el backend de texto: el historial es siempre de un curso
+        condicion, parametros = self._filtro_asistencias(cod_curso, desde, hasta)
+        for r in self._iterar(f"SELECT id_est, fecha, estado FROM asistencias{condicion} ORDER BY rowid", parametros):
+            yield {"id_est": r["id_est"], "fecha": r["fecha"], "estado": r["estado"]}
+
+    def obtener_historial_asistencia(self, cod_curso, desde=None, hasta=None):
+        return list(self.iterar_historial_asistencia(cod_curso, desde, hasta))
+
+    # --- MATRICULAS ---
+    def _filtro_periodo(self, periodo, columna="periodo"):
+        """(condicion SQL, parametros) para filtrar por periodo (ninguna si es None)."""
+        return ("", ()) if periodo is None else (f" AND {columna} = ?", (periodo,))
+
+    def periodos_matriculas(self):
+        """Lista de (periodo, cerrado) con matriculas, en orden."""
+        filas = self._consultar(
+            "SELECT DISTINCT m.periodo, c.periodo IS NOT NULL AS cerrado FROM matriculas m "
+            "LEFT JOIN periodos_cerrados c ON c.periodo = m.periodo ORDER BY m.periodo")
+        return [(r["periodo"], bool(r["cerrado"])) for r in filas]
+
+    def periodo_cerrado(self, periodo):
+        return bool(self._consultar("SELECT 1 FROM periodos_cerrados WHERE periodo = ?", (periodo,)))
+
+    def cerrar_periodo(self, periodo):
+        """Marca `periodo` como cerrado (sin nuevas matriculas ni eliminaciones). Retorna (exito, mensaje, cantidad)."""
+        if self.periodo_cerrado(periodo):
+            return False, f"El periodo {periodo} ya está cerrado.", 0
+        cantidad = self._consultar("SELECT COUNT(*) FROM matriculas WHERE periodo = ?", (periodo,))[0][0]
+        if not cantidad:
+            return False, f"No hay matrículas del periodo {periodo}.", 0
+        try:
+            self._escribir("INSERT INTO periodos_cerrados (periodo) VALUES (?)", (periodo,))
+        except sqlite3.Error as e:
+            return False, str(e), 0
+        return True, f"Periodo {periodo} cerrado", cantidad
+
+    def periodo_archivado(self, periodo):
+        return False
+
+    def alcance_archivado(self, periodo):
+        return {}
+
+    def archivar_periodo(self, periodo):
+        """Los archivos comprimidos son del backend de texto: en SQLite los periodos cerrados quedan en la base."""
+        return False, "El backend SQLite no archiva periodos (quedan en la base como cerrados).", {}
+
+    def existe_matricula(self, id_est, cod_curso, periodo=None):
+        condicion, parametros = self._filtro_periodo(periodo)
+        return bool(self._consultar("SELECT 1 FROM matriculas WHERE id_est = ? AND cod_curso = ?" + condicion,
+                                    (id_est, cod_curso) + parametros))
+
+    def registrar_matricula(self, id_est, cod_curso, fecha, periodo, estado):
+        if self.periodo_cerrado(periodo):
+            return False, f"El periodo {periodo} está cerrado."
+        try:
+            self._escribir("INSERT INTO matriculas (id_est, cod_curso, fecha, periodo, estado) VALUES (?, ?, ?, ?, ?)",
+                           (id_est, cod_curso, fecha, periodo, estado))
+            return True, "Matrícula exitosa"
+        except sqlite3.IntegrityError:
+            return False, "El estudiante ya está matriculado en este curso."
+        except sqlite3.Error as e:
+            return False, str(e)
+
+    def registrar_matriculas_lote(self, matriculas):
+        if not matriculas:
+            return True, "Sin cambios", 0
+        cerrados = sorted({m['periodo'] for m in matriculas if self.periodo_cerrado(m['periodo'])})
+        if cerrados:
+            return False, f"Periodos cerrados: {', '.join(cerrados)}", 0
+        try:
+            escritas = self._escribir_muchos(
+                "INSERT INTO matriculas (id_est, cod_curso, fecha, periodo, estado) VALUES (?, ?, ?, ?, ?)",
+                [(m['id_est'], m['cod_curso'], m['fecha'], m['periodo'], m['estado']) for m in matriculas]
+            )
+        except sqlite3.Error as e:
+            return False, str(e), 0
+        return True, "Matrículas registradas", escritas
+
+    def obtener_matriculados(self, cod_curso, periodo=None):
+        """Devuelve lista de objetos estudiante (activos) inscritos en un curso (en un periodo o en todos)."""
+        condicion, parametros = self._filtro_periodo(periodo, "m.periodo")
+        filas = self._consultar(
+            "SELECT e.* FROM matriculas m JOIN estudiantes e ON e.id = m.id_est "
+            f"WHERE m.cod_curso = ? AND e.activo = 1{condicion} ORDER BY m.rowid",
+            (cod_curso,) + parametros
+        )
+        return [self._estudiante_dict(r) for r in filas]
+
+    def obtener_matriculas(self, periodo=None):
+        condicion, parametros = self._filtro_periodo(periodo, "m.periodo")
+        filas = self._consultar(
+            "SELECT m.*, e.nombre AS e_nombre, e.apellido AS e_apellido, c.nombre AS c_nombre "
+            "FROM matriculas m LEFT JOIN estudiantes e ON e.id = m.id_est "
+            f"LEFT JOIN cursos c ON c.codigo = m.cod_curso WHERE 1 = 1{condicion} ORDER BY m.rowid",
+            parametros
+        )
+        data = []
+        for r in filas:
+            data.append({
+                "id_est": r["id_est"],
+                "cod_curso": r["cod_curso"],
+                "estudiante": f"{r['e_nombre']} {r['e_apellido']}" if r["e_nombre"] is not None else r["id_est"],
+                "curso": r["c_nombre"] if r["c_nombre"] is not None else r["cod_curso"],
+                "fecha": r["fecha"],
+                "periodo": r["periodo"],
+                "estado": r["estado"]
+            })
+        return data
+
+    def eliminar_matricula(self, id_est, cod_curso):
+        # Las matriculas de periodos cerrados no se eliminan
+        try:
+            return self._escribir(
+                "DELETE FROM matriculas WHERE id_est = ? AND cod_curso = ? "
+                "AND periodo NOT IN (SELECT periodo FROM periodos_cerrados)", (id_est, cod_curso)) > 0
+        except sqlite3.Error:
+            return False
+
+    def obtener_estudiantes_por_curso(self, cod_curso, periodo=None):
+        condicion, parametros = self._filtro_periodo(periodo)
+        filas = self._consultar(
+            "SELECT e.* FROM estudiantes e WHERE e.id IN "
+            f"(SELECT id_est FROM matriculas WHERE cod_curso = ?{condicion}) ORDER BY e.rowid",
+            (cod_curso,) + parametros
+        )
+        return [self._estudiante_dict(r) for r in filas]
+
+    # --- ESTUDIANTES ---
+    def registrar_estudiante(self, nombre, apellido, carrera, nacimiento, correo, activo=True):
+        """Genera ID automatico y guarda al estudiante."""
+        try:
+            with self._lock:
+                with self._conexion:
+                    nuevo_id = self._generar_nuevo_id()
+                    self._conexion.execute(
+                        "INSERT INTO estudiantes (id, nombre, apellido, carrera, nacimiento, correo, activo) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (nuevo_id, nombre, apellido, carrera, nacimiento, correo, 1 if activo else 0)
+                    )
+            self._reindexar("estudiantes", {"id": nuevo_id, "nombre": nombre, "apellido": apellido,
+                                            "carrera": carrera, "correo": correo})
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar estudiante: {e}")
+            return False
+
+    def registrar_estudiantes_lote(self, estudiantes):
+        """Registra varios estudiantes en una transaccion con un bloque de IDs reservado."""
+        if not estudiantes:
+            return True, "Sin cambios", []
+        try:
+            ids = self.reservar_ids_estudiantes(len(estudiantes))
+            self._escribir_muchos(
+                "INSERT INTO estudiantes (id, nombre, apellido, carrera, nacimiento, correo, activo) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(i, e['nombre'], e['apellido'], e['carrera'], e['nacimiento'], e['correo'],
+                  1 if e.get('activo', True) else 0) for i, e in zip(ids, estudiantes)]
+            )
+        except sqlite3.Error as e:
+            print(f"Error al guardar estudiantes: {e}")
+            return False, "Error al guardar estudiantes", []
+        return True, "Estudiantes registrados", ids
+
+    def actualizar_estudiante(self, id_est, nombre, apellido, carrera, nacimiento, correo, activo):
+        try:
+            if self._escribir(
+                "UPDATE estudiantes SET nombre = ?, apellido = ?, carrera = ?, nacimiento = ?, correo = ?, activo = ? "
+                "WHERE id = ?",
+                (nombre, apellido, carrera, nacimiento, correo, 1 if activo else 0, id_est)
+            ) == 0:
+                return False
+            self._reindexar("estudiantes", {"id": id_est, "nombre": nombre, "apellido": apellido,
+                                            "carrera": carrera, "correo": correo})
+            return True
+        except sqlite3.Error:
+            return False
+
+    def eliminar_estudiante(self, id_est):
+        try:
+            if self._escribir("DELETE FROM estudiantes WHERE id = ?", (id_est,)) == 0:
+                return False
+            self._reindexar("estudiantes", clave=id_est)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def obtener_estudiantes(self, activos=False):
+        sql = "SELECT * FROM estudiantes WHERE activo = 1 ORDER BY rowid" if activos else \
+              "SELECT * FROM estudiantes ORDER BY rowid"
+        return [self._estudiante_dict(r) for r in self._consultar(sql)]
+
+    def _reservar_ids(self, cantidad):
+        """
+        Reserva `cantidad` IDs en la tabla secuencias y retorna el primero.
+        Si la secuencia no existe se reconstruye desde el mayor ID guardado.
+        """
+        with self._lock:
+            with self._conexion:
+                fila = self._conexion.execute("SELECT valor FROM secuencias WHERE nombre = 'estudiantes'").fetchone()
+                if fila is None:
+                    maximo = self._conexion.execute(
+                        "SELECT MAX(CAST(id AS INTEGER)) FROM estudiantes WHERE id GLOB '[0-9]*'"
+                    ).fetchone()[0]
+                    ultimo = maximo if maximo is not None else 2024000
+                    self._conexion.execute("INSERT INTO secuencias (nombre, valor) VALUES ('estudiantes', ?)",
+                                           (ultimo + cantidad,))
+                else:
+                    ultimo = fila["valor"]
+                    self._conexion.execute("UPDATE secuencias SET valor = ? WHERE nombre = 'estudiantes'",
+                                           (ultimo + cantidad,))
+        return ultimo + 1
+
+    def _generar_nuevo_id(self):
+        return str(self._reservar_ids(1))
+
+    def reservar_ids_estudiantes(self, cantidad):
+        if cantidad < 1:
+            raise ValueError("La cantidad de IDs a reservar debe ser positiva")
+        primero = self._reservar_ids(cantidad)
+        return [str(primero + i) for i in range(cantidad)]
+
+    def nombres_estudiantes(self):
+        return self._mapa_nombres("estudiantes")
+
+    def buscar_estudiantes(self, termino):
+        """Busca por ID, nombre, apellido, carrera o correo con el mismo indice por prefijo que DataManager."""
+        ids = self._buscador("estudiantes", IndiceEstudiantes.CAMPOS_BUSQUEDA, "id").buscar(termino)
+        if ids is None:
+            return self.obtener_estudiantes()
+        return [self._estudiante_dict(r) for r in self._filas_por_claves("estudiantes", "id", ids)]
+
+    # --- NOTAS ---
+    def registrar_nota(self, id_est, cod_curso, n1, n2, n3):
+        """Guarda o actualiza las notas (UPSERT)."""
+        promedio = round((n1 + n2 + n3) / 3, 2)
+        try:
+            self._escribir(
+                "INSERT INTO notas (id_est, cod_curso, n1, n2, n3, promedio) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id_est, cod_curso) DO UPDATE SET n1 = excluded.n1, n2 = excluded.n2, "
+                "n3 = excluded.n3, promedio = excluded.promedio",
+                (id_est, cod_curso, n1, n2, n3, promedio)
+            )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar nota: {e}")
+            return False
+
+    def registrar_notas_lote(self, notas):
+        """UPSERT de varias notas [(id_est, cod_curso, n1, n2, n3)] en una transaccion."""
+        if not notas:
+            return True, "Sin cambios", 0
+        try:
+            escritas = self._escribir_muchos(
+                "INSERT INTO notas (id_est, cod_curso, n1, n2, n3, promedio) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id_est, cod_curso) DO UPDATE SET n1 = excluded.n1, n2 = excluded.n2, "
+                "n3 = excluded.n3, promedio = excluded.promedio",
+                [(i, c, n1, n2, n3, round((n1 + n2 + n3) / 3, 2)) for i, c, n1, n2, n3 in notas]
+            )
+        except sqlite3.Error as e:
+            return False, str(e), 0
+        return True, "Notas registradas", escritas
+
+    def obtener_notas_diccionario(self, cod_curso):
+        filas = self._consultar("SELECT * FROM notas WHERE cod_curso = ?", (cod_curso,))
+        return {r["id_est"]: {"n1": r["n1"], "n2": r["n2"], "n3": r["n3"], "promedio": r["promedio"]}
+                for r in filas}
+
+    def iterar_todas_las_notas(self, archivadas=True):
+        filas = self._iterar(
+            "SELECT n.*, e.nombre AS e_nombre, e.apellido AS e_apellido, c.nombre AS c_nombre "
+            "FROM notas n LEFT JOIN estudiantes e ON e.id = n.id_est "
+            "LEFT JOIN cursos c ON c.codigo = n.cod_curso ORDER BY n.rowid"
+        )
+        for r in filas:
+            yield {
+                "id": r["id_est"],
+                "nombre": f"{r['e_nombre']} {r['e_apellido']}" if r["e_nombre"] is not None else r["id_est"],
+                "curso": r["c_nombre"] if r["c_nombre"] is not None else r["cod_curso"],
+                "cod_curso": r["cod_curso"],
+                "n1": str(r["n1"]),
+                "n2": str(r["n2"]),
+                "n3": str(r["n3"]),
+                "promedio": str(r["promedio"]),
+                "nota": str(r["promedio"])  # Backward compatibility for Dashboard
+            }
+
+    def obtener_todas_las_notas(self):
+        return list(self.iterar_todas_las_notas())
+
+    def analitica_notas(self):
+        """AnaliticaNotas de todas las notas (ver DataManager.analitica_notas)."""
+        with self._lock:
+            self._comprobar_version()
+            if self._analitica is None:
+                from .analitica import AnaliticaNotas  # NumPy solo se importa si se usan estadisticas
+                filas = [{"id": r["id_est"], "cod_curso": r["cod_curso"], "n1": r["n1"], "n2": r["n2"],
+                          "n3": r["n3"], "promedio": r["promedio"]}
+                         for r in self._conexion.execute("SELECT * FROM notas ORDER BY rowid")]
+                carreras = {r["id"]: r["carrera"] for r in self._conexion.execute("SELECT id, carrera FROM estudiantes")}
+                self._analitica = AnaliticaNotas.desde_filas(filas, carreras)
+            return self._analitica
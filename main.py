@@ -1,22 +1,41 @@
-import re
 import sys
 import os
+import time
 import warnings
+from collections import deque
+
+INICIO = time.perf_counter()  # Arranque en frio: antes de importar PyQt
 
 # Suppress PyQt6 internal warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*sipPyTypeDict.*")
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QTableWidgetItem, QMessageBox, QFileDialog, QHeaderView, QVBoxLayout
-from PyQt6.QtGui import QIcon, QPixmap, QColor
-from PyQt6.QtCore import Qt, QDate
-from PyQt6 import uic
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QTableWidgetItem, QMessageBox, QFileDialog, QHeaderView, QVBoxLayout, QProgressDialog, QInputDialog
+from PyQt6.QtGui import QIcon, QPixmap, QColor, QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QDate, QTimer, pyqtSignal
 
 # Import models & data modules
 from model.estudiante import Estudiante
+from model.validaciones import validar_curso, validar_estudiante
 from controllers.asistencia_controller import AsistenciaController
 from controllers.estudiante_controller import EstudianteController
 from controllers.nota_controller import NotaController
+from controllers.reporte_controller import ReporteController
+from data import instrumentacion
 from data.data_manager import DataManager
+from views.modelos_tabla import (ModeloEstudiantes, ModeloCursos, ModeloMatriculas, ModeloNotas,
+                                 ModeloAsistencia, ModeloReporte, FiltroTexto)
+from views.formularios import cargar_ui
+from views.trabajadores import CargadorDatos, temporizador_debounce
+
+# REGISTRO_TIEMPOS=1 muestra en stderr el arranque y la apertura de cada ventana
+MEDIR_TIEMPOS = os.environ.get("REGISTRO_TIEMPOS") == "1"
+
+
+def registrar_tiempo(etiqueta, inicio):
+    segundos = time.perf_counter() - inicio
+    instrumentacion.registrar(etiqueta, segundos)  # Con REGISTRO_INSTRUMENTACION=1 aparece en el panel
+    if MEDIR_TIEMPOS:
+        print(f"[tiempos] {etiqueta}: {segundos * 1000:.1f} ms", file=sys.stderr)
 
 # ==========================================
 # CLASES DE VENTANAS
@@ -25,10 +44,12 @@ from data.data_manager import DataManager
 class MainApp(QMainWindow):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/dashboard.ui", self)
+        cargar_ui(self, "dashboard")
         
         self.db = db_manager
-        
+        self.cargador = CargadorDatos(self.db, self)
+        self._ventanas = {}  # {clase: ventana}; se reutilizan entre aperturas
+
         # Conectar botones del Sidebar (Menu)
         self.btnEstudiantes.clicked.connect(self.abrir_registro_estudiantes)
         self.btnCursos.clicked.connect(self.abrir_gestion_cursos)
@@ -36,43 +57,52 @@ class MainApp(QMainWindow):
         self.btnNotas.clicked.connect(self.abrir_notas)
         self.btnReportes.clicked.connect(self.mostrar_reportes) # Placeholder
         self.btnAsistencia.clicked.connect(self.abrir_asistencia)
+
+        # Panel de depuracion con las metricas (solo con REGISTRO_INSTRUMENTACION=1)
+        if instrumentacion.activa():
+            QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.abrir_panel_instrumentacion)
         
         # Cargar datos resumen (Dashboard)
         self.cargar_resumen_dashboard()
 
     def cargar_resumen_dashboard(self):
-        """Carga KPIs y tabla de últimas notas"""
-        
+        """Carga KPIs y tabla de últimas notas (la lectura corre en segundo plano)"""
+        self.cargador.solicitar("resumen", self._consultar_resumen, self._mostrar_resumen)
+
+    def _consultar_resumen(self):
+        return (len(self.db.obtener_estudiantes(activos=True)),
+                len(self.db.obtener_cursos()),
+                self.db.analitica_notas().resumen(),
+                # Solo se muestran las ultimas 10: no se arma la lista completa ni se abren los periodos archivados
+                list(deque(self.db.iterar_todas_las_notas(archivadas=False), maxlen=10)))
+
+    def _mostrar_resumen(self, resumen):
+        total_estudiantes, total_cursos, estadisticas, notas = resumen
+
         # 1. Total Estudiantes
-        estudiantes = self.db.obtener_estudiantes(activos=True)
-        self.lblValEstudiantes.setText(str(len(estudiantes)))
-        
+        self.lblValEstudiantes.setText(str(total_estudiantes))
+
         # 2. Total Cursos
-        cursos = self.db.obtener_cursos()
-        self.lblValCursos.setText(str(len(cursos)))
-        
-        # 3. Promedio General y Riesgo
-        notas = self.db.obtener_todas_las_notas()
-        if notas:
-            promedios = [float(n['promedio']) for n in notas if n.get('promedio')]
-            if promedios:
-                general = sum(promedios) / len(promedios)
-                self.lblValPromedio.setText(f"{general:.2f}")
-                
-                # Alumnos en riesgo (promedio < 13)
-                riesgo = sum(1 for p in promedios if p < 13)
-                self.lblValRiesgo.setText(str(riesgo))
-            else:
-                self.lblValPromedio.setText("0.0")
-                self.lblValRiesgo.setText("0")
+        self.lblValCursos.setText(str(total_cursos))
+
+        # 3. Promedio General y Riesgo (promedio < 13), calculados en data/analitica.py
+        if estadisticas['cantidad']:
+            self.lblValPromedio.setText(f"{estadisticas['media']:.2f}")
+            self.lblValPromedio.setToolTip(
+                f"Mediana: {estadisticas['mediana']:.2f}\n"
+                f"Desv. estándar: {estadisticas['desviacion']:.2f}\n"
+                f"Aprobación: {estadisticas['tasa_aprobacion'] * 100:.1f}%"
+            )
+            self.lblValRiesgo.setText(str(estadisticas['riesgo']))
         else:
             self.lblValPromedio.setText("0.0")
+            self.lblValPromedio.setToolTip("")
             self.lblValRiesgo.setText("0")
 
         # 4. Tabla Ultimas Calificaciones
         self.tableWidget.setRowCount(0)
         # Mostrar ultimas 10
-        for i, nota in enumerate(reversed(notas[-10:])): 
+        for i, nota in enumerate(reversed(notas)):
             self.tableWidget.insertRow(i)
             self.tableWidget.setItem(i, 0, QTableWidgetItem(nota['id']))
             self.tableWidget.setItem(i, 1, QTableWidgetItem(nota['nombre']))
@@ -109,54 +139,73 @@ class MainApp(QMainWindow):
         super().showEvent(event)
         self.cargar_resumen_dashboard()
 
+    def _mostrar_ventana(self, clase):
+        """
+        Muestra la ventana de `clase`, creandola solo la primera vez. Al volver a
+        abrir una ventana cerrada se recargan sus datos en lugar de reconstruirla.
+        """
+        inicio = time.perf_counter()
+        ventana = self._ventanas.get(clase)
+        if ventana is None:
+            ventana = self._ventanas[clase] = clase(self.db)
+        elif not ventana.isVisible():
+            ventana.refrescar()
+        ventana.show()
+        ventana.raise_()
+        ventana.activateWindow()
+        registrar_tiempo(f"abrir {clase.__name__}", inicio)
+        return ventana
+
     def abrir_registro_estudiantes(self):
-        self.ventana_estudiantes = VentanaRegistroEstudiantes(self.db)
-        self.ventana_estudiantes.show()
+        self._mostrar_ventana(VentanaRegistroEstudiantes)
 
     def abrir_gestion_cursos(self):
-        self.ventana_cursos = VentanaGestionCursos(self.db)
-        self.ventana_cursos.show()
+        self._mostrar_ventana(VentanaGestionCursos)
 
     def abrir_matricula(self):
-        self.ventana_matricula = VentanaMatricula(self.db)
-        self.ventana_matricula.show()
+        self._mostrar_ventana(VentanaMatricula)
     
     def abrir_notas(self):
-        self.ventana_notas = VentanaNotas(self.db)
-        self.ventana_notas.destroyed.connect(self.cargar_resumen_dashboard)
-        self.ventana_notas.show()
+        nueva = VentanaNotas not in self._ventanas
+        ventana = self._mostrar_ventana(VentanaNotas)
+        if nueva:
+            ventana.cerrada.connect(self.cargar_resumen_dashboard)
 
     def abrir_asistencia(self):
-        self.ventana_asistencia = VentanaAsistencia(self.db)
-        self.ventana_asistencia.show()
+        self._mostrar_ventana(VentanaAsistencia)
 
     def mostrar_reportes(self):
-        self.ventana_reportes = VentanaReportes(self.db)
-        self.ventana_reportes.show()
-
-    def abrir_ventana_cursos(self):
-        self.ventana_cursos = VentanaGestionCursos(self.db)
-        self.ventana_cursos.show()
+        self._mostrar_ventana(VentanaReportes)
 
-    def abrir_ventana_matricula(self):
-        self.ventana_matricula = VentanaMatricula(self.db)
-        self.ventana_matricula.show()
+    def abrir_panel_instrumentacion(self):
+        from views.panel_instrumentacion import PanelInstrumentacion
+        panel = self._ventanas.get(PanelInstrumentacion)
+        if panel is None:
+            panel = self._ventanas[PanelInstrumentacion] = PanelInstrumentacion()
+        panel.show()
+        panel.raise_()
 
 class VentanaRegistroEstudiantes(QWidget):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_registro_estudiantes.ui", self)
+        cargar_ui(self, "form_registro_estudiantes")
         self.db = db_manager
         self.controller = EstudianteController(db_manager)  # MVC: Controller
-        
+        self.cargador = CargadorDatos(self.db, self)
+
+        # Tabla virtualizada: Qt solo pide las celdas visibles
+        self.modelo = ModeloEstudiantes(self)
+        self.tableEstudiantes.setModel(self.modelo)
+
         self.btnGuardar.clicked.connect(self.registrar_estudiante)
         
-        # Conectar Busqueda
+        # Conectar Busqueda (al escribir se espera una pausa antes de consultar)
+        self.temporizador_busqueda = temporizador_debounce(self, self.filtrar_estudiantes)
         self.btnBuscar.clicked.connect(self.filtrar_estudiantes)
-        self.inputBusqueda.textChanged.connect(self.filtrar_estudiantes)
+        self.inputBusqueda.textChanged.connect(lambda _: self.temporizador_busqueda.start())
         
         # Conectar Edicion
-        self.tableEstudiantes.itemDoubleClicked.connect(self.cargar_estudiante_para_editar)
+        self.tableEstudiantes.doubleClicked.connect(self.cargar_estudiante_para_editar)
         try:
             self.btnEditar.clicked.connect(self.editar_seleccionado)
         except AttributeError:
@@ -176,28 +225,34 @@ class VentanaRegistroEstudiantes(QWidget):
         self.cargar_carreras()
         self.cargar_tabla()
 
+    def refrescar(self):
+        """Recarga los datos al volver a abrir la ventana (conserva la busqueda)."""
+        self.cargar_carreras()
+        self.filtrar_estudiantes()
+
     def filtrar_estudiantes(self):
+        self.temporizador_busqueda.stop()
         termino = self.inputBusqueda.text()
         if not termino:
             self.cargar_tabla()
             return
             
-        resultados = self.db.buscar_estudiantes(termino)
-        self.actualizar_tabla(resultados)
+        # Cada busqueda reemplaza a la anterior si esta aun no termino
+        self.cargador.solicitar("tabla", self.db.buscar_estudiantes, self.actualizar_tabla, termino)
 
     def editar_seleccionado(self):
-        row = self.tableEstudiantes.currentRow()
-        if row >= 0:
-            item = self.tableEstudiantes.item(row, 0) # Item ID
-            self.cargar_estudiante_para_editar(item)
+        index = self.tableEstudiantes.currentIndex()
+        if index.isValid():
+            self.cargar_estudiante_para_editar(index)
         else:
             QMessageBox.warning(self, "Aviso", "Seleccione un estudiante de la tabla para editar.")
 
     def eliminar_seleccionado(self):
-        row = self.tableEstudiantes.currentRow()
-        if row >= 0:
-            id_est = self.tableEstudiantes.item(row, 0).text()
-            nombre = self.tableEstudiantes.item(row, 1).text()
+        index = self.tableEstudiantes.currentIndex()
+        if index.isValid():
+            fila = self.modelo.fila(index.row())
+            id_est = fila['id']
+            nombre = fila['nombre']
             
             confirm = QMessageBox.question(
                 self, "Confirmar Eliminación",
@@ -232,30 +287,16 @@ class VentanaRegistroEstudiantes(QWidget):
     def registrar_estudiante(self):
         # El ID ahora es read-only, pero si tiene texto, es edicion
         id_actual = self.inputID.text()
-        nombre = self.inputNombre.text().strip().title()
-        apellido = self.inputApellido.text().strip().title()
         carrera = self.comboCarrera.currentText()
-        correo = self.inputCorreo.text().strip()
         activo = self.checkActivo.isChecked()
-        
-        # 1. Validar campos obligatorios
-        if not nombre or not apellido or not correo:
-            QMessageBox.warning(self, "Error", "Complete los campos obligatorios")
-            return
-
-        # 2. Validar Nombre (Solo letras y espacios, min 2 chars)
-        if not re.match(r"^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$", nombre) or len(nombre) < 2:
-            QMessageBox.warning(self, "Error", "El Nombre es inválido. Use solo letras y mínimo 2 caracteres.")
-            return
 
-        # 3. Validar Apellido (Solo letras y espacios, min 2 chars)
-        if not re.match(r"^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$", apellido) or len(apellido) < 2:
-            QMessageBox.warning(self, "Error", "El Apellido es inválido. Use solo letras y mínimo 2 caracteres.")
-            return
-
-        # 4. Validar Correo (Formato simple)
-        if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", correo):
-            QMessageBox.warning(self, "Error", "El formato del correo es inválido (ejemplo@dominio.com).")
+        # Campos obligatorios, nombre/apellido (solo letras, min 2) y correo:
+        # mismas reglas que la importacion masiva (model/validaciones.py)
+        try:
+            nombre, apellido, correo = validar_estudiante(self.inputNombre.text(), self.inputApellido.text(),
+                                                          self.inputCorreo.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
             return
 
         # Validacion de fecha
@@ -285,10 +326,9 @@ class VentanaRegistroEstudiantes(QWidget):
             else:
                 QMessageBox.critical(self, "Error", "Error al actualizar estudiante")
 
-    def cargar_estudiante_para_editar(self, item):
-        row = item.row()
-        id_est = self.tableEstudiantes.item(row, 0).text()
-        
+    def cargar_estudiante_para_editar(self, index):
+        id_est = self.modelo.fila(index.row())['id']
+
         # Buscamos el objeto completo en la DB para sacar todos los datos (incluido activo)
         estudiante = None
         for est in self.db.obtener_estudiantes():
@@ -320,70 +360,50 @@ class VentanaRegistroEstudiantes(QWidget):
         self.btnGuardar.setText("Guardar Estudiante")
 
     def cargar_tabla(self):
-        estudiantes = self.db.obtener_estudiantes()
-        self.actualizar_tabla(estudiantes)
+        self.cargador.solicitar("tabla", self.db.obtener_estudiantes, self.actualizar_tabla)
 
     def actualizar_tabla(self, estudiantes):
-        self.tableEstudiantes.setRowCount(0)
-        # La tabla tiene 6 columnas, podriamos agregar una 7ma visual para "Estado"
-        # Por ahora lo dejaremos asi, ya que el checkbox muestra el estado al editar
-        for row_idx, data in enumerate(estudiantes):
-            self.tableEstudiantes.insertRow(row_idx)
-            
-            # Determinar color segun estado
-            es_activo = data.get('activo', True)
-            color_fondo = QColor(255, 255, 255) # Blanco
-            if not es_activo:
-                color_fondo = QColor(255, 230, 230) # Rojo suave
-            
-            items = [
-                data['id'], data['nombre'], data['apellido'], 
-                data['carrera'], data.get('nacimiento', ''), data.get('correo', '')
-            ]
-            
-            for col_idx, valor in enumerate(items):
-                item = QTableWidgetItem(str(valor))
-                item.setBackground(color_fondo)
-                self.tableEstudiantes.setItem(row_idx, col_idx, item)
+        # El modelo pinta en rojo suave a los inactivos (el checkbox muestra el estado al editar)
+        self.modelo.set_filas(estudiantes)
 
 class VentanaGestionCursos(QWidget):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_gestion_cursos.ui", self)
+        cargar_ui(self, "form_gestion_cursos")
         self.db = db_manager
+        self.cargador = CargadorDatos(self.db, self)
         
         # Conexiones Eventos
         self.btnGuardar.clicked.connect(self.registrar_curso)
+        self.temporizador_busqueda = temporizador_debounce(self, self.filtrar_cursos)
         self.btnBuscar.clicked.connect(self.filtrar_cursos)
-        self.inputBusqueda.textChanged.connect(self.filtrar_cursos)
+        self.inputBusqueda.textChanged.connect(lambda _: self.temporizador_busqueda.start())
         
         # Nuevos botones
         self.btnLimpiar.clicked.connect(self.limpiar_formulario)
         self.btnEditar.clicked.connect(self.editar_seleccionado)
         self.btnEliminar.clicked.connect(self.eliminar_seleccionado)
-        self.tableCursos.itemDoubleClicked.connect(self.cargar_curso_para_editar)
-        
+        self.tableCursos.doubleClicked.connect(self.cargar_curso_para_editar)
+
         # Configurar Tabla
-        self.tableCursos.setColumnCount(4)
-        self.tableCursos.setHorizontalHeaderLabels(["Código", "Nombre", "Profesor", "Créditos"])
+        self.modelo = ModeloCursos(self)
+        self.tableCursos.setModel(self.modelo)
         self.tableCursos.horizontalHeader().setStretchLastSection(True)
         
         self.cargar_tabla()
+
+    def refrescar(self):
+        self.filtrar_cursos()
         
     def registrar_curso(self):
         # 1. Validar y Formatear Entradas
-        codigo = self.inputCodigo.text().strip().upper() # Codigo siempre mayus
-        nombre = self.inputNombre.text().strip()
-        profesor = self.inputProfesor.text().strip()
-        creditos = self.spinCreditos.value()
-        
-        # Capitalizar nombre y profesor (Titulo) para consistencia
-        nombre = " ".join([p.capitalize() for p in nombre.split()])
-        profesor = " ".join([p.capitalize() for p in profesor.split()])
-        
-        if not codigo or not nombre or not profesor:
-             QMessageBox.warning(self, "Error", "Complete todos los campos obligatorios")
-             return
+        # Codigo en mayusculas, nombre y profesor capitalizados (model/validaciones.py)
+        try:
+            codigo, nombre, profesor, creditos = validar_curso(self.inputCodigo.text(), self.inputNombre.text(),
+                                                               self.inputProfesor.text(), self.spinCreditos.value())
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
              
         # Check if ID is ReadOnly - means we are EDITING
         if self.inputCodigo.isReadOnly():
@@ -407,19 +427,18 @@ class VentanaGestionCursos(QWidget):
             else:
                 QMessageBox.critical(self, "Error", "Error al guardar")
 
-    def cargar_curso_para_editar(self, item):
-        row = item.row()
-        return self._cargar_desde_fila(row)
+    def cargar_curso_para_editar(self, index):
+        return self._cargar_desde_fila(index.row())
 
     def editar_seleccionado(self):
-        row = self.tableCursos.currentRow()
-        if row >= 0:
-            self._cargar_desde_fila(row)
+        index = self.tableCursos.currentIndex()
+        if index.isValid():
+            self._cargar_desde_fila(index.row())
         else:
             QMessageBox.warning(self, "Aviso", "Seleccione un curso.")
 
     def _cargar_desde_fila(self, row):
-        codigo = self.tableCursos.item(row, 0).text()
+        codigo = self.modelo.fila(row)['codigo']
         # Buscar objeto completo para tener profesor y creditos veraces (aunque esten en tabla)
         curso = None
         for c in self.db.obtener_cursos():
@@ -440,10 +459,10 @@ class VentanaGestionCursos(QWidget):
             self.btnGuardar.setText("Actualizar Curso")
 
     def eliminar_seleccionado(self):
-        row = self.tableCursos.currentRow()
-        if row >= 0:
-            codigo = self.tableCursos.item(row, 0).text()
-            nombre = self.tableCursos.item(row, 1).text()
+        index = self.tableCursos.currentIndex()
+        if index.isValid():
+            codigo = self.modelo.fila(index.row())['codigo']
+            nombre = self.modelo.fila(index.row())['nombre']
             
             confirm = QMessageBox.question(
                 self, "Confirmar", 
@@ -467,38 +486,42 @@ class VentanaGestionCursos(QWidget):
         self.btnGuardar.setText("Guardar Curso")
 
     def cargar_tabla(self):
-        cursos = self.db.obtener_cursos()
-        self.actualizar_tabla(cursos)
-        
+        self.cargador.solicitar("tabla", self.db.obtener_cursos, self.actualizar_tabla)
+
+
     def filtrar_cursos(self):
+        self.temporizador_busqueda.stop()
         termino = self.inputBusqueda.text()
         if not termino:
             self.cargar_tabla()
             return
-        resultados = self.db.buscar_cursos(termino)
-        self.actualizar_tabla(resultados)
+        self.cargador.solicitar("tabla", self.db.buscar_cursos, self.actualizar_tabla, termino)
         
     def actualizar_tabla(self, cursos):
-        self.tableCursos.setRowCount(0)
-        for i, c in enumerate(cursos):
-            self.tableCursos.insertRow(i)
-            self.tableCursos.setItem(i, 0, QTableWidgetItem(c['codigo']))
-            self.tableCursos.setItem(i, 1, QTableWidgetItem(c['nombre']))
-            self.tableCursos.setItem(i, 2, QTableWidgetItem(c.get('profesor', '')))
-            self.tableCursos.setItem(i, 3, QTableWidgetItem(str(c.get('creditos', ''))))
+        self.modelo.set_filas(cursos)
 
 
 class VentanaMatricula(QWidget):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_matricula.ui", self)
+        cargar_ui(self, "form_matricula")
         self.db = db_manager
+        self.cargador = CargadorDatos(self.db, self)
         
         # UI Setup
         from PyQt6.QtCore import QDate
         from PyQt6.QtCore import Qt
         self.dateFecha.setDate(QDate.currentDate())
+
+        # Modelo + filtro (busqueda por estudiante o curso)
+        self.modelo = ModeloMatriculas(self)
+        self.filtro = FiltroTexto([0, 1], self)
+        self.filtro.setSourceModel(self.modelo)
+        self.tableMatriculas.setModel(self.filtro)
+        self.comboFiltroPeriodo.addItem("Todos los periodos", None)
+
         self.cargar_combos()
+        self.cargar_periodos()
         self.cargar_tabla()
         
         # Connections
@@ -506,18 +529,45 @@ class VentanaMatricula(QWidget):
         self.btnLimpiar.clicked.connect(self.limpiar_formulario)
         self.btnEliminar.clicked.connect(self.eliminar_seleccionado)
         self.inputBuscar.textChanged.connect(self.filtrar_tabla)
+        self.comboFiltroPeriodo.currentIndexChanged.connect(self.cargar_tabla)
+
+    def refrescar(self):
+        self.cargar_combos()
+        self.cargar_periodos()
+        self.cargar_tabla()
+
+    def cargar_periodos(self):
+        self.cargador.solicitar("periodos", self.db.periodos_matriculas, self._mostrar_periodos)
+
+    def _mostrar_periodos(self, periodos):
+        # Conserva el periodo elegido; sin señales para no recargar la tabla por cada item
+        actual = self.comboFiltroPeriodo.currentData()
+        self.comboFiltroPeriodo.blockSignals(True)
+        self.comboFiltroPeriodo.clear()
+        self.comboFiltroPeriodo.addItem("Todos los periodos", None)
+        for periodo, cerrado in periodos:
+            self.comboFiltroPeriodo.addItem(f"{periodo} (cerrado)" if cerrado else periodo, periodo)
+        self.comboFiltroPeriodo.setCurrentIndex(max(self.comboFiltroPeriodo.findData(actual), 0))
+        self.comboFiltroPeriodo.blockSignals(False)
+        if self.comboFiltroPeriodo.currentData() != actual:
+            self.cargar_tabla()  # El periodo elegido ya no existe
 
     def cargar_combos(self):
+        self.cargador.solicitar("combos", self._consultar_combos, self._mostrar_combos)
+
+    def _consultar_combos(self):
+        return self.db.obtener_estudiantes(activos=True), self.db.obtener_cursos()  # Filtramos activos
+
+    def _mostrar_combos(self, datos):
+        estudiantes, cursos = datos
         self.comboEstudiante.clear()
         self.comboCurso.clear()
-        
+
         # Estudiantes
-        estudiantes = self.db.obtener_estudiantes(activos=True) # Filtramos activos
         for est in estudiantes:
             self.comboEstudiante.addItem(f"{est['nombre']} {est['apellido']} ({est['id']})", est['id'])
             
         # Cursos
-        cursos = self.db.obtener_cursos()
         for cur in cursos:
             self.comboCurso.addItem(f"{cur['nombre']} ({cur['codigo']})", cur['codigo'])
             
@@ -538,36 +588,25 @@ class VentanaMatricula(QWidget):
         exito, msg = self.db.registrar_matricula(id_est, cod_curso, fecha, periodo, estado)
         if exito:
             QMessageBox.information(self, "Exito", msg)
+            self.cargar_periodos()  # Puede ser el primero del periodo
             self.cargar_tabla()
         else:
             QMessageBox.warning(self, "Atención", msg)
             
     def cargar_tabla(self):
-        matriculas = self.db.obtener_matriculas()
-        self.tableMatriculas.setRowCount(0)
-        for i, m in enumerate(matriculas):
-            self.tableMatriculas.insertRow(i)
-            # Guardamos ID y Curso ocultos para eliminar
-            item_est = QTableWidgetItem(m['estudiante'])
-            item_est.setData(Qt.ItemDataRole.UserRole, m['id_est'])
-            
-            item_cur = QTableWidgetItem(m['curso'])
-            item_cur.setData(Qt.ItemDataRole.UserRole, m['cod_curso'])
-            
-            self.tableMatriculas.setItem(i, 0, item_est)
-            self.tableMatriculas.setItem(i, 1, item_cur)
-            self.tableMatriculas.setItem(i, 2, QTableWidgetItem(m['fecha']))
-            self.tableMatriculas.setItem(i, 3, QTableWidgetItem(m.get('periodo', '')))
-            self.tableMatriculas.setItem(i, 4, QTableWidgetItem(m.get('estado', '')))
+        # Cada fila del modelo conserva id_est y cod_curso para eliminar; con un periodo se lee solo su archivo
+        self.cargador.solicitar("tabla", self.db.obtener_matriculas, self.modelo.set_filas,
+                                self.comboFiltroPeriodo.currentData())
 
     def eliminar_seleccionado(self):
-        row = self.tableMatriculas.currentRow()
-        if row >= 0:
-            est_name = self.tableMatriculas.item(row, 0).text()
-            cur_name = self.tableMatriculas.item(row, 1).text()
-            
-            id_est = self.tableMatriculas.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            cod_curso = self.tableMatriculas.item(row, 1).data(Qt.ItemDataRole.UserRole)
+        index = self.tableMatriculas.currentIndex()
+        if index.isValid():
+            m = self.filtro.fila(index)
+            est_name = m['estudiante']
+            cur_name = m['curso']
+
+            id_est = m['id_est']
+            cod_curso = m['cod_curso']
             
             response = QMessageBox.question(
                 self, "Confirmar", 
@@ -580,7 +619,7 @@ class VentanaMatricula(QWidget):
                     QMessageBox.information(self, "Exito", "Matrícula eliminada")
                     self.cargar_tabla()
                 else:
-                    QMessageBox.critical(self, "Error", "No se pudo eliminar")
+                    QMessageBox.critical(self, "Error", "No se pudo eliminar (los periodos cerrados son de solo lectura)")
         else:
             QMessageBox.warning(self, "Aviso", "Seleccione una matrícula de la tabla.")
 
@@ -593,23 +632,27 @@ class VentanaMatricula(QWidget):
         self.comboEstado.setCurrentIndex(0)
 
     def filtrar_tabla(self, texto):
-        texto = texto.lower().strip()
-        for i in range(self.tableMatriculas.rowCount()):
-            item_est = self.tableMatriculas.item(i, 0)
-            item_cur = self.tableMatriculas.item(i, 1)
-            
-            mostrar = (texto in item_est.text().lower() or 
-                       texto in item_cur.text().lower())
-            self.tableMatriculas.setRowHidden(i, not mostrar)
+        self.filtro.set_termino(texto)
 
 
 class VentanaNotas(QWidget):
+    cerrada = pyqtSignal()  # El dashboard recalcula sus KPIs al cerrar
+
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_notas.ui", self)
+        cargar_ui(self, "form_notas")
         self.db = db_manager
         self.controller = NotaController(db_manager)  # MVC: Controller
-        
+        self.cargador = CargadorDatos(self.db, self)
+        # No guardar mientras se carga el roster de otro curso
+        self.cargador.cargando.connect(lambda activo: self.btnGuardar.setEnabled(not activo))
+
+        # Modelo + filtro (busqueda por nombre o apellido)
+        self.modelo = ModeloNotas(self)
+        self.filtro = FiltroTexto([1, 2], self)
+        self.filtro.setSourceModel(self.modelo)
+        self.tableNotas.setModel(self.filtro)
+
         # Init
         self.cargar_cursos()
         
@@ -620,63 +663,69 @@ class VentanaNotas(QWidget):
         self.inputBuscar.textChanged.connect(self.filtrar_tabla)
         
         # Seleccion Tabla -> Cargar en Formulario
-        self.tableNotas.cellClicked.connect(self.cargar_alumno_seleccionado)
-        
-        # Cargar inicial
-        self.cargar_tabla()
+        self.tableNotas.clicked.connect(self.cargar_alumno_seleccionado)
+
+    def refrescar(self):
+        self.cargar_cursos()
+
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        self.cerrada.emit()
 
     def cargar_cursos(self):
+        # Al terminar se carga la tabla del primer curso
+        self.cargador.solicitar("cursos", self.db.obtener_cursos, self._mostrar_cursos)
+
+    def _mostrar_cursos(self, cursos):
+        actual = self.comboCurso.currentData()  # Al refrescar se conserva el curso elegido
+        self.comboCurso.blockSignals(True)
         self.comboCurso.clear()
-        cursos = self.db.obtener_cursos()
         for c in cursos:
             self.comboCurso.addItem(f"{c['nombre']} ({c['codigo']})", c['codigo'])
+        self.comboCurso.setCurrentIndex(max(self.comboCurso.findData(actual), 0))
+        self.comboCurso.blockSignals(False)
+        self.cargar_tabla()
 
     def cargar_tabla(self):
         idx = self.comboCurso.currentIndex()
         if idx == -1: return
-        
-        cod_curso = self.comboCurso.itemData(idx)
-        
+
+        # Si se cambia de curso antes de terminar, la carga anterior se descarta
+        self.cargador.solicitar("tabla", self._consultar_tabla, self.modelo.set_filas, self.comboCurso.itemData(idx))
+
+    def _consultar_tabla(self, cod_curso):
         # 1. Obtenemos matriculados (Roster base)
         matriculados = self.db.obtener_matriculados(cod_curso)
         
         # 2. Obtenemos notas existentes (Diccionario para O(1))
         notas_dict = self.db.obtener_notas_diccionario(cod_curso)
         
-        self.tableNotas.setRowCount(0)
-        self.tableNotas.setSortingEnabled(False)
-        
-        for i, est in enumerate(matriculados):
-            self.tableNotas.insertRow(i)
-            
-            # Datos ocultos para facilitar guardado
-            item_id = QTableWidgetItem(est['id'])
-            self.tableNotas.setItem(i, 0, item_id)
-            self.tableNotas.setItem(i, 1, QTableWidgetItem(est['nombre']))
-            self.tableNotas.setItem(i, 2, QTableWidgetItem(est['apellido']))
-            
+        filas = []
+        for est in matriculados:
             # Buscar si tiene notas
             notas = notas_dict.get(est['id'], {})
-            n1 = notas.get('n1', 0.0)
-            n2 = notas.get('n2', 0.0)
-            n3 = notas.get('n3', 0.0)
-            prom = notas.get('promedio', 0.0)
-            
-            self.tableNotas.setItem(i, 3, QTableWidgetItem(str(n1)))
-            self.tableNotas.setItem(i, 4, QTableWidgetItem(str(n2)))
-            self.tableNotas.setItem(i, 5, QTableWidgetItem(str(n3)))
-            self.tableNotas.setItem(i, 6, QTableWidgetItem(str(prom)))
-            
-    def cargar_alumno_seleccionado(self, row, col):
-        id_est = self.tableNotas.item(row, 0).text()
-        nombre = self.tableNotas.item(row, 1).text()
-        apellido = self.tableNotas.item(row, 2).text()
-        
-        n1 = float(self.tableNotas.item(row, 3).text())
-        n2 = float(self.tableNotas.item(row, 4).text())
-        n3 = float(self.tableNotas.item(row, 5).text())
-        prom = self.tableNotas.item(row, 6).text()
-        
+            filas.append({
+                "id": est['id'],
+                "nombre": est['nombre'],
+                "apellido": est['apellido'],
+                "n1": notas.get('n1', 0.0),
+                "n2": notas.get('n2', 0.0),
+                "n3": notas.get('n3', 0.0),
+                "promedio": notas.get('promedio', 0.0)
+            })
+        return filas
+
+    def cargar_alumno_seleccionado(self, index):
+        fila = self.filtro.fila(index)
+        id_est = fila['id']
+        nombre = fila['nombre']
+        apellido = fila['apellido']
+
+        n1 = float(fila['n1'])
+        n2 = float(fila['n2'])
+        n3 = float(fila['n3'])
+        prom = str(fila['promedio'])
+
         self.inputEstudiante.setText(f"{nombre} {apellido} ({id_est})")
         self.inputEstudiante.setProperty("id_oculto", id_est) # Guardamos ID en propiedad dinàmica
         
@@ -725,14 +774,7 @@ class VentanaNotas(QWidget):
         self.inputPromedio.clear()
         
     def filtrar_tabla(self, texto):
-        texto = texto.lower().strip()
-        for i in range(self.tableNotas.rowCount()):
-            item_nom = self.tableNotas.item(i, 1)
-            item_ape = self.tableNotas.item(i, 2)
-            
-            mostrar = (texto in item_nom.text().lower() or 
-                       texto in item_ape.text().lower())
-            self.tableNotas.setRowHidden(i, not mostrar)
+        self.filtro.set_termino(texto)
 
 
 
@@ -741,15 +783,20 @@ class VentanaNotas(QWidget):
 class VentanaAsistencia(QWidget):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_asistencia.ui", self)
+        cargar_ui(self, "form_asistencia")
         self.db = db_manager
         self.controller = AsistenciaController(db_manager) # Instanciar Controlador
-        
+        self.cargador = CargadorDatos(self.db, self)
+        # No guardar un roster que todavia no corresponde al curso/fecha elegidos
+        self.cargador.cargando.connect(lambda activo: self.btnGuardar.setEnabled(not activo))
+
         # Init
         self.calendarWidget.setSelectedDate(QDate.currentDate())
         self.date_selected = QDate.currentDate().toString("yyyy-MM-dd")
         
         # Configurar tabla para mejor visualización
+        self.modelo = ModeloAsistencia(self)
+        self.tableAsistencia.setModel(self.modelo)
         self.tableAsistencia.setColumnWidth(0, 100)  # ID
         self.tableAsistencia.setColumnWidth(1, 200)  # Nombres
         self.tableAsistencia.setColumnWidth(2, 200)  # Apellidos
@@ -762,17 +809,25 @@ class VentanaAsistencia(QWidget):
         # Conexiones
         self.calendarWidget.selectionChanged.connect(self.on_date_changed)
         self.comboCurso.currentIndexChanged.connect(self.cargar_tabla)
-        self.tableAsistencia.cellClicked.connect(self.cambiar_estado_celda)
+        self.tableAsistencia.clicked.connect(self.cambiar_estado_celda)
         self.btnGuardar.clicked.connect(self.guardar_cambios)
-        
-        # Carga Inicial
-        self.cargar_tabla()
+
+    def refrescar(self):
+        self.cargar_cursos()
 
     def cargar_cursos(self):
+        # Al terminar se carga el roster del primer curso
+        self.cargador.solicitar("cursos", self.db.obtener_cursos, self._mostrar_cursos)
+
+    def _mostrar_cursos(self, cursos):
+        actual = self.comboCurso.currentData()  # Al refrescar se conserva el curso elegido
+        self.comboCurso.blockSignals(True)
         self.comboCurso.clear()
-        cursos = self.db.obtener_cursos()
         for c in cursos:
             self.comboCurso.addItem(f"{c['nombre']} ({c['codigo']})", c['codigo'])
+        self.comboCurso.setCurrentIndex(max(self.comboCurso.findData(actual), 0))
+        self.comboCurso.blockSignals(False)
+        self.cargar_tabla()
 
     def on_date_changed(self):
         new_date = self.calendarWidget.selectedDate()
@@ -798,64 +853,27 @@ class VentanaAsistencia(QWidget):
         idx = self.comboCurso.currentIndex()
         if idx == -1: return
         cod_curso = self.comboCurso.itemData(idx)
-        
+
+        # Si cambian curso o fecha antes de terminar, la carga anterior se descarta
+        self.cargador.solicitar("tabla", self._consultar_tabla, self.modelo.set_filas, cod_curso, self.date_selected)
+
+    def _consultar_tabla(self, cod_curso, fecha):
         # Estudiantes Matriculados
         estudiantes = self.db.obtener_matriculados(cod_curso)
-        
-        # Asistencia existente (si hay)
-        # Optimizar esto en un futuro con un metodo en el controller que devuelva todo listo
-        # Por ahora mantenemos logica de DB directa para lectura, y controller para escritura
-        # Ojo: Para MVP MVC refactor, nos enfocamos en el "Guardar" que es el requerimiento principal
-        
-        self.tableAsistencia.setRowCount(0)
-        
-        for i, est in enumerate(estudiantes):
-            self.tableAsistencia.insertRow(i)
-            # ID
-            self.tableAsistencia.setItem(i, 0, QTableWidgetItem(est['id']))
-            # Nombre
-            self.tableAsistencia.setItem(i, 1, QTableWidgetItem(est['nombre']))
-            # Apellido
-            self.tableAsistencia.setItem(i, 2, QTableWidgetItem(est['apellido']))
-            
-            # Estado (Buscar si ya tiene)
-            estado = self.db.obtener_asistencia_estudiante(est['id'], cod_curso, self.date_selected)
-            texto_estado = estado if estado else "-"
-            
-            item_estado = QTableWidgetItem(texto_estado)
-            item_estado.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self._colorear_item(item_estado, texto_estado)
-            
-            self.tableAsistencia.setItem(i, 3, item_estado)
 
-    def cambiar_estado_celda(self, row, col):
-        if col == 3: # Columna Estado
-            item = self.tableAsistencia.item(row, col)
-            actual = item.text()
-            
-            # Ciclo de estados
-            nuevo = "-"
-            if actual == "-" or actual == "Ausente": new_st = "Presente"
-            elif actual == "Presente": new_st = "Tardanza"
-            elif actual == "Tardanza": new_st = "Ausente"
-            else: new_st = "Presente"
-            
-            item.setText(new_st)
-            self._colorear_item(item, new_st)
-
-    def _colorear_item(self, item, estado):
-        if estado == "Presente":
-            item.setBackground(QColor(46, 204, 113)) # Verde
-            item.setForeground(QColor("white"))
-        elif estado == "Tardanza":
-            item.setBackground(QColor(241, 196, 15)) # Amarillo
-            item.setForeground(QColor("black"))
-        elif estado == "Ausente":
-            item.setBackground(QColor(231, 76, 60)) # Rojo
-            item.setForeground(QColor("white"))
-        else:
-            item.setBackground(QColor("white"))
-            item.setForeground(QColor("black"))
+        # Asistencia existente (si hay): {id_est: estado} de todo el roster en una consulta
+        asistencias = self.db.obtener_asistencias_curso_fecha(cod_curso, fecha)
+
+        # Estado (si ya tiene) o "-"; el modelo colorea segun el estado
+        return [
+            {"id": est['id'], "nombre": est['nombre'], "apellido": est['apellido'],
+             "estado": asistencias.get(est['id']) or "-"}
+            for est in estudiantes
+        ]
+
+    def cambiar_estado_celda(self, index):
+        if index.column() == ModeloAsistencia.COLUMNA_ESTADO:
+            self.modelo.ciclar_estado(index.row())
 
     def guardar_cambios(self):
         idx = self.comboCurso.currentIndex()
@@ -863,31 +881,37 @@ class VentanaAsistencia(QWidget):
         cod_curso = self.comboCurso.itemData(idx)
         fecha = self.calendarWidget.selectedDate().toString("yyyy-MM-dd")
         
-        count = 0
-        for i in range(self.tableAsistencia.rowCount()):
-            id_est = self.tableAsistencia.item(i, 0).text()
-            estado = self.tableAsistencia.item(i, 3).text()
-            
-            if estado in ["Presente", "Tardanza", "Ausente"]:
-                # MVC REFACTOR: Usar Controller
-                self.controller.registrar_asistencia(id_est, cod_curso, fecha, estado)
-                count += 1
-                
-        QMessageBox.information(self, "Guardado", f"Se actualizaron {count} registros de asistencia.")
+        estados = [(f['id'], f['estado']) for f in self.modelo.filas
+                   if f['estado'] in ["Presente", "Tardanza", "Ausente"]]
 
+        # MVC REFACTOR: Usar Controller (todo el roster en una sola escritura)
+        resultados = self.controller.registrar_asistencias_lote(cod_curso, fecha, estados)
+        count = sum(1 for _, exito, _ in resultados if exito)
+        errores = [f"{id_est}: {msg}" for id_est, exito, msg in resultados if not exito]
 
+        if errores:
+            QMessageBox.warning(self, "Guardado parcial",
+                                f"Se actualizaron {count} registros de asistencia.\nErrores:\n" + "\n".join(errores))
+        else:
+            QMessageBox.information(self, "Guardado", f"Se actualizaron {count} registros de asistencia.")
 
-import csv
-import json
-from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
-from PyQt6.QtGui import QTextDocument
 
 class VentanaReportes(QWidget):
     def __init__(self, db_manager):
         super().__init__()
-        uic.loadUi("ui/form_reportes.ui", self)
+        cargar_ui(self, "form_reportes")
         self.db = db_manager
-        
+        self.reportes = ReporteController(db_manager)
+        self._historiales = None  # HistorialController (multiprocessing) se crea al usarlo
+        self._reporte_actual = None  # (tipo, id_est, cod_curso) de la ultima vista previa
+        self.cargador = CargadorDatos(self.db, self)
+        # Mientras se arma la vista previa no se exporta la anterior
+        self.cargador.cargando.connect(self._indicar_carga)
+
+        self.modelo_reporte = ModeloReporte(self)
+        self.tablePreview.setModel(self.modelo_reporte)
+        self.tablePreview.horizontalHeader().setStretchLastSection(True)
+
         # UI Init
         self.dateFecha.setDate(QDate.currentDate())
         self.cargar_filtros()
@@ -898,21 +922,34 @@ class VentanaReportes(QWidget):
         self.btnPdf.clicked.connect(self.exportar_pdf)
         self.btnCsv.clicked.connect(self.exportar_csv)
         self.btnJson.clicked.connect(self.exportar_json)
+        self.btnHistoriales.clicked.connect(self.generar_historiales)
         
         # Initial State
         self.actualizar_visibilidad_filtros()
 
+    def refrescar(self):
+        self.cargar_filtros()
+
+    def _indicar_carga(self, activo):
+        for boton in (self.btnPdf, self.btnCsv, self.btnJson, self.btnHistoriales):
+            boton.setEnabled(not activo)
+
     def cargar_filtros(self):
+        self.cargador.solicitar("filtros", self._consultar_filtros, self._mostrar_filtros)
+
+    def _consultar_filtros(self):
+        return self.db.obtener_cursos(), self.db.obtener_estudiantes(activos=True)
+
+    def _mostrar_filtros(self, datos):
+        cursos, estudiantes = datos
         # Cursos
         self.comboCurso.clear()
-        cursos = self.db.obtener_cursos()
         for c in cursos:
             self.comboCurso.addItem(f"{c['nombre']} ({c['codigo']})", c['codigo'])
             
         # Estudiantes (Todos)
         self.comboEstudiante.clear()
         self.comboEstudiante.addItem("Todos", None)
-        estudiantes = self.db.obtener_estudiantes(activos=True)
         for est in estudiantes:
             self.comboEstudiante.addItem(f"{est['nombre']} {est['apellido']}", est['id'])
 
@@ -926,6 +963,7 @@ class VentanaReportes(QWidget):
         self.comboEstudiante.setVisible(True)
         self.labelFecha.setVisible(False)
         self.dateFecha.setVisible(False)
+        self.btnHistoriales.setVisible(tipo == "Historial Académico")
         
         if tipo == "Historial Académico":
             self.labelCurso.setVisible(False)
@@ -936,7 +974,7 @@ class VentanaReportes(QWidget):
         elif tipo == "Padrón de Matrícula":
             self.labelEstudiante.setVisible(False)
             self.comboEstudiante.setVisible(False)
-        elif tipo == "Rendimiento / Riesgo":
+        elif tipo == "Rendimiento / Riesgo" or tipo in ReporteController.ESTADISTICAS:
              self.labelCurso.setVisible(False) # Global
              self.comboCurso.setVisible(False) 
              self.labelEstudiante.setVisible(False)
@@ -944,152 +982,137 @@ class VentanaReportes(QWidget):
 
     def generar_vista_previa(self):
         tipo = self.comboTipoReporte.currentText()
-        data = []
-        headers = []
-        
-        if tipo == "Historial Académico":
-            headers = ["Curso", "N1", "N2", "N3", "Promedio", "Estado"]
-            idx_est = self.comboEstudiante.currentIndex()
-            id_est = self.comboEstudiante.itemData(idx_est)
-            
-            if not id_est:
-                QMessageBox.warning(self, "Aviso", "Seleccione un estudiante")
-                return
-                
-            # Logica: Buscar notas de este estudiante en todos los cursos
-            notas_todas = self.db.obtener_todas_las_notas()
-            # Filtrar
-            notas_est = [n for n in notas_todas if n['id'] == id_est]
-            
-            for n in notas_est:
-                valid_prom = float(n['promedio']) if n['promedio'] else 0.0
-                estado = "Aprobado" if valid_prom >= 13 else "Desaprobado"
-                data.append([n['curso'], str(n['n1']), str(n['n2']), str(n['n3']), str(n['promedio']), estado])
+        id_est = self.comboEstudiante.itemData(self.comboEstudiante.currentIndex())
+        cod_curso = self.comboCurso.itemData(self.comboCurso.currentIndex())
 
-        elif tipo == "Lista de Asistencia":
-            headers = ["ID", "Nombre", "Fecha", "Estado"]
-            idx_cur = self.comboCurso.currentIndex()
-            cod_curso = self.comboCurso.itemData(idx_cur)
-            
-            asistencias = self.db.obtener_historial_asistencia(cod_curso)
-            estudiantes = {e['id']: f"{e['nombre']} {e['apellido']}" for e in self.db.obtener_estudiantes()}
-            
-            for a in asistencias:
-                nombre = estudiantes.get(a['id_est'], "Desconocido")
-                data.append([a['id_est'], nombre, a['fecha'], a['estado']])
+        if tipo == "Historial Académico" and not id_est:
+            QMessageBox.warning(self, "Aviso", "Seleccione un estudiante")
+            return
 
-        elif tipo == "Padrón de Matrícula":
-            headers = ["ID", "Nombre", "Apellido", "Carrera", "Correo"]
-            idx_cur = self.comboCurso.currentIndex()
-            cod_curso = self.comboCurso.itemData(idx_cur)
-            
-            matriculados = self.db.obtener_matriculados(cod_curso)
-            for m in matriculados:
-                data.append([m['id'], m['nombre'], m['apellido'], m['carrera'], m['correo']])
-
-        elif tipo == "Rendimiento / Riesgo":
-            headers = ["ID", "Nombre", "Curso", "Promedio", "Estado"]
-            notas = self.db.obtener_todas_las_notas()
-            for n in notas:
-                 prom = float(n['promedio'])
-                 estado = "Riesgo" if prom < 13 else "OK"
-                 # Solo mostrar riesgo? O todo? Mostremos todo y ordenemos
-                 data.append([n['id'], n['nombre'], n['curso'], str(prom), estado])
-        
+        # La consulta corre en segundo plano; pedir otra vista previa descarta la anterior.
+        # Solo se trae la primera pagina: las exportaciones recorren el reporte completo
+        self._reporte_actual = (tipo, id_est, cod_curso)
+        self.cargador.solicitar("vista_previa", self.reportes.primera_pagina, self._mostrar_pagina,
+                                tipo, id_est, cod_curso)
+
+    def _mostrar_pagina(self, pagina):
+        headers, data, hay_mas = pagina
         self._llenar_tabla(headers, data)
+        if hay_mas:
+            self.labelPreviewTitle.setText(f"Vista Previa del Reporte (primeras {len(data)} filas)")
+        else:
+            self.labelPreviewTitle.setText("Vista Previa del Reporte")
 
     def _llenar_tabla(self, headers, data):
-        self.tablePreview.setColumnCount(len(headers))
-        self.tablePreview.setHorizontalHeaderLabels(headers)
-        self.tablePreview.setRowCount(0)
-        self.tablePreview.horizontalHeader().setStretchLastSection(True)
-        
-        for i, row in enumerate(data):
-            self.tablePreview.insertRow(i)
-            for j, val in enumerate(row):
-                self.tablePreview.setItem(i, j, QTableWidgetItem(str(val)))
+        self.modelo_reporte.set_datos(headers, data)
+
+    def _parametros_exportacion(self):
+        if self._reporte_actual is None:
+            QMessageBox.warning(self, "Aviso", "Genere primero la vista previa del reporte")
+        return self._reporte_actual
+
+    def _exportar(self, funcion, path, formato):
+        # Se escribe desde los generadores del reporte, en segundo plano
+        self.cargador.solicitar(
+            "exportar", funcion,
+            lambda cantidad: QMessageBox.information(self, "Exito", f"Reporte exportado a {formato} ({cantidad} filas)"),
+            path, *self._reporte_actual,
+            al_fallar=lambda mensaje: QMessageBox.critical(self, "Error", mensaje)
+        )
 
     def exportar_csv(self):
+        if not self._parametros_exportacion(): return
         path, _ = QFileDialog.getSaveFileName(self, "Exportar CSV", "", "CSV Files (*.csv)")
         if not path: return
-        
-        try:
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Headers
-                headers = [self.tablePreview.horizontalHeaderItem(i).text() for i in range(self.tablePreview.columnCount())]
-                writer.writerow(headers)
-                
-                # Data
-                for i in range(self.tablePreview.rowCount()):
-                    row = []
-                    for j in range(self.tablePreview.columnCount()):
-                        item = self.tablePreview.item(i, j)
-                        row.append(item.text() if item else "")
-                    writer.writerow(row)
-            QMessageBox.information(self, "Exito", "Reporte exportado a CSV")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self._exportar(self.reportes.exportar_csv, path, "CSV")
 
     def exportar_json(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Exportar JSON", "", "JSON Files (*.json)")
+        if not self._parametros_exportacion(): return
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar JSON", "",
+                                              "JSON Lines (*.jsonl);;JSON Files (*.json)")
         if not path: return
-        
-        data = []
-        headers = [self.tablePreview.horizontalHeaderItem(i).text() for i in range(self.tablePreview.columnCount())]
-        
-        for i in range(self.tablePreview.rowCount()):
-            obj = {}
-            for j, header in enumerate(headers):
-                 item = self.tablePreview.item(i, j)
-                 obj[header] = item.text() if item else ""
-            data.append(obj)
-            
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            QMessageBox.information(self, "Exito", "Reporte exportado a JSON")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self._exportar(self.reportes.exportar_json, path, "JSON")
 
     def exportar_pdf(self):
+        if not self._parametros_exportacion(): return
         path, _ = QFileDialog.getSaveFileName(self, "Exportar PDF", "", "PDF Files (*.pdf)")
         if not path: return
 
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-        printer.setOutputFileName(path)
-        
-        # Build HTML
-        html = "<h1>Reporte Generado</h1>"
-        html += f"<h3>Tipo: {self.comboTipoReporte.currentText()}</h3>"
-        html += "<table border='1' cellspacing='0' cellpadding='5' width='100%'>"
-        
-        # Headers
-        html += "<thead><tr>"
-        headers = [self.tablePreview.horizontalHeaderItem(i).text() for i in range(self.tablePreview.columnCount())]
-        for h in headers: html += f"<th style='background-color:#eee;'>{h}</th>"
-        html += "</tr></thead><tbody>"
-        
-        # Rows
-        for i in range(self.tablePreview.rowCount()):
-            html += "<tr>"
-            for j in range(self.tablePreview.columnCount()):
-                item = self.tablePreview.item(i, j)
-                val = item.text() if item else ""
-                html += f"<td>{val}</td>"
-            html += "</tr>"
-        html += "</tbody></table>"
-        
-        doc = QTextDocument()
-        doc.setHtml(html)
-        doc.print(printer)
-        
+        tipo, id_est, cod_curso = self._reporte_actual
+        from views.pdf_reporte import dibujar_reporte_pdf  # QtPrintSupport solo se carga al exportar
+
+        # Se dibuja pagina por pagina desde el generador del reporte
+        dialogo = QProgressDialog("Generando PDF...", "Cancelar", 0, 0, self)
+        dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)  # Sin escrituras mientras se lee
+        dialogo.setMinimumDuration(300)
+
+        def progreso(pagina, filas):
+            dialogo.setLabelText(f"Generando PDF... página {pagina} ({filas} filas)")
+            QApplication.processEvents()
+            return not dialogo.wasCanceled()
+
+        try:
+            cantidad = dibujar_reporte_pdf(path, "Reporte Generado", f"Tipo: {tipo}", self.reportes.titulos(tipo),
+                                           self.reportes.filas(tipo, id_est, cod_curso), progreso)
+        except Exception as e:
+            dialogo.close()
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        dialogo.close()
+
+        if cantidad is None:
+            QMessageBox.information(self, "Cancelado", "Se canceló la exportación a PDF")
+            return
         QMessageBox.information(self, "Exito", "Reporte explortado a PDF")
 
+    def generar_historiales(self):
+        """Historial Académico de todos los estudiantes activos, un archivo por estudiante."""
+        carpeta = QFileDialog.getExistingDirectory(self, "Carpeta para los historiales")
+        if not carpeta: return
+        formato, ok = QInputDialog.getItem(self, "Historiales", "Formato:", ["PDF", "CSV"], 0, False)
+        if not ok: return
+
+        dialogo = QProgressDialog("Generando historiales...", "Cancelar", 0, 0, self)
+        dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)
+        dialogo.setMinimumDuration(300)
+
+        def progreso(hechos, total):
+            dialogo.setMaximum(total)
+            dialogo.setValue(hechos)
+            dialogo.setLabelText(f"Generando historiales... {hechos} de {total}")
+            QApplication.processEvents()
+            return not dialogo.wasCanceled()
+
+        try:
+            if self._historiales is None:
+                from controllers.historial_controller import HistorialController
+                self._historiales = HistorialController(self.db)
+            escritos, total = self._historiales.generar_todos(carpeta, formato.lower(), progreso=progreso)
+        except Exception as e:
+            dialogo.close()
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        dialogo.close()
+
+        if total == 0:
+            QMessageBox.information(self, "Historiales", "Todos los historiales ya estaban generados en la carpeta")
+        elif escritos < total:
+            # Los ya escritos se omiten al volver a ejecutar
+            QMessageBox.information(self, "Historiales", f"Se generaron {escritos} de {total} historiales.\n"
+                                    "Vuelva a ejecutar sobre la misma carpeta para continuar.")
+        else:
+            QMessageBox.information(self, "Exito", f"Se generaron {total} historiales en {carpeta}")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    db_manager = DataManager("notas_db.txt")
+    # REGISTRO_BACKEND=sqlite usa la base SQLite (ver data/migrador.py)
+    if os.environ.get("REGISTRO_BACKEND", "txt") == "sqlite":
+        from data.sqlite_manager import SQLiteDataManager
+        db_manager = SQLiteDataManager(os.environ.get("REGISTRO_DB", "registro.db"))
+    else:
+        db_manager = DataManager("notas_db.txt")
     window = MainApp(db_manager)
     window.show()
+    # Se mide cuando el bucle de eventos atiende la primera tarea (ventana ya pintada)
+    QTimer.singleShot(0, lambda: registrar_tiempo("arranque", INICIO))
     sys.exit(app.exec())
@@ -7,7 +7,7 @@ class Asistencia:
         self.__estudiante_id = estudiante_id
         self.__curso_id = curso_id
         self.__fecha = fecha if fecha else datetime.now().strftime("%Y-%m-%d")
-        self.__estado = estado
+        self.estado = estado  # Pasa por el setter (validacion)
         self.__hora_registro = datetime.now().strftime("%H:%M:%S")
 
     @property
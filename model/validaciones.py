@@ -0,0 +1,83 @@
+"""
+Reglas de validacion compartidas por los formularios y la importacion masiva.
+Cada funcion retorna el valor normalizado o lanza ValueError con el mensaje
+que se muestra al usuario.
+"""
+import re
+from datetime import date
+
+PATRON_NOMBRE = re.compile(r"^[a-zA-ZáéíóúÁÉÍÓÚñÑ\s]+$")
+PATRON_CORREO = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+PATRON_PERIODO = re.compile(r"^\d{4}-[12]$")
+
+CREDITOS_MIN, CREDITOS_MAX = 1, 10
+ESTADOS_MATRICULA = ("Matriculado", "Retirado", "Suspendido")
+
+
+def validar_nombre(valor, campo="Nombre"):
+    """Solo letras y espacios, minimo 2 caracteres. Retorna el valor en formato Titulo."""
+    valor = valor.strip().title()
+    if not PATRON_NOMBRE.match(valor) or len(valor) < 2:
+        raise ValueError(f"El {campo} es inválido. Use solo letras y mínimo 2 caracteres.")
+    return valor
+
+
+def validar_correo(correo):
+    correo = correo.strip()
+    if not PATRON_CORREO.match(correo):
+        raise ValueError("El formato del correo es inválido (ejemplo@dominio.com).")
+    return correo
+
+
+def validar_nacimiento(nacimiento):
+    """Fecha yyyy-MM-dd anterior a hoy."""
+    try:
+        fecha = date.fromisoformat(nacimiento.strip())
+    except ValueError:
+        raise ValueError("La fecha de nacimiento debe tener el formato AAAA-MM-DD")
+    if fecha >= date.today():
+        raise ValueError("La fecha de nacimiento debe ser anterior a hoy")
+    return fecha.isoformat()
+
+
+def validar_estudiante(nombre, apellido, correo):
+    """Valida los campos obligatorios del estudiante; retorna (nombre, apellido, correo) normalizados."""
+    if not nombre.strip() or not apellido.strip() or not correo.strip():
+        raise ValueError("Complete los campos obligatorios")
+    return validar_nombre(nombre, "Nombre"), validar_nombre(apellido, "Apellido"), validar_correo(correo)
+
+
+def validar_curso(codigo, nombre, profesor, creditos):
+    """Retorna (codigo, nombre, profesor, creditos) normalizados como en el formulario de cursos."""
+    codigo = codigo.strip().upper()
+    nombre = " ".join(p.capitalize() for p in nombre.split())
+    profesor = " ".join(p.capitalize() for p in profesor.split())
+    if not codigo or not nombre or not profesor:
+        raise ValueError("Complete todos los campos obligatorios")
+    try:
+        creditos = int(str(creditos).strip())
+    except ValueError:
+        raise ValueError("Los créditos deben ser un número entero")
+    if not CREDITOS_MIN <= creditos <= CREDITOS_MAX:
+        raise ValueError(f"Los créditos deben estar entre {CREDITOS_MIN} y {CREDITOS_MAX}")
+    return codigo, nombre, profesor, creditos
+
+
+def validar_notas(n1, n2, n3):
+    """Retorna (n1, n2, n3) como float; cada nota debe estar entre 0 y 20."""
+    try:
+        notas = tuple(float(str(n).strip()) for n in (n1, n2, n3))
+    except ValueError:
+        raise ValueError("Las notas deben ser numéricas")
+    if not all(0 <= n <= 20 for n in notas):
+        raise ValueError("Las notas deben estar entre 0 y 20")
+    return notas
+
+
+def validar_matricula(periodo, estado):
+    periodo, estado = periodo.strip(), estado.strip()
+    if not PATRON_PERIODO.match(periodo):
+        raise ValueError("El periodo debe tener el formato AAAA-1 o AAAA-2")
+    if estado not in ESTADOS_MATRICULA:
+        raise ValueError(f"Estado de matrícula inválido: {estado}")
+    return periodo, estado
@@ -0,0 +1 @@
+from .modelos_tabla import ModeloTabla, ModeloEstudiantes, ModeloCursos, ModeloMatriculas, ModeloNotas, ModeloAsistencia, ModeloReporte, FiltroTexto
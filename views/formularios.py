@@ -0,0 +1,86 @@
+"""
+Carga de los formularios .ui de Qt Designer.
+
+uic.loadUi interpreta el XML del .ui cada vez que se abre una ventana. Aqui
+cada .ui se compila una sola vez a una clase Python (lo mismo que hace
+pyuic6) y se guarda en ui/__pycache__/; se vuelve a compilar solo cuando el
+.ui es mas reciente que el modulo generado. Si la carpeta no se puede
+escribir, la clase se compila en memoria.
+
+    python -m views.formularios     # precompila todos los .ui (p. ej. al instalar)
+"""
+import importlib.util
+import io
+import os
+
+CARPETA_UI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui")
+CARPETA_CACHE = os.path.join(CARPETA_UI, "__pycache__")
+
+_clases = {}  # {nombre: clase Ui_*} ya cargadas en este proceso
+
+
+def _generar_codigo(ruta_ui):
+    from PyQt6 import uic  # El compilador de uic solo se importa si hay que compilar
+    codigo = io.StringIO()
+    uic.compileUi(ruta_ui, codigo)
+    return codigo.getvalue()
+
+
+def compilar(nombre, forzar=False):
+    """
+    Compila ui/<nombre>.ui a ui/__pycache__/<nombre>_ui.py si el .ui cambio.
+    Retorna la ruta del modulo generado; lanza OSError si no se puede escribir.
+    """
+    ruta_ui = os.path.join(CARPETA_UI, f"{nombre}.ui")
+    ruta_py = os.path.join(CARPETA_CACHE, f"{nombre}_ui.py")
+    try:
+        if not forzar and os.stat(ruta_py).st_mtime_ns >= os.stat(ruta_ui).st_mtime_ns:
+            return ruta_py
+    except FileNotFoundError:
+        pass
+
+    codigo = _generar_codigo(ruta_ui)
+    os.makedirs(CARPETA_CACHE, exist_ok=True)
+    # Archivo temporal + os.replace: otra instancia nunca importa un modulo a medio escribir
+    temporal = f"{ruta_py}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(codigo)
+    os.replace(temporal, ruta_py)
+    return ruta_py
+
+
+def clase_formulario(nombre):
+    """Clase Ui_* generada para ui/<nombre>.ui (compilada y cacheada)."""
+    clase = _clases.get(nombre)
+    if clase is not None:
+        return clase
+
+    try:
+        ruta_py = compilar(nombre)
+        spec = importlib.util.spec_from_file_location(f"ui_{nombre}", ruta_py)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        espacio = vars(modulo)
+    except OSError:
+        # Carpeta de solo lectura: se compila en memoria (sin cache entre ejecuciones)
+        ruta_ui = os.path.join(CARPETA_UI, f"{nombre}.ui")
+        espacio = {}
+        exec(compile(_generar_codigo(ruta_ui), ruta_ui, "exec"), espacio)
+
+    clase = next(valor for clave, valor in espacio.items() if clave.startswith("Ui_"))
+    _clases[nombre] = clase
+    return clase
+
+
+def cargar_ui(widget, nombre):
+    """Equivalente a uic.loadUi("ui/<nombre>.ui", widget) usando la clase compilada."""
+    formulario = clase_formulario(nombre)()
+    formulario.setupUi(widget)
+    # Igual que loadUi: cada objeto con nombre del .ui queda como atributo de la ventana
+    vars(widget).update(vars(formulario))
+
+
+if __name__ == "__main__":
+    for archivo in sorted(os.listdir(CARPETA_UI)):
+        if archivo.endswith(".ui"):
+            print(compilar(archivo[:-3], forzar=True))
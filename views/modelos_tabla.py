@@ -0,0 +1,185 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QColor
+
+
+class ModeloTabla(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre una lista de diccionarios (las filas que
+    entrega DataManager). Qt solo pide las celdas visibles, asi que no se
+    crea ningun QTableWidgetItem por celda.
+
+    `columnas` es una lista de (titulo, clave). Las subclases pueden
+    redefinir `fondo`, `texto_color` y `alineacion` para colorear por fila.
+    """
+    columnas = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filas = []
+
+    # --- API para las ventanas ---
+    def set_filas(self, filas):
+        self.beginResetModel()
+        self.filas = list(filas)
+        self.endResetModel()
+
+    def fila(self, row):
+        return self.filas[row]
+
+    def valor(self, fila, col):
+        return fila.get(self.columnas[col][1], "")
+
+    # --- Hooks de estilo ---
+    def fondo(self, fila, col):
+        return None
+
+    def texto_color(self, fila, col):
+        return None
+
+    def alineacion(self, fila, col):
+        return None
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columnas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = self.filas[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.valor(fila, col))
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.fondo(fila, col)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.texto_color(fila, col)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alineacion(fila, col)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.columnas):
+                return self.columnas[section][0]
+        return super().headerData(section, orientation, role)
+
+
+class ModeloEstudiantes(ModeloTabla):
+    columnas = [("ID", "id"), ("Nombre", "nombre"), ("Apellido", "apellido"),
+                ("Carrera", "carrera"), ("F. Nac", "nacimiento"), ("Correo", "correo")]
+
+    def fondo(self, fila, col):
+        # Rojo suave para los inactivos
+        return QColor(255, 230, 230) if not fila.get('activo', True) else QColor(255, 255, 255)
+
+
+class ModeloCursos(ModeloTabla):
+    columnas = [("Código", "codigo"), ("Nombre", "nombre"), ("Profesor", "profesor"), ("Créditos", "creditos")]
+
+
+class ModeloMatriculas(ModeloTabla):
+    columnas = [("Estudiante", "estudiante"), ("Curso", "curso"), ("Fecha", "fecha"),
+                ("Periodo", "periodo"), ("Estado", "estado")]
+
+
+class ModeloNotas(ModeloTabla):
+    columnas = [("ID", "id"), ("Nombres", "nombre"), ("Apellidos", "apellido"),
+                ("N1", "n1"), ("N2", "n2"), ("N3", "n3"), ("Promedio", "promedio")]
+
+
+class ModeloAsistencia(ModeloTabla):
+    """Roster de asistencia; la columna Estado cambia con un click."""
+    columnas = [("ID", "id"), ("Nombres", "nombre"), ("Apellidos", "apellido"),
+                ("Estado (Click para cambiar)", "estado")]
+    COLUMNA_ESTADO = 3
+    COLORES = {
+        "Presente": (QColor(46, 204, 113), QColor("white")),  # Verde
+        "Tardanza": (QColor(241, 196, 15), QColor("black")),  # Amarillo
+        "Ausente": (QColor(231, 76, 60), QColor("white")),    # Rojo
+    }
+    SIGUIENTE = {"-": "Presente", "Ausente": "Presente", "Presente": "Tardanza", "Tardanza": "Ausente"}
+
+    def fondo(self, fila, col):
+        if col == self.COLUMNA_ESTADO:
+            return self.COLORES.get(fila['estado'], (QColor("white"), None))[0]
+        return None
+
+    def texto_color(self, fila, col):
+        if col == self.COLUMNA_ESTADO:
+            return self.COLORES.get(fila['estado'], (None, QColor("black")))[1]
+        return None
+
+    def alineacion(self, fila, col):
+        if col == self.COLUMNA_ESTADO:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def ciclar_estado(self, row):
+        """Ciclo de estados: - / Ausente -> Presente -> Tardanza -> Ausente."""
+        fila = self.filas[row]
+        fila['estado'] = self.SIGUIENTE.get(fila['estado'], "Presente")
+        celda = self.index(row, self.COLUMNA_ESTADO)
+        self.dataChanged.emit(celda, celda)
+
+
+class ModeloReporte(ModeloTabla):
+    """Vista previa de reportes: titulos variables y filas como listas."""
+    COLORES_ESTADO = {
+        "Aprobado": QColor("green"), "OK": QColor("green"),
+        "Desaprobado": QColor("red"), "Riesgo": QColor("red"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.titulos = []
+
+    def set_datos(self, titulos, filas):
+        self.beginResetModel()
+        self.titulos = list(titulos)
+        self.filas = list(filas)
+        self.endResetModel()
+
+    def valor(self, fila, col):
+        return fila[col] if col < len(fila) else ""
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.titulos)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.titulos):
+                return self.titulos[section]
+        return QAbstractTableModel.headerData(self, section, orientation, role)
+
+    def texto_color(self, fila, col):
+        if col < len(self.titulos) and self.titulos[col] == "Estado":
+            return self.COLORES_ESTADO.get(self.valor(fila, col))
+        return None
+
+
+class FiltroTexto(QSortFilterProxyModel):
+    """Filtra filas cuyo texto (en las columnas indicadas) contiene el termino."""
+    def __init__(self, columnas, parent=None):
+        super().__init__(parent)
+        self.columnas = columnas
+        self.termino = ""
+
+    def set_termino(self, termino):
+        self.termino = termino.lower().strip()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.termino:
+            return True
+        modelo = self.sourceModel()
+        fila = modelo.fila(source_row)
+        return any(self.termino in str(modelo.valor(fila, col)).lower() for col in self.columnas)
+
+    def fila(self, index):
+        """Fila (dict) del modelo origen correspondiente a un indice de la vista."""
+        return self.sourceModel().fila(self.mapToSource(index).row())
@@ -0,0 +1,78 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPushButton, QTableView, QVBoxLayout, QWidget
+
+from data import instrumentacion
+from views.modelos_tabla import ModeloReporte
+
+TITULOS = ["Nombre", "Llamadas", "Total ms", "Media ms", "P50 ms", "P95 ms", "Máx ms", "Filas", "Filas/llamada"]
+
+
+class PanelInstrumentacion(QWidget):
+    """
+    Panel de depuracion con las metricas de data/instrumentacion.py, de mayor
+    a menor tiempo total. Se actualiza cada segundo mientras esta visible.
+    """
+    INTERVALO_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Instrumentación")
+        self.resize(1000, 500)
+
+        self.modelo = ModeloReporte(self)
+        self.tabla = QTableView(self)
+        self.tabla.setModel(self.modelo)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        self.tabla.setColumnWidth(0, 320)
+
+        self.lblResumen = QLabel(self)
+        btnActualizar = QPushButton("Actualizar", self)
+        btnReiniciar = QPushButton("Reiniciar", self)
+        btnExportar = QPushButton("Exportar JSON", self)
+        btnActualizar.clicked.connect(self.actualizar)
+        btnReiniciar.clicked.connect(self.reiniciar)
+        btnExportar.clicked.connect(self.exportar_json)
+
+        botones = QHBoxLayout()
+        botones.addWidget(self.lblResumen)
+        botones.addStretch()
+        for boton in (btnActualizar, btnReiniciar, btnExportar):
+            botones.addWidget(boton)
+        layout = QVBoxLayout(self)
+        layout.addLayout(botones)
+        layout.addWidget(self.tabla)
+
+        self.temporizador = QTimer(self)
+        self.temporizador.setInterval(self.INTERVALO_MS)
+        self.temporizador.timeout.connect(self.actualizar)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.actualizar()
+        self.temporizador.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.temporizador.stop()
+
+    def actualizar(self):
+        datos = instrumentacion.metricas.instantanea()
+        filas = [[nombre, str(m["llamadas"]), f"{m['total_ms']:.1f}", f"{m['media_ms']:.2f}", f"{m['p50_ms']:g}",
+                  f"{m['p95_ms']:g}", f"{m['max_ms']:.1f}", str(m["filas_parseadas"]), f"{m['filas_por_llamada']:g}"]
+                 for nombre, m in datos.items()]
+        self.modelo.set_datos(TITULOS, filas)
+        self.lblResumen.setText(f"{len(filas)} métricas")
+
+    def reiniciar(self):
+        instrumentacion.metricas.reiniciar()
+        self.actualizar()
+
+    def exportar_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar métricas", "metricas.json", "JSON Files (*.json)")
+        if not path: return
+        try:
+            instrumentacion.volcar(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        QMessageBox.information(self, "Exito", f"Métricas exportadas a {path}")
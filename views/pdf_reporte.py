@@ -0,0 +1,124 @@
+import os
+from itertools import chain, islice
+
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QColor, QFont, QFontMetricsF, QPainter
+from PyQt6.QtPrintSupport import QPrinter
+
+# Filas que se miran para calcular el ancho de las columnas
+MUESTRA_ANCHOS = 200
+
+
+def _anchos_columnas(titulos, muestra, metricas, ancho_total, relleno):
+    """Ancho de cada columna segun su texto mas largo en la muestra, escalado al ancho de la pagina."""
+    deseados = []
+    for col, titulo in enumerate(titulos):
+        textos = [titulo] + [str(f[col]) for f in muestra if col < len(f)]
+        deseados.append(max(metricas.horizontalAdvance(t) for t in textos) + 2 * relleno)
+    escala = ancho_total / sum(deseados) if deseados else 1
+    return [d * escala for d in deseados]
+
+
+def dibujar_reporte_pdf(ruta, titulo, subtitulo, titulos, filas, progreso=None):
+    """
+    Dibuja un reporte tabular en PDF directamente con QPainter sobre un
+    QPrinter, una pagina a la vez: `filas` puede ser un generador y solo se
+    tiene en memoria la pagina actual. Los titulos de columna se repiten en
+    cada pagina y cada una lleva su numero al pie.
+
+    `progreso(pagina, filas_escritas)` se llama al terminar cada pagina; si
+    retorna False la exportacion se cancela, se borra el archivo y se retorna
+    None. Si no, retorna la cantidad de filas escritas.
+    """
+    printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+    printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
+    printer.setOutputFileName(ruta)
+
+    painter = QPainter()
+    if not painter.begin(printer):
+        raise IOError(f"No se pudo crear el archivo {ruta}")
+
+    cancelado = False
+    cantidad = 0
+    try:
+        area = printer.pageLayout().paintRectPixels(printer.resolution())
+        ancho, alto = area.width(), area.height()
+
+        fuente = QFont("Helvetica", 9)
+        fuente_negrita = QFont(fuente)
+        fuente_negrita.setBold(True)
+        fuente_titulo = QFont("Helvetica", 16)
+        fuente_titulo.setBold(True)
+        metricas = QFontMetricsF(fuente, printer)
+        alto_fila = metricas.height() * 1.6
+        relleno = metricas.averageCharWidth()
+
+        filas = iter(filas)
+        muestra = list(islice(filas, MUESTRA_ANCHOS))
+        anchos = _anchos_columnas(titulos, muestra, metricas, ancho, relleno)
+        pendientes = chain(muestra, filas)
+
+        def dibujar_fila(y, valores, fuente_fila, fondo=None):
+            painter.setFont(fuente_fila)
+            if fondo is not None:
+                painter.fillRect(QRectF(0, y, ancho, alto_fila), fondo)
+            x = 0.0
+            for col, w in enumerate(anchos):
+                texto = str(valores[col]) if col < len(valores) else ""
+                texto = metricas.elidedText(texto, Qt.TextElideMode.ElideRight, w - 2 * relleno)
+                painter.drawText(QRectF(x + relleno, y, w - 2 * relleno, alto_fila),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, texto)
+                x += w
+            painter.setPen(QColor(200, 200, 200))
+            painter.drawLine(0, int(y + alto_fila), int(ancho), int(y + alto_fila))
+            painter.setPen(QColor("black"))
+
+        pagina = 0
+        while True:
+            y = 0.0
+            if pagina == 0:
+                # Encabezado del reporte, solo en la primera pagina
+                painter.setFont(fuente_titulo)
+                alto_titulo = QFontMetricsF(fuente_titulo, printer).height() * 1.5
+                painter.drawText(QRectF(0, y, ancho, alto_titulo), Qt.AlignmentFlag.AlignLeft, titulo)
+                y += alto_titulo
+                if subtitulo:
+                    painter.setFont(fuente_negrita)
+                    painter.drawText(QRectF(0, y, ancho, alto_fila), Qt.AlignmentFlag.AlignLeft, subtitulo)
+                    y += alto_fila * 1.5
+
+            # Espacio para los titulos de columna y el pie de pagina
+            capacidad = max(1, int((alto - y - 2 * alto_fila) // alto_fila))
+            bloque = list(islice(pendientes, capacidad))
+            if not bloque and pagina > 0:
+                break
+            if pagina > 0:
+                printer.newPage()
+            pagina += 1
+
+            dibujar_fila(y, titulos, fuente_negrita, QColor(238, 238, 238))
+            y += alto_fila
+            for i, fila in enumerate(bloque):
+                dibujar_fila(y, fila, fuente, QColor(248, 248, 248) if i % 2 else None)
+                y += alto_fila
+
+            painter.setFont(fuente)
+            painter.drawText(QRectF(0, alto - alto_fila, ancho, alto_fila),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, f"Página {pagina}")
+
+            cantidad += len(bloque)
+            if progreso is not None and progreso(pagina, cantidad) is False:
+                cancelado = True
+                break
+            if len(bloque) < capacidad:
+                break
+    finally:
+        painter.end()
+
+    if cancelado:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        return None
+    return cantidad
@@ -0,0 +1,162 @@
+import time
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from data import instrumentacion
+
+
+class _Senales(QObject):
+    # QRunnable no es QObject: las señales viajan en este objeto auxiliar
+    terminado = pyqtSignal(int, object)
+    fallo = pyqtSignal(int, str)
+
+
+class TareaLectura(QRunnable):
+    """Ejecuta `funcion(*args)` en un hilo del pool y emite el resultado."""
+    def __init__(self, ticket, funcion, args, bloqueo=None):
+        super().__init__()
+        self.ticket = ticket
+        self.funcion = funcion
+        self.args = args
+        self.bloqueo = bloqueo
+        self.cancelada = False
+        self.senales = _Senales()
+
+    def run(self):
+        if self.cancelada:
+            return
+        try:
+            if self.bloqueo is not None:
+                with self.bloqueo:
+                    resultado = self.funcion(*self.args)
+            else:
+                resultado = self.funcion(*self.args)
+        except Exception as e:
+            self.senales.fallo.emit(self.ticket, str(e))
+            return
+        self.senales.terminado.emit(self.ticket, resultado)
+
+
+class CargadorDatos(QObject):
+    """
+    Capa de carga en segundo plano para las ventanas.
+
+    `solicitar(canal, funcion, al_terminar)` ejecuta la lectura en el
+    QThreadPool global y entrega el resultado a `al_terminar` en el hilo de
+    la GUI. Cada canal (p. ej. "tabla", "cursos") solo conserva la ultima
+    solicitud: si llega otra antes de terminar, la anterior se quita de la
+    cola o, si ya estaba corriendo, su resultado se descarta.
+
+    Mientras haya cargas pendientes la ventana muestra el cursor de espera
+    y se emite `cargando(True)`; al terminar, `cargando(False)`.
+
+    Con la instrumentacion activa (data/instrumentacion.py) cada carga se
+    registra como "<Ventana>.<canal>" (desde la solicitud hasta mostrar el
+    resultado) y "<Ventana>.<canal>:consulta" (solo la lectura en el hilo).
+    Asi cargar_tabla es "<Ventana>.tabla", cargar_resumen_dashboard
+    "MainApp.resumen" y generar_vista_previa "VentanaReportes.vista_previa".
+    """
+    cargando = pyqtSignal(bool)
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        # DataManager expone `bloqueo` para leer su cache desde otros hilos;
+        # SQLiteDataManager ya serializa su conexion internamente
+        self.bloqueo = getattr(db, "bloqueo", None)
+        self.pool = QThreadPool.globalInstance()
+        self._ticket = 0
+        self._vigentes = {}    # {canal: ticket}
+        self._pendientes = {}  # {ticket: (canal, tarea, al_terminar, al_fallar, medicion)}
+
+    @property
+    def ocupado(self):
+        return bool(self._pendientes)
+
+    def solicitar(self, canal, funcion, al_terminar, *args, al_fallar=None):
+        """Encola `funcion(*args)`; reemplaza la solicitud previa del mismo canal."""
+        estaba_ocupado = self.ocupado
+        self._descartar(canal)
+        self._ticket += 1
+        medicion = None  # (nombre, inicio) si la instrumentacion esta activa
+        if instrumentacion.activa():
+            nombre = f"{type(self.parent()).__name__}.{canal}"
+            funcion = instrumentacion.metricas.envolver(f"{nombre}:consulta", funcion)
+            medicion = (nombre, time.perf_counter())
+        tarea = TareaLectura(self._ticket, funcion, args, self.bloqueo)
+        tarea.senales.terminado.connect(self._al_terminar, Qt.ConnectionType.QueuedConnection)
+        tarea.senales.fallo.connect(self._al_fallar, Qt.ConnectionType.QueuedConnection)
+
+        self._vigentes[canal] = self._ticket
+        self._pendientes[self._ticket] = (canal, tarea, al_terminar, al_fallar, medicion)
+        if not estaba_ocupado:
+            self._cambiar_estado(True)
+        self.pool.start(tarea)
+        return self._ticket
+
+    def cancelar(self, canal=None):
+        """Cancela la solicitud vigente de un canal (o de todos)."""
+        estaba_ocupado = self.ocupado
+        for c in (list(self._vigentes) if canal is None else [canal]):
+            self._descartar(c)
+        if estaba_ocupado and not self.ocupado:
+            self._cambiar_estado(False)
+
+    def _descartar(self, canal):
+        ticket = self._vigentes.pop(canal, None)
+        pendiente = self._pendientes.pop(ticket, None) if ticket is not None else None
+        if pendiente is not None:
+            tarea = pendiente[1]
+            try:
+                tarea.cancelada = True
+                self.pool.tryTake(tarea)  # Si aun no empezo, se quita de la cola
+            except RuntimeError:
+                pass  # Ya termino y el pool la libero; su resultado se ignora
+
+    def _tomar(self, ticket):
+        """Retorna la solicitud si sigue vigente (None si fue reemplazada)."""
+        pendiente = self._pendientes.pop(ticket, None)
+        if pendiente is None:
+            return None
+        if self._vigentes.get(pendiente[0]) == ticket:
+            del self._vigentes[pendiente[0]]
+        if not self.ocupado:
+            self._cambiar_estado(False)
+        return pendiente
+
+    def _al_terminar(self, ticket, resultado):
+        pendiente = self._tomar(ticket)
+        if pendiente is not None:
+            pendiente[2](resultado)
+            if pendiente[4] is not None:
+                nombre, inicio = pendiente[4]
+                instrumentacion.registrar(nombre, time.perf_counter() - inicio)
+
+    def _al_fallar(self, ticket, mensaje):
+        pendiente = self._tomar(ticket)
+        if pendiente is None:
+            return
+        if pendiente[3] is not None:
+            pendiente[3](mensaje)
+        else:
+            print(f"Error cargando datos ({pendiente[0]}): {mensaje}")
+
+    def _cambiar_estado(self, activo):
+        ventana = self.parent()
+        if ventana is not None and hasattr(ventana, "setCursor"):
+            if activo:
+                ventana.setCursor(Qt.CursorShape.BusyCursor)
+            else:
+                ventana.unsetCursor()
+        self.cargando.emit(activo)
+
+
+def temporizador_debounce(parent, funcion, intervalo=250):
+    """
+    QTimer de un solo disparo conectado a `funcion`. Cada start() reinicia
+    la espera, asi `funcion` corre una vez cuando el usuario deja de escribir.
+    """
+    temporizador = QTimer(parent)
+    temporizador.setSingleShot(True)
+    temporizador.setInterval(intervalo)
+    temporizador.timeout.connect(funcion)
+    return temporizador